@@ -5,13 +5,17 @@ Application de la solution Super-Résolution sur image.webp (677x309)
 import cv2
 import numpy as np
 from PIL import Image, ImageFilter, ImageEnhance
-import easyocr
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discord-bot'))
+from reader_registry import get_reader
 
 class SuperResolutionOCR:
     def __init__(self):
         print("🔧 Initialisation du système...")
-        self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        self.reader = get_reader(['en'])  # lecteur partagé, chargé une fois par processus
         
     def analyze_image(self, img):
         """Analyse la qualité de l'image"""
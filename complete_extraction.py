@@ -4,17 +4,22 @@ Extraction complète avec la méthode documentée
 Image2.webp : 1575x749 pixels
 """
 import cv2
-import easyocr
 import numpy as np
 import requests
 import json
 import time
+import sys
+import os
 from typing import List, Dict, Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discord-bot'))
+from card_index import get_shared_index
+from reader_registry import get_reader
+
 class CompleteCardExtractor:
     def __init__(self):
         print("🔧 Initialisation du système d'extraction...")
-        self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        self.reader = get_reader(['en'])  # lecteur partagé, chargé une fois par processus
         self.scryfall_cache = {}
         
     def analyze_resolution(self, img) -> Tuple[str, int]:
@@ -133,6 +138,15 @@ class CompleteCardExtractor:
         cache_key = f"{partial_name}_{color_hint}"
         if cache_key in self.scryfall_cache:
             return self.scryfall_cache[cache_key]
+        
+        # Index local (bulk Scryfall) : complétion par préfixe, sans réseau
+        card_index = get_shared_index()
+        if card_index:
+            names = card_index.complete(partial_name, limit=1, with_colors=color_hint,
+                                        formats=('standard', 'pioneer'))
+            result = names[0] if names else None
+            self.scryfall_cache[cache_key] = result
+            return result
             
         # Construire la requête
         query_parts = [f'name:/^{partial_name}/i']
@@ -7,26 +7,37 @@ Now with automatic correction, format detection, and comprehensive analysis
 
 import os
 import asyncio
+import importlib
 import logging
 import tempfile
+import time
 from io import BytesIO
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 import json
 
 import discord
 from discord.ext import commands
 import aiohttp
 from aiohttp import web
-from PIL import Image
-import requests
 from dotenv import load_dotenv
 
-from ocr_parser_easyocr import MTGOCRParser, ParseResult, ParsedCard
 from scryfall_service import ScryfallService, DeckAnalysis
 from deck_processor import DeckProcessor
 from clipboard_service import ClipboardService, CopyDeckButton
+from cache_warmup import CacheWarmer, CardFrequencyLog
+from bulk_refresh import BulkRefresher, BulkRefreshError
+from http_client import get_http_client
+from ocr_pool import OcrPool, OcrPoolError, OcrPoolFull
+from reader_registry import get_reader
+import metrics
+from metrics import SCANS, SCANS_IN_PROGRESS, observe_stage
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
 from utils.logger import setup_logger
 
+# The OCR stack (torch, cv2, skimage, easyocr) is imported by warm_up(), after the gateway login
+if TYPE_CHECKING:
+    from ocr_parser_easyocr import ParseResult
+
 # Configuration du logger
 logger = setup_logger()
 
@@ -95,9 +106,17 @@ bot.api_base_url = os.getenv('API_BASE_URL', 'http://localhost:3001/api')
 bot.max_file_size = 10 * 1024 * 1024  # 10MB
 bot.supported_formats = ['png', 'jpg', 'jpeg', 'gif', 'webp']
 bot.camera_emoji = '📷'
-bot.scryfall_service = ScryfallService()
-bot.ocr_parser = MTGOCRParser(bot.scryfall_service)
+bot.http_client = get_http_client()  # One keep-alive pool for attachments, Scryfall and bulk data
+bot.scryfall_service = ScryfallService(http_client=bot.http_client)
+bot.ocr_pool = OcrPool.from_env()  # EasyOCR in worker processes, off the event loop
+bot.ocr_parser = None  # MTGOCRParser, built by warm_up()
+bot.readiness = {'scryfall': False, 'ocr': False}
+bot.warmup_error = None
+bot.scan_pipeline_ready = asyncio.Event()  # set when warm-up finished (or failed)
 bot.clipboard_service = ClipboardService()
+bot.card_frequency = CardFrequencyLog()
+bot.cache_warmer = CacheWarmer(bot.scryfall_service, bot.card_frequency)
+bot.bulk_refresher = BulkRefresher(http_client=bot.http_client)
 bot.processing_jobs = {}
 bot.stats = {
     'scans_processed': 0,
@@ -113,10 +132,54 @@ async def setup_hook():
     logger.info("🚀 Initializing Enhanced MTG Scanner Bot...")
     logger.info("✅ Enhanced bot services initialized successfully!")
     logger.info("🔧 Features: Auto-correction, Format detection, Intelligent validation")
-    # Initialisation asynchrone de ScryfallService
-    await bot.scryfall_service.__aenter__()
     # Démarrage du serveur de health check en tâche de fond
     bot.loop.create_task(start_health_check_server())
+    # Données Scryfall, pile OCR et modèles chargés en arrière-plan : la connexion au gateway n'attend pas
+    bot.loop.create_task(warm_up())
+
+async def warm_up():
+    """Chargement lourd hors du chemin de démarrage ; les scans arrivés entre-temps attendent."""
+    start_time = time.perf_counter()
+    try:
+        # Initialisation asynchrone de ScryfallService (index local, noms imprimés, prix)
+        await bot.scryfall_service.__aenter__()
+        bot.readiness['scryfall'] = True
+        # Préchargement du cache Scryfall en tâche de fond (ne bloque pas le démarrage)
+        bot.loop.create_task(bot.cache_warmer.run())
+        # Rafraîchissement périodique des données bulk Scryfall (sans bloquer les scans)
+        bot.loop.create_task(bulk_refresh_loop())
+
+        ocr_parser_easyocr = await asyncio.to_thread(importlib.import_module, 'ocr_parser_easyocr')
+        bot.ocr_parser = ocr_parser_easyocr.MTGOCRParser(bot.scryfall_service, ocr_pool=bot.ocr_pool)
+        if bot.ocr_pool:
+            # Workers load their EasyOCR reader in their own process; OcrPoolError if none can start
+            ocr_ready = bot.ocr_pool.wait_ready()
+        else:
+            ocr_ready = asyncio.to_thread(get_reader, ['en'])
+        # Borné : un moteur qui ne démarre jamais doit apparaître dans warmup_error (/readyz, scans)
+        warmup_timeout = float(os.getenv('OCR_WARMUP_TIMEOUT_SECONDS', '900'))
+        try:
+            await asyncio.wait_for(ocr_ready, timeout=warmup_timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"OCR engine not ready after {warmup_timeout:.0f}s") from None
+        bot.readiness['ocr'] = True
+        logger.info(f"✅ Scan pipeline ready in {time.perf_counter() - start_time:.1f}s")
+    except Exception as e:
+        bot.warmup_error = f"{type(e).__name__}: {e}"
+        logger.error(f"❌ Warm-up failed, scans will be refused: {e}", exc_info=True)
+    finally:
+        bot.scan_pipeline_ready.set()
+
+async def wait_for_scan_pipeline():
+    """Attend la fin du warm-up (borné par SCAN_WARMUP_WAIT_SECONDS) au lieu de faire échouer le scan."""
+    if not bot.scan_pipeline_ready.is_set():
+        try:
+            await asyncio.wait_for(bot.scan_pipeline_ready.wait(),
+                                   timeout=float(os.getenv('SCAN_WARMUP_WAIT_SECONDS', '600')))
+        except asyncio.TimeoutError:
+            raise RuntimeError("The scanner is still starting up, please try again in a minute") from None
+    if bot.warmup_error:
+        raise RuntimeError(f"The scanner failed to start: {bot.warmup_error}")
 
 @bot.event
 async def on_ready():
@@ -220,21 +283,35 @@ async def scan_message_images(message, user, auto_scan=False,
     
     processing_msg = await message.reply(embed=processing_embed)
     
+    SCANS_IN_PROGRESS.inc()
     try:
-        # Download and process image
-        async with aiohttp.ClientSession() as session:
-            async with session.get(attachment.url) as resp:
-                if resp.status != 200:
-                    raise Exception(f"Failed to download image: {resp.status}")
-                
-                image_data = await resp.read()
-        
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(suffix=f'.{attachment.filename.split(".")[-1]}', delete=False) as temp_file:
-            temp_file.write(image_data)
+        # Stream the image to a temporary file through the shared connection pool
+        with observe_stage('download'), \
+                tempfile.NamedTemporaryFile(suffix=f'.{attachment.filename.split(".")[-1]}', delete=False) as temp_file:
             temp_file_path = temp_file.name
+            try:
+                await bot.http_client.download(attachment.url, temp_file, max_bytes=bot.max_file_size)
+            except BaseException:
+                temp_file.close()
+                os.remove(temp_file_path)
+                raise
         
         try:
+            # Scans sent while the bot is still warming up wait here instead of failing
+            queued = not bot.scan_pipeline_ready.is_set()
+            if queued:
+                processing_embed.description = processing_embed.description.replace(
+                    "⏳ **Status:** Processing...",
+                    "⏳ **Status:** Queued - the OCR engine is warming up..."
+                )
+                await processing_msg.edit(embed=processing_embed)
+            await wait_for_scan_pipeline()
+            if queued:
+                processing_embed.description = processing_embed.description.replace(
+                    "⏳ **Status:** Queued - the OCR engine is warming up...",
+                    "⏳ **Status:** Processing..."
+                )
+            
             # Update status - OCR phase
             processing_embed.description = processing_embed.description.replace(
                 "⏳ **Status:** Processing...",
@@ -268,6 +345,7 @@ async def scan_message_images(message, user, auto_scan=False,
                     )
                 
                 await processing_msg.edit(embed=error_embed)
+                SCANS.labels(outcome='no_cards').inc()
                 return
             
             # Update status - validation phase
@@ -291,6 +369,11 @@ async def scan_message_images(message, user, auto_scan=False,
             bot.stats['scans_processed'] += 1
             bot.stats['cards_identified'] += len([c for c in parse_result.cards if c.is_validated])
             bot.stats['corrections_applied'] += len([c for c in parse_result.cards if c.correction_applied])
+            SCANS.labels(outcome='ok').inc()
+            
+            # Feed the warm-up frequency log
+            bot.card_frequency.record(c.name for c in parse_result.cards if c.is_validated)
+            await asyncio.to_thread(bot.card_frequency.save)
             
             if parse_result.format_analysis:
                 format_name = parse_result.format_analysis.get('format', 'unknown')
@@ -303,6 +386,19 @@ async def scan_message_images(message, user, auto_scan=False,
             except:
                 pass
         
+    except OcrPoolError as e:
+        busy = isinstance(e, OcrPoolFull)
+        busy_embed = discord.Embed(
+            title="⏳ **Scanner Busy**" if busy else "⌛ **Scan Timed Out**",
+            description=(
+                "Too many decks are being scanned right now. Please try again in a minute."
+                if busy else f"The OCR could not finish this image: ```{str(e)}```"
+            ),
+            color=discord.Color.orange()
+        )
+        await processing_msg.edit(embed=busy_embed)
+        logger.warning(f"OCR pool refused or failed a scan: {e}")
+        SCANS.labels(outcome='busy' if busy else 'ocr_failed').inc()
     except Exception as e:
         error_embed = discord.Embed(
             title="❌ **Processing Error**",
@@ -312,9 +408,12 @@ async def scan_message_images(message, user, auto_scan=False,
         error_embed.set_footer(text="Please try again or contact support")
         await processing_msg.edit(embed=error_embed)
         logger.error(f"Error processing image: {e}")
+        SCANS.labels(outcome='error').inc()
+    finally:
+        SCANS_IN_PROGRESS.dec()
 
 async def send_enhanced_scan_results(original_message, processing_msg, 
-                                   parse_result: ParseResult, export_format, 
+                                   parse_result: 'ParseResult', export_format, 
                                    include_analysis, user):
     """Send enhanced scan results with comprehensive information"""
     
@@ -475,7 +574,7 @@ async def send_enhanced_scan_results(original_message, processing_msg,
     # Send result
     await processing_msg.edit(embed=result_embed, view=view, attachments=[file] if file else [])
 
-async def generate_enhanced_export(parse_result: ParseResult, format_type: str) -> str:
+async def generate_enhanced_export(parse_result: 'ParseResult', format_type: str) -> str:
     """
     VERSION PATCHÉE - Génère l'export en utilisant TOUJOURS les données regroupées
     
@@ -622,7 +721,7 @@ async def generate_analysis_report(parse_result):
 class EnhancedDeckView(discord.ui.View):
     """Enhanced view with advanced interaction buttons"""
     
-    def __init__(self, parse_result: ParseResult, scryfall_service: ScryfallService, user_id: int):
+    def __init__(self, parse_result: 'ParseResult', scryfall_service: ScryfallService, user_id: int):
         super().__init__(timeout=600)  # 10 minutes
         self.parse_result = parse_result
         self.scryfall_service = scryfall_service
@@ -823,24 +922,118 @@ async def deck_help(ctx: discord.ApplicationContext):
     
     await ctx.respond(embed=embed, ephemeral=True)
 
+# === Scryfall bulk data refresh ===
+async def bulk_refresh_loop():
+    """Nightly manifest check; downloads only when Scryfall published new data."""
+    interval_hours = float(os.getenv('SCRYFALL_BULK_REFRESH_HOURS', '24'))
+    refresher = bot.bulk_refresher
+    if interval_hours <= 0 or not (refresher.bulk_path.exists() or refresher.store_path.exists()):
+        logger.info("Scryfall bulk refresh disabled (no local bulk data or interval is 0)")
+        return
+    
+    # Price snapshot missing or older than the bulk file: rebuild it now, not in 24h
+    try:
+        prices = await refresher.refresh_prices()
+        if prices:
+            bot.scryfall_service.price_table = prices
+    except (OSError, ValueError) as e:
+        logger.error(f"Price snapshot rebuild failed, keeping current prices: {e}")
+    
+    while True:
+        await asyncio.sleep(interval_hours * 3600)
+        try:
+            result = await refresher.refresh()
+            if result['updated']:
+                # The old index keeps serving in-flight scans; new lookups use the new one
+                bot.scryfall_service.card_index = result['index']
+            if result.get('prices'):
+                bot.scryfall_service.price_table = result['prices']
+        except (BulkRefreshError, aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError) as e:
+            logger.error(f"Scryfall bulk refresh failed, keeping current data: {e}")
+
 # === Health Check Server ===
+def readiness_report() -> Dict[str, Any]:
+    """Gateway + pipeline de scan (données Scryfall, moteur OCR)."""
+    components = {'gateway': bot.is_ready(), **bot.readiness}
+    return {"ready": all(components.values()), "components": components, "warmup_error": bot.warmup_error}
+
 async def health_check(request):
-    """Répond aux health checks de la plateforme de déploiement."""
-    if bot.is_ready():
-        return web.json_response({"status": "ok", "bot_user": str(bot.user)}, status=200)
-    else:
-        return web.json_response({"status": "starting"}, status=503)
+    """Liveness : le processus répond (200 même pendant le warm-up) ; l'état de préparation est détaillé."""
+    readiness = readiness_report()
+    warmup = bot.cache_warmer.progress()
+    http = bot.http_client.stats()
+    ocr = bot.ocr_pool.stats() if bot.ocr_pool else None
+    return web.json_response({"status": "ok" if readiness["ready"] else "starting", "live": True, **readiness,
+                              "bot_user": str(bot.user) if bot.user else None,
+                              "warmup": warmup, "http": http, "ocr": ocr}, status=200)
+
+async def readiness_check(request):
+    """Readiness : 200 seulement quand le bot peut scanner, 503 pendant le warm-up."""
+    readiness = readiness_report()
+    return web.json_response(readiness, status=200 if readiness["ready"] else 503)
+
+def collect_bot_metrics():
+    """Compteurs déjà tenus par le bot et ses services, lus au moment du scrape."""
+    cache = bot.scryfall_service.get_cache_stats()
+    http = bot.http_client.stats()
+    yield CounterMetricFamily('mtg_cards_identified', 'Cards validated across all scans',
+                              value=bot.stats['cards_identified'])
+    yield CounterMetricFamily('mtg_corrections_applied', 'OCR corrections applied across all scans',
+                              value=bot.stats['corrections_applied'])
+    formats = CounterMetricFamily('mtg_formats_detected', 'Decks per detected format', labels=['format'])
+    for name, count in bot.stats['formats_detected'].items():
+        formats.add_metric([name], count)
+    yield formats
+    yield GaugeMetricFamily('mtg_scryfall_cache_entries', 'Scryfall responses held in memory',
+                            value=cache['total_entries'])
+    yield GaugeMetricFamily('mtg_scryfall_cache_bytes', 'Memory used by cached Scryfall responses',
+                            value=cache['cache_size_mb'] * 1024 * 1024)
+    yield CounterMetricFamily('mtg_scryfall_local_hits', 'Lookups answered by the local card index',
+                              value=cache['local_hits'])
+    yield CounterMetricFamily('mtg_scryfall_coalesced', 'Lookups that joined an identical in-flight request',
+                              value=cache['coalesced_requests'])
+    yield GaugeMetricFamily('mtg_scryfall_circuit_open', '1 while the Scryfall circuit breaker is not closed',
+                            value=int(cache['circuit_state'] != 'closed'))
+    connections = CounterMetricFamily('mtg_http_connections', 'Outbound HTTP connections, new or reused from the pool',
+                                      labels=['kind'])
+    connections.add_metric(['created'], http['connections_created'])
+    connections.add_metric(['reused'], http['connections_reused'])
+    yield connections
+    yield CounterMetricFamily('mtg_http_bytes_downloaded', 'Bytes streamed by the shared HTTP client',
+                              value=http['bytes_downloaded'])
+    ready = GaugeMetricFamily('mtg_ready', '1 once each startup component is ready', labels=['component'])
+    for name, is_ready in readiness_report()['components'].items():
+        ready.add_metric([name], int(is_ready))
+    yield ready
+    if bot.ocr_pool:
+        ocr = bot.ocr_pool.stats()
+        yield GaugeMetricFamily('mtg_ocr_pending', 'OCR jobs queued or running in the worker pool',
+                                value=ocr['pending'])
+        jobs = CounterMetricFamily('mtg_ocr_jobs', 'OCR pool jobs, by outcome', labels=['outcome'])
+        for outcome in ('completed', 'failed', 'timeouts', 'rejected'):
+            jobs.add_metric([outcome], ocr[outcome])
+        yield jobs
+        yield CounterMetricFamily('mtg_ocr_worker_restarts', 'OCR workers replaced after a timeout, cancel or crash',
+                                  value=ocr['restarts'])
+
+metrics.add_collector('bot', collect_bot_metrics)
+
+async def metrics_endpoint(request):
+    """Exposition Prometheus (scrapée par Fly via [metrics] dans fly.bot.toml)."""
+    return web.Response(body=metrics.render(), headers={'Content-Type': metrics.CONTENT_TYPE})
 
 async def start_health_check_server():
-    """Démarre le serveur web aiohttp pour les health checks."""
+    """Démarre le serveur web aiohttp pour les health checks et les métriques."""
     app = web.Application()
     app.router.add_get("/healthz", health_check)
+    app.router.add_get("/readyz", readiness_check)
+    app.router.add_get("/metrics", metrics_endpoint)
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(runner, '0.0.0.0', 8080)
     try:
         await site.start()
-        logger.info("🩺 Health check server started on port 8080 at /healthz")
+        logger.info("🩺 Health check server started on port 8080 at /healthz, /readyz and /metrics")
         # Le serveur tourne tant que le bot tourne
         await asyncio.Event().wait()
     except (KeyboardInterrupt, asyncio.CancelledError):
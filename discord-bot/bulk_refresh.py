@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+🔄 Incremental Scryfall bulk-data refresh
+Checks the bulk-data manifest (`updated_at` and `size` of default_cards)
+against a sidecar file written next to the local copy, and only downloads
+when something changed. The download is streamed to a temporary file and
+renamed into place, the columnar store and the price snapshot are rebuilt,
+and the new index is swapped in while the old one keeps serving scans.
+
+    python bulk_refresh.py [--force] [--data-dir data]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from card_index import DEFAULT_BULK_PATH, set_shared_index
+from card_store import DEFAULT_STORE_PATH, CardStore, build_card_store
+from http_client import HttpClient, get_http_client
+from price_table import DEFAULT_PRICES_PATH, PriceTable, build_price_table, is_stale, set_shared_prices
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_URL = "https://api.scryfall.com/bulk-data"
+BULK_TYPE = 'default_cards'
+HEADERS = {
+    'User-Agent': 'MTG-Discord-Scanner-Enhanced/2.0 (https://github.com/user/mtg-scanner)',
+    'Accept': 'application/json'
+}
+
+
+class BulkRefreshError(Exception):
+    """Manifest or download problem; the current local data is left untouched"""
+
+
+def sidecar_path(bulk_path: Path) -> Path:
+    return bulk_path.with_name(bulk_path.name + '.meta.json')
+
+
+def read_sidecar(bulk_path: Path) -> Dict[str, Any]:
+    try:
+        with open(sidecar_path(bulk_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class BulkRefresher:
+    """Manifest check, streamed download, atomic replace, store rebuild, index swap"""
+
+    def __init__(self, bulk_path: Optional[str] = None, store_path: Optional[str] = None,
+                 manifest_url: Optional[str] = None, chunk_size: int = 1 << 20,
+                 timeout: float = 600, prices_path: Optional[str] = None,
+                 http_client: Optional[HttpClient] = None):
+        self.bulk_path = Path(bulk_path or os.getenv('SCRYFALL_DATA_PATH') or DEFAULT_BULK_PATH)
+        self.store_path = Path(store_path or os.getenv('SCRYFALL_STORE_PATH') or DEFAULT_STORE_PATH)
+        self.prices_path = Path(prices_path or os.getenv('SCRYFALL_PRICES_PATH') or DEFAULT_PRICES_PATH)
+        self.manifest_url = manifest_url or os.getenv('SCRYFALL_BULK_MANIFEST_URL') or MANIFEST_URL
+        self.chunk_size = chunk_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_read=60)
+        self.http_client = http_client
+
+        self.last_check: Optional[float] = None
+        self.last_result: Dict[str, Any] = {}
+
+    async def fetch_manifest(self, session: aiohttp.ClientSession) -> Dict[str, Any]:
+        """The default_cards entry of the bulk-data manifest"""
+        async with session.get(self.manifest_url, timeout=self.timeout, headers=HEADERS) as response:
+            if response.status != 200:
+                raise BulkRefreshError(f"Manifest request failed: HTTP {response.status}")
+            manifest = await response.json(content_type=None)
+
+        entries = manifest.get('data', [manifest]) if isinstance(manifest, dict) else manifest
+        for entry in entries:
+            if entry.get('type') == BULK_TYPE:
+                return entry
+        raise BulkRefreshError(f"No {BULK_TYPE} entry in manifest {self.manifest_url}")
+
+    def is_current(self, entry: Dict[str, Any]) -> bool:
+        """Local copy already matches the manifest entry"""
+        local = read_sidecar(self.bulk_path)
+        return (self.bulk_path.exists()
+                and local.get('updated_at') == entry.get('updated_at')
+                and local.get('size') == entry.get('size')
+                and self.bulk_path.stat().st_size == local.get('bytes'))
+
+    async def download(self, session: aiohttp.ClientSession, entry: Dict[str, Any]) -> int:
+        """Stream the bulk file to a temp file, check it, then rename it over the old copy"""
+        self.bulk_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.bulk_path.parent, prefix='.bulk-', suffix='.tmp')
+        written = 0
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                async with session.get(entry['download_uri'], timeout=self.timeout) as response:
+                    if response.status != 200:
+                        raise BulkRefreshError(f"Download failed: HTTP {response.status}")
+                    async for chunk in response.content.iter_chunked(self.chunk_size):
+                        f.write(chunk)
+                        written += len(chunk)
+
+            expected = entry.get('size')
+            if expected and written != expected:
+                raise BulkRefreshError(f"Downloaded {written} bytes, manifest announced {expected}")
+
+            os.replace(tmp_name, self.bulk_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+        with open(sidecar_path(self.bulk_path), 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': entry.get('updated_at'),
+                'size': entry.get('size'),
+                'bytes': written,
+                'download_uri': entry.get('download_uri'),
+                'fetched_at': time.time(),
+            }, f, indent=2)
+        return written
+
+    async def refresh(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Check the manifest and refresh when needed. Returns a summary:
+        {'updated': bool, 'updated_at': ..., 'bytes': ..., 'index': new index or None,
+         'prices': new price table or None}
+        """
+        start_time = time.time()
+        self.last_check = start_time
+        session = (self.http_client or get_http_client()).session
+        entry = await self.fetch_manifest(session)
+        if not force and self.is_current(entry):
+            logger.info(f"Scryfall bulk data up to date ({entry.get('updated_at')}), nothing to download")
+            self.last_result = {'updated': False, 'updated_at': entry.get('updated_at'), 'index': None,
+                                'prices': await self.refresh_prices()}
+            return self.last_result
+
+        logger.info(f"🔄 Downloading Scryfall bulk data ({entry.get('updated_at')}, {entry.get('size')} bytes)")
+        written = await self.download(session, entry)
+
+        # Parsing and column writing run off the event loop
+        index = await asyncio.to_thread(self._rebuild_index)
+        set_shared_index(index)
+        prices = await self.refresh_prices()
+
+        self.last_result = {
+            'updated': True,
+            'updated_at': entry.get('updated_at'),
+            'bytes': written,
+            'cards': len(index),
+            'duration': time.time() - start_time,
+            'index': index,
+            'prices': prices,
+        }
+        logger.info(f"✅ Scryfall bulk data refreshed: {len(index)} cards in {self.last_result['duration']:.1f}s")
+        return self.last_result
+
+    async def refresh_prices(self, force: bool = False) -> Optional[PriceTable]:
+        """Rebuild the price snapshot when the local bulk file is newer; returns the new table or None"""
+        if not self.bulk_path.exists():
+            return None
+        if not force and not is_stale(str(self.bulk_path), str(self.prices_path)):
+            return None
+        table = await asyncio.to_thread(build_price_table, str(self.bulk_path), str(self.prices_path))
+        set_shared_prices(table)
+        return table
+
+    def _rebuild_index(self) -> CardStore:
+        build_card_store(str(self.bulk_path), str(self.store_path))
+        store = CardStore(str(self.store_path))
+        store.matcher  # Build the name matcher before the swap, not on the first scan
+        return store
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Refresh Scryfall bulk data only when it changed")
+    parser.add_argument('--data-dir', help="directory holding scryfall-default-cards.json and scryfall-store/")
+    parser.add_argument('--force', action='store_true', help="download even if the manifest is unchanged")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    bulk_path = store_path = prices_path = None
+    if args.data_dir:
+        bulk_path = Path(args.data_dir) / DEFAULT_BULK_PATH.name
+        store_path = Path(args.data_dir) / DEFAULT_STORE_PATH.name
+        prices_path = Path(args.data_dir) / DEFAULT_PRICES_PATH.name
+
+    async def run():
+        client = HttpClient()
+        try:
+            return await BulkRefresher(bulk_path, store_path, prices_path=prices_path,
+                                       http_client=client).refresh(force=args.force)
+        finally:
+            await client.close()
+
+    try:
+        result = asyncio.run(run())
+    except (BulkRefreshError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"❌ Bulk refresh failed: {e}")
+        return 1
+
+    print("✅ Updated" if result['updated'] else "✅ Already up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+🔥 Scryfall Cache Warm-up
+Preloads the competitive card pool into the ScryfallService cache right after
+startup, so the first scans after a deploy don't pay cold-cache latency.
+Card names come from a frequency log of past scans plus the reference
+decklists shipped with the repo (mtgo_pixie_deck_manual.json, validated_decklists/).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_FREQUENCY_PATH = REPO_ROOT / 'data' / 'card_frequency.json'
+DEFAULT_DECKLIST_PATHS = (
+    REPO_ROOT / 'mtgo_pixie_deck_manual.json',
+    REPO_ROOT / 'validated_decklists',
+)
+
+_DECKLIST_LINE_RE = re.compile(r'^\s*(\d+)\s*x?\s+(.+?)\s*$', re.IGNORECASE)
+
+
+class CardFrequencyLog:
+    """How often each card name has been seen in successful scans"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = str(path or os.getenv('CARD_FREQUENCY_PATH') or DEFAULT_FREQUENCY_PATH)
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.counts.update({name: int(count) for name, count in data.items()})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable card frequency log {self.path}: {e}")
+
+    def record(self, names: Iterable[str]):
+        """Count the card names of one scan"""
+        with self._lock:
+            self.counts.update(name for name in names if name)
+
+    def most_common(self, limit: Optional[int] = None) -> List[str]:
+        with self._lock:
+            return [name for name, _ in self.counts.most_common(limit)]
+
+    def save(self):
+        """Write atomically (temp file + rename) so a crash never truncates the log"""
+        with self._lock:
+            payload = dict(self.counts)
+        try:
+            directory = os.path.dirname(self.path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save card frequency log {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+def _names_from_json(data: Any) -> List[str]:
+    """Card names from {'mainboard': [...], 'sideboard': [...]} decks, or lists of them"""
+    if isinstance(data, list):
+        return [name for item in data for name in _names_from_json(item)]
+    if not isinstance(data, dict):
+        return []
+    if isinstance(data.get('name'), str) and ('quantity' in data or 'count' in data):
+        return [data['name']]
+
+    names = []
+    for section in ('mainboard', 'sideboard', 'commander', 'companion', 'cards'):
+        names.extend(_names_from_json(data.get(section) or []))
+    return names
+
+
+def _names_from_text(text: str) -> List[str]:
+    """Card names from "4 Lightning Bolt" / "4x Lightning Bolt" lines"""
+    names = []
+    for line in text.splitlines():
+        match = _DECKLIST_LINE_RE.match(line)
+        if match:
+            names.append(match.group(2))
+    return names
+
+
+def load_decklist_names(paths: Iterable[Any] = DEFAULT_DECKLIST_PATHS) -> List[str]:
+    """Card names from decklist files (.json, .txt) or directories of them; images are skipped"""
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in ('.json', '.txt')))
+        elif path.is_file():
+            files.append(path)
+
+    names: List[str] = []
+    for file in files:
+        try:
+            content = file.read_text(encoding='utf-8')
+            if file.suffix.lower() == '.json':
+                names.extend(_names_from_json(json.loads(content)))
+            else:
+                names.extend(_names_from_text(content))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping decklist {file}: {e}")
+    return names
+
+
+def collect_warmup_names(frequency_log: Optional[CardFrequencyLog] = None,
+                         decklist_paths: Iterable[Any] = DEFAULT_DECKLIST_PATHS,
+                         limit: int = 2000) -> List[str]:
+    """Most frequently scanned cards first, then reference decklists; deduplicated"""
+    names = frequency_log.most_common(limit) if frequency_log else []
+    names.extend(load_decklist_names(decklist_paths))
+    unique = dict.fromkeys(' '.join(n.split()) for n in names if n and n.strip())
+    return list(unique)[:limit]
+
+
+class CacheWarmer:
+    """Background warm-up task with progress reporting for /healthz"""
+
+    def __init__(self, scryfall_service, frequency_log: Optional[CardFrequencyLog] = None,
+                 decklist_paths: Iterable[Any] = DEFAULT_DECKLIST_PATHS,
+                 limit: int = 2000, batch_size: int = 150):
+        self.scryfall_service = scryfall_service
+        self.frequency_log = frequency_log
+        self.decklist_paths = list(decklist_paths)
+        self.limit = limit
+        self.batch_size = batch_size
+
+        self.state = 'pending'
+        self.total = 0
+        self.processed = 0
+        self.resolved = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    async def run(self):
+        """Collect names off the event loop, then resolve them batch by batch"""
+        self.state = 'running'
+        self.started_at = time.time()
+        try:
+            names = await asyncio.to_thread(
+                collect_warmup_names, self.frequency_log, self.decklist_paths, self.limit
+            )
+            self.total = len(names)
+            logger.info(f"🔥 Cache warm-up started: {self.total} cards")
+
+            for i in range(0, len(names), self.batch_size):
+                batch = names[i:i + self.batch_size]
+                # No per-card fuzzy fallback: stale log entries must not cost a request each
+                results = await self.scryfall_service.resolve_card_names(batch, fuzzy_fallback=False)
+                self.processed += len(batch)
+                self.resolved += sum(1 for card in results.values() if card)
+
+            self.state = 'done'
+            logger.info(f"✅ Cache warm-up done: {self.resolved}/{self.total} cards "
+                        f"in {time.time() - self.started_at:.1f}s")
+        except asyncio.CancelledError:
+            self.state = 'cancelled'
+            raise
+        except Exception as e:
+            self.state = 'failed'
+            self.error = str(e)
+            logger.error(f"Cache warm-up failed: {e}")
+        finally:
+            self.finished_at = time.time()
+
+    def progress(self) -> Dict[str, Any]:
+        """Snapshot for the health endpoint"""
+        end = self.finished_at or time.time()
+        progress = {
+            'state': self.state,
+            'total': self.total,
+            'processed': self.processed,
+            'resolved': self.resolved,
+            'percent': round(100.0 * self.processed / self.total, 1) if self.total else
+                       (100.0 if self.state == 'done' else 0.0),
+            'elapsed': round(end - self.started_at, 2) if self.started_at else 0.0,
+        }
+        if self.error:
+            progress['error'] = self.error
+        return progress
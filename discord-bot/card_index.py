@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+📚 Local Card Index
+Offline, indexed card store built from the Scryfall bulk export
+(data/scryfall-default-cards.json, see scripts/fetch-scryfall-bulk.sh).
+ScryfallService consults it before any HTTP call and only falls back
+to api.scryfall.com on a miss.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Any, Iterable
+
+from name_matcher import CardNameMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BULK_PATH = Path(__file__).resolve().parent.parent / 'data' / 'scryfall-default-cards.json'
+
+# Fields kept from each bulk entry - everything the bot reads from card_data
+INDEX_FIELDS = (
+    'id', 'oracle_id', 'name', 'lang', 'layout', 'mana_cost', 'cmc',
+    'type_line', 'oracle_text', 'colors', 'color_identity', 'legalities',
+    'prices', 'rarity', 'set', 'set_name', 'released_at', 'card_faces',
+    'scryfall_uri', 'image_uris', 'digital',
+)
+
+# Layouts that are never part of a decklist
+SKIPPED_LAYOUTS = {'token', 'double_faced_token', 'emblem', 'art_series'}
+
+_LOOSE_RE = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalize_name(name: str) -> str:
+    """Case- and whitespace-insensitive key (Scryfall exact semantics)"""
+    return ' '.join(name.lower().split())
+
+
+def loose_name(name: str) -> str:
+    """Punctuation-insensitive key: OCR cleaning drops commas and colons"""
+    return ' '.join(_LOOSE_RE.sub(' ', name.lower().replace("'", '')).split())
+
+
+def printing_rank(card: Dict[str, Any]) -> tuple:
+    """Paper printings first, then the most recent one (like /cards/named)"""
+    return (not card.get('digital', False), card.get('released_at', ''))
+
+
+def iter_bulk_cards(path: str, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the cards of a Scryfall bulk file (one JSON array) one at a time.
+    Only `chunk_size` characters plus the current card are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{path} is not a JSON array")
+        pos = 1
+        eof = False
+
+        while True:
+            # Skip separators between array items
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+
+            try:
+                if pos >= len(buffer):
+                    raise json.JSONDecodeError("need more data", buffer, pos)
+                card, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(f"{path} is truncated")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+
+            yield card
+
+
+class LocalCardIndex:
+    """In-memory card index keyed by name, loose name and Scryfall id"""
+
+    def __init__(self):
+        self.cards_by_name: Dict[str, Dict[str, Any]] = {}
+        self.cards_by_loose_name: Dict[str, Dict[str, Any]] = {}
+        self.cards_by_id: Dict[str, Dict[str, Any]] = {}
+        self.source_path: Optional[str] = None
+        self.load_time = 0.0
+        self._matcher: Optional[CardNameMatcher] = None
+        self._prefixes = None
+
+    @classmethod
+    def from_bulk_file(cls, path: Optional[str] = None) -> 'LocalCardIndex':
+        """Build an index from a Scryfall bulk JSON file"""
+        path = str(path or DEFAULT_BULK_PATH)
+        start_time = time.time()
+
+        index = cls()
+        count = index.load_cards(iter_bulk_cards(path))
+        index.source_path = path
+        index.load_time = time.time() - start_time
+        logger.info(f"📚 Local card index loaded: {count} cards from {path} in {index.load_time:.2f}s")
+        return index
+
+    def load_cards(self, cards: Iterable[Dict[str, Any]]) -> int:
+        """Add bulk entries to the index and return the number of unique names"""
+        for card in cards:
+            self.add_card(card)
+        return len(self.cards_by_name)
+
+    def add_card(self, card: Dict[str, Any]):
+        """Index one card, keeping the most relevant printing per name"""
+        if card.get('layout') in SKIPPED_LAYOUTS or not card.get('name'):
+            return
+
+        slim = {field: card[field] for field in INDEX_FIELDS if field in card}
+        key = normalize_name(slim['name'])
+
+        existing = self.cards_by_name.get(key)
+        if existing is not None and printing_rank(card) <= printing_rank(existing):
+            return
+
+        if existing is not None:
+            self.cards_by_id.pop(existing.get('id'), None)
+        else:
+            self._matcher = None
+            self._prefixes = None
+
+        self.cards_by_name[key] = slim
+        self.cards_by_loose_name[loose_name(slim['name'])] = slim
+        if slim.get('id'):
+            self.cards_by_id[slim['id']] = slim
+
+        # Split, adventure and MDFC cards are also found by face name
+        for face in slim.get('card_faces') or []:
+            face_name = face.get('name')
+            if face_name and face_name != slim['name']:
+                self.cards_by_name.setdefault(normalize_name(face_name), slim)
+                self.cards_by_loose_name.setdefault(loose_name(face_name), slim)
+
+    def get_exact(self, name: str) -> Optional[Dict[str, Any]]:
+        """Exact (case-insensitive) name lookup"""
+        return self.cards_by_name.get(normalize_name(name))
+
+    def get_fuzzy(self, name: str) -> Optional[Dict[str, Any]]:
+        """Exact lookup, then punctuation-insensitive lookup"""
+        return self.get_exact(name) or self.cards_by_loose_name.get(loose_name(name))
+
+    def get_by_id(self, card_id: str) -> Optional[Dict[str, Any]]:
+        """Scryfall id lookup"""
+        return self.cards_by_id.get(card_id)
+
+    @property
+    def matcher(self) -> CardNameMatcher:
+        """Approximate matcher over every indexed name (built on first use)"""
+        if self._matcher is None:
+            self._matcher = CardNameMatcher(self.names())
+        return self._matcher
+
+    @property
+    def prefixes(self):
+        """Prefix index over every indexed name and face name (built on first use)"""
+        if self._prefixes is None:
+            # Imported here: prefix_index builds on this module's helpers
+            from prefix_index import CardPrefixIndex
+            self._prefixes = CardPrefixIndex.from_cards(
+                card for key, card in self.cards_by_name.items() if normalize_name(card['name']) == key
+            )
+        return self._prefixes
+
+    def match(self, name: str, score_cutoff: float = 88) -> Optional[Dict[str, Any]]:
+        """Best approximate match above `score_cutoff` (0-100), or None"""
+        best = self.matcher.best(name, score_cutoff=score_cutoff)
+        return self.get_exact(best[0]) if best else None
+
+    def complete(self, prefix: str, limit: int = 20, **filters) -> List[str]:
+        """Names starting with `prefix` (see CardPrefixIndex.complete for the filters)"""
+        return self.prefixes.complete(prefix, limit=limit, **filters)
+
+    def names(self) -> List[str]:
+        """Canonical names of all indexed cards"""
+        return [card['name'] for key, card in self.cards_by_name.items()
+                if normalize_name(card['name']) == key]
+
+    def __len__(self) -> int:
+        return len(self.cards_by_id)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get_exact(name) is not None
+
+
+def load_default_index(path: Optional[str] = None):
+    """
+    Open the columnar card store (data/scryfall-store, see card_store.py) when
+    it has been built, otherwise load the index from `path`, SCRYFALL_DATA_PATH
+    or data/scryfall-default-cards.json.
+    Returns None when no card data is available (network-only mode).
+    """
+    if path is None:
+        # Imported here: card_store builds on this module's helpers
+        from card_store import open_card_store
+        store = open_card_store()
+        if store is not None:
+            return store
+
+    path = path or os.getenv('SCRYFALL_DATA_PATH') or str(DEFAULT_BULK_PATH)
+    if not os.path.exists(path):
+        logger.info(f"No Scryfall bulk file at {path}, local card index disabled")
+        return None
+
+    try:
+        return LocalCardIndex.from_bulk_file(path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load local card index from {path}: {e}")
+        return None
+
+
+_shared_index = None
+_shared_index_loaded = False
+_shared_index_lock = threading.Lock()
+
+
+def get_shared_index():
+    """Process-wide index, loaded once and shared by every service and validator"""
+    global _shared_index, _shared_index_loaded
+    with _shared_index_lock:
+        if not _shared_index_loaded:
+            _shared_index = load_default_index()
+            _shared_index_loaded = True
+    return _shared_index
+
+
+def set_shared_index(index):
+    """Swap the process-wide index (after a bulk refresh); readers keep the old one until they re-fetch"""
+    global _shared_index, _shared_index_loaded
+    with _shared_index_lock:
+        _shared_index = index
+        _shared_index_loaded = True
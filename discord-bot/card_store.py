@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+🗄️ Columnar Card Store
+Compact, memory-mapped form of the Scryfall bulk export.
+
+The bulk file (hundreds of MB) is stream-parsed once by `build_card_store`
+into a directory of flat files:
+- fixed-width numeric columns (.npy): cmc, color bits, legality bitmasks, prices
+- interned strings (names, sets, rarities, type lines): one blob + offsets
+- sorted fixed-width key arrays for exact, punctuation-insensitive and id lookups
+- the slim card JSON of each row, decoded lazily on lookup
+
+`CardStore` opens it with np.load(mmap_mode='r'): nothing is parsed at
+startup and every worker process shares the same pages through the OS cache.
+
+    python card_store.py build [data/scryfall-default-cards.json] [data/scryfall-store]
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from card_index import (
+    DEFAULT_BULK_PATH, INDEX_FIELDS, SKIPPED_LAYOUTS, iter_bulk_cards,
+    loose_name, normalize_name, printing_rank,
+)
+from name_matcher import CardNameMatcher
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent.parent / 'data' / 'scryfall-store'
+
+# Bit positions of the legality bitmasks (uint32 columns)
+FORMATS = (
+    'standard', 'future', 'historic', 'timeless', 'gladiator', 'pioneer',
+    'explorer', 'modern', 'legacy', 'pauper', 'vintage', 'penny', 'commander',
+    'oathbreaker', 'standardbrawl', 'brawl', 'alchemy', 'paupercommander',
+    'duel', 'oldschool', 'premodern', 'predh',
+)
+FORMAT_BITS = {name: 1 << i for i, name in enumerate(FORMATS)}
+
+COLOR_BITS = {'W': 1, 'U': 2, 'B': 4, 'R': 8, 'G': 16}
+
+PRICE_FIELDS = ('usd', 'usd_foil', 'eur', 'tix')
+
+
+def color_mask(colors: Optional[Iterable[str]]) -> int:
+    mask = 0
+    for color in colors or ():
+        mask |= COLOR_BITS.get(color, 0)
+    return mask
+
+
+def card_colors(card: Dict[str, Any]) -> List[str]:
+    """Top-level colors, or the union of face colors (MDFCs carry them per face)"""
+    if card.get('colors') is not None:
+        return card['colors']
+    colors = []
+    for face in card.get('card_faces') or []:
+        colors.extend(c for c in face.get('colors') or [] if c not in colors)
+    return colors
+
+
+def legality_masks(legalities: Optional[Dict[str, str]]) -> Tuple[int, int, int]:
+    """(legal, restricted, banned) bitmasks over FORMATS"""
+    legal = restricted = banned = 0
+    for fmt, status in (legalities or {}).items():
+        bit = FORMAT_BITS.get(fmt)
+        if bit is None:
+            continue
+        if status == 'legal':
+            legal |= bit
+        elif status == 'restricted':
+            restricted |= bit
+        elif status == 'banned':
+            banned |= bit
+    return legal, restricted, banned
+
+
+def parse_price(value: Any) -> float:
+    try:
+        return float(value) if value not in (None, '') else float('nan')
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class _StringTable:
+    """Interned strings: each distinct value is stored once and referenced by id"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[bytes] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        value = value or ''
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.values)
+            self.values.append(value.encode('utf-8'))
+        return string_id
+
+
+def _blob_and_offsets(values: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(values) + 1, dtype=np.uint64)
+    if values:
+        offsets[1:] = np.cumsum([len(v) for v in values], dtype=np.uint64)
+    blob = np.frombuffer(b''.join(values), dtype=np.uint8) if values else np.zeros(0, dtype=np.uint8)
+    return blob, offsets
+
+
+def _sorted_keys(pairs: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Fixed-width byte keys sorted for np.searchsorted, and their row numbers"""
+    items = sorted((key.encode('utf-8'), row) for key, row in pairs.items())
+    width = max((len(k) for k, _ in items), default=1)
+    keys = np.array([k for k, _ in items], dtype=f'S{max(width, 1)}')
+    rows = np.array([r for _, r in items], dtype=np.uint32)
+    return keys, rows
+
+
+def build_card_store(bulk_path: Optional[str] = None, store_path: Optional[str] = None,
+                     chunk_size: int = 1 << 20) -> Dict[str, Any]:
+    """
+    Stream-parse a bulk file into a columnar store and return its metadata.
+    Two passes: the first only keeps (rank, position) per name to pick the
+    preferred printing, the second writes the winners, so memory stays
+    proportional to the number of distinct names, never to the file size.
+    The store is written next to `store_path` and renamed into place.
+    """
+    bulk_path = str(bulk_path or DEFAULT_BULK_PATH)
+    store_path = Path(store_path or DEFAULT_STORE_PATH)
+    start_time = time.time()
+
+    # Pass 1: preferred printing per name
+    winners: Dict[str, Tuple[tuple, int]] = {}
+    for position, card in enumerate(iter_bulk_cards(bulk_path, chunk_size)):
+        if card.get('layout') in SKIPPED_LAYOUTS or not card.get('name'):
+            continue
+        key = normalize_name(card['name'])
+        rank = printing_rank(card)
+        current = winners.get(key)
+        if current is None or rank > current[0]:
+            winners[key] = (rank, position)
+    selected = {position for _, position in winners.values()}
+    del winners
+
+    # Pass 2: columns for the selected printings
+    strings = _StringTable()
+    records: List[bytes] = []
+    columns: Dict[str, list] = {name: [] for name in (
+        'name_id', 'set_id', 'rarity_id', 'type_line_id', 'cmc', 'colors',
+        'color_identity', 'legal', 'restricted', 'banned',
+    )}
+    prices: Dict[str, list] = {field: [] for field in PRICE_FIELDS}
+    exact_keys: Dict[str, int] = {}
+    loose_keys: Dict[str, int] = {}
+    id_keys: Dict[str, int] = {}
+    face_names: List[Tuple[str, int]] = []
+
+    for position, card in enumerate(iter_bulk_cards(bulk_path, chunk_size)):
+        if position not in selected:
+            continue
+        row = len(records)
+        slim = {field: card[field] for field in INDEX_FIELDS if field in card}
+        records.append(json.dumps(slim, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+
+        columns['name_id'].append(strings.intern(slim['name']))
+        columns['set_id'].append(strings.intern(slim.get('set')))
+        columns['rarity_id'].append(strings.intern(slim.get('rarity')))
+        columns['type_line_id'].append(strings.intern(slim.get('type_line')))
+        columns['cmc'].append(float(slim.get('cmc') or 0))
+        columns['colors'].append(color_mask(card_colors(slim)))
+        columns['color_identity'].append(color_mask(slim.get('color_identity')))
+        legal, restricted, banned = legality_masks(slim.get('legalities'))
+        columns['legal'].append(legal)
+        columns['restricted'].append(restricted)
+        columns['banned'].append(banned)
+        card_prices = slim.get('prices') or {}
+        for field in PRICE_FIELDS:
+            prices[field].append(parse_price(card_prices.get(field)))
+
+        exact_keys[normalize_name(slim['name'])] = row
+        loose_keys[loose_name(slim['name'])] = row
+        if slim.get('id'):
+            id_keys[slim['id']] = row
+        for face in slim.get('card_faces') or []:
+            if face.get('name') and face['name'] != slim['name']:
+                face_names.append((face['name'], row))
+
+    # Split, adventure and MDFC cards are also found by face name
+    for face_name, row in face_names:
+        exact_keys.setdefault(normalize_name(face_name), row)
+        loose_keys.setdefault(loose_name(face_name), row)
+
+    tmp_path = store_path.with_name(store_path.name + '.new')
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    dtypes = {
+        'name_id': np.uint32, 'set_id': np.uint32, 'rarity_id': np.uint32,
+        'type_line_id': np.uint32, 'cmc': np.float32, 'colors': np.uint8,
+        'color_identity': np.uint8, 'legal': np.uint32, 'restricted': np.uint32,
+        'banned': np.uint32,
+    }
+    for name, values in columns.items():
+        np.save(tmp_path / f'{name}.npy', np.array(values, dtype=dtypes[name]))
+    for field, values in prices.items():
+        np.save(tmp_path / f'price_{field}.npy', np.array(values, dtype=np.float32))
+
+    for name, values in (('strings', strings.values), ('records', records)):
+        blob, offsets = _blob_and_offsets(values)
+        np.save(tmp_path / f'{name}.npy', blob)
+        np.save(tmp_path / f'{name}_offsets.npy', offsets)
+
+    for name, pairs in (('exact', exact_keys), ('loose', loose_keys), ('id', id_keys)):
+        keys, rows = _sorted_keys(pairs)
+        np.save(tmp_path / f'{name}_keys.npy', keys)
+        np.save(tmp_path / f'{name}_rows.npy', rows)
+
+    source = os.stat(bulk_path)
+    meta = {
+        'version': STORE_VERSION,
+        'cards': len(records),
+        'strings': len(strings.values),
+        'formats': list(FORMATS),
+        'colors': list(COLOR_BITS),
+        'prices': list(PRICE_FIELDS),
+        'source': os.path.abspath(bulk_path),
+        'source_size': source.st_size,
+        'source_mtime': source.st_mtime,
+        'built_at': time.time(),
+    }
+    with open(tmp_path / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    _swap_directory(tmp_path, store_path)
+    logger.info(f"🗄️ Card store built: {len(records)} cards from {bulk_path} "
+                f"in {time.time() - start_time:.1f}s -> {store_path}")
+    return meta
+
+
+def _swap_directory(new_path: Path, target: Path):
+    """Move a freshly written store into place; readers keep their mmaps of the old files"""
+    old_path = target.with_name(target.name + '.old')
+    shutil.rmtree(old_path, ignore_errors=True)
+    if target.exists():
+        os.replace(target, old_path)
+    os.replace(new_path, target)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+class CardStore:
+    """
+    Read-only, memory-mapped card store. Lookup API is the same as
+    LocalCardIndex, plus the numeric columns for vectorized queries.
+    """
+
+    def __init__(self, path: Optional[str] = None, record_cache_size: int = 4096):
+        self.path = Path(path or DEFAULT_STORE_PATH)
+        start_time = time.time()
+
+        with open(self.path / 'meta.json', 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported card store version {self.meta.get('version')} in {self.path}")
+
+        self.formats: Tuple[str, ...] = tuple(self.meta['formats'])
+        self.format_bits = {name: 1 << i for i, name in enumerate(self.formats)}
+
+        load = self._load
+        self.name_id = load('name_id')
+        self.set_id = load('set_id')
+        self.rarity_id = load('rarity_id')
+        self.type_line_id = load('type_line_id')
+        self.cmc = load('cmc')
+        self.colors = load('colors')
+        self.color_identity = load('color_identity')
+        self.legal = load('legal')
+        self.restricted = load('restricted')
+        self.banned = load('banned')
+        self.prices = {field: load(f'price_{field}') for field in self.meta['prices']}
+
+        self._strings, self._string_offsets = load('strings'), load('strings_offsets')
+        self._records, self._record_offsets = load('records'), load('records_offsets')
+        self._keys = {name: (load(f'{name}_keys'), load(f'{name}_rows')) for name in ('exact', 'loose', 'id')}
+
+        self._record = lru_cache(maxsize=record_cache_size)(self._decode_record)
+        self._matcher: Optional[CardNameMatcher] = None
+        self._prefixes = None
+        self.source_path = str(self.path)
+        self.load_time = time.time() - start_time
+        logger.info(f"🗄️ Card store opened: {len(self)} cards from {self.path} in {self.load_time * 1000:.1f}ms")
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(self.path / f'{name}.npy', mmap_mode='r')
+
+    def string(self, string_id: int) -> str:
+        """Interned string by id"""
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return bytes(self._strings[start:end]).decode('utf-8')
+
+    def name_of(self, row: int) -> str:
+        return self.string(int(self.name_id[row]))
+
+    def card(self, row: int) -> Dict[str, Any]:
+        """Full (slim) card JSON of a row"""
+        return self._record(int(row))
+
+    def _decode_record(self, row: int) -> Dict[str, Any]:
+        start, end = self._record_offsets[row], self._record_offsets[row + 1]
+        return json.loads(bytes(self._records[start:end]))
+
+    def _find(self, table: str, key: str) -> Optional[int]:
+        keys, rows = self._keys[table]
+        if not key or not len(keys):
+            return None
+        encoded = key.encode('utf-8')
+        if len(encoded) > keys.dtype.itemsize:
+            return None
+        i = int(np.searchsorted(keys, encoded))
+        if i < len(keys) and keys[i] == encoded:
+            return int(rows[i])
+        return None
+
+    def row_for_name(self, name: str) -> Optional[int]:
+        """Row of an exact (case-insensitive) name, or None"""
+        return self._find('exact', normalize_name(name))
+
+    def get_exact(self, name: str) -> Optional[Dict[str, Any]]:
+        row = self.row_for_name(name)
+        return self.card(row) if row is not None else None
+
+    def get_fuzzy(self, name: str) -> Optional[Dict[str, Any]]:
+        """Exact lookup, then punctuation-insensitive lookup"""
+        row = self.row_for_name(name)
+        if row is None:
+            row = self._find('loose', loose_name(name))
+        return self.card(row) if row is not None else None
+
+    def get_by_id(self, card_id: str) -> Optional[Dict[str, Any]]:
+        row = self._find('id', card_id)
+        return self.card(row) if row is not None else None
+
+    @property
+    def matcher(self) -> CardNameMatcher:
+        """Approximate matcher over every stored name (built on first use)"""
+        if self._matcher is None:
+            self._matcher = CardNameMatcher(self.names())
+        return self._matcher
+
+    def match(self, name: str, score_cutoff: float = 88) -> Optional[Dict[str, Any]]:
+        """Best approximate match above `score_cutoff` (0-100), or None"""
+        best = self.matcher.best(name, score_cutoff=score_cutoff)
+        return self.get_exact(best[0]) if best else None
+
+    @property
+    def prefixes(self):
+        """Prefix index over every stored name and face name, from the exact-name keys and the columns"""
+        if self._prefixes is None:
+            from prefix_index import CardPrefixIndex
+            keys, rows = self._keys['exact']
+            playable = np.asarray(self.legal) | np.asarray(self.restricted)
+            identity = np.asarray(self.color_identity)
+            self._prefixes = CardPrefixIndex(
+                (key.decode('utf-8'), self.name_of(row), int(identity[row]), int(playable[row]))
+                for key, row in zip(keys.tolist(), rows.tolist())
+            )
+        return self._prefixes
+
+    def complete(self, prefix: str, limit: int = 20, **filters) -> List[str]:
+        """Names starting with `prefix` (see CardPrefixIndex.complete for the filters)"""
+        return self.prefixes.complete(prefix, limit=limit, **filters)
+
+    def names(self) -> List[str]:
+        """Canonical names of all stored cards"""
+        return [self.string(int(string_id)) for string_id in self.name_id]
+
+    def __len__(self) -> int:
+        return len(self.name_id)
+
+    def __contains__(self, name: str) -> bool:
+        return self.row_for_name(name) is not None
+
+
+def open_card_store(path: Optional[str] = None) -> Optional[CardStore]:
+    """Open the store at `path`, SCRYFALL_STORE_PATH or data/scryfall-store; None if absent"""
+    path = Path(path or os.getenv('SCRYFALL_STORE_PATH') or DEFAULT_STORE_PATH)
+    if not (path / 'meta.json').exists():
+        return None
+    try:
+        return CardStore(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Failed to open card store at {path}: {e}")
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scryfall bulk data -> columnar card store")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="stream-parse a bulk file into a store")
+    build.add_argument('bulk_path', nargs='?', default=str(DEFAULT_BULK_PATH))
+    build.add_argument('store_path', nargs='?', default=str(DEFAULT_STORE_PATH))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    meta = build_card_store(args.bulk_path, args.store_path)
+    print(f"✅ {meta['cards']} cards -> {args.store_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,8 +9,19 @@ from typing import List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+from printed_names import PrintedNameIndex, loaded_shared_printed_names
+
 logger = logging.getLogger(__name__)
 
+BASIC_LANDS = {
+    'plains', 'island', 'swamp', 'mountain', 'forest', 'wastes',
+    'snow-covered plains', 'snow-covered island', 'snow-covered swamp',
+    'snow-covered mountain', 'snow-covered forest', 'snow-covered wastes',
+}
+
+# Repli quand l'index des noms imprimés n'est pas construit
+FRENCH_BASIC_LANDS = {'plaine', 'île', 'marais', 'montagne', 'forêt'}
+
 @dataclass
 class ProcessedCard:
     """Représente une carte après regroupement"""
@@ -32,8 +43,11 @@ class ValidationResult:
 class DeckProcessor:
     """Processeur intelligent pour regrouper et valider les decks"""
     
-    def __init__(self, strict_mode: bool = True):
+    def __init__(self, strict_mode: bool = True, printed_names: Optional[PrintedNameIndex] = None):
         self.strict_mode = strict_mode
+        # Index des noms imprimés : injecté, ou celui déjà chargé au warm-up (jamais lu du disque ici,
+        # on est appelé pendant un scan sur la boucle asyncio)
+        self.printed_names = printed_names
         self.logger = logging.getLogger(f"{__name__}.DeckProcessor")
         
     def process_deck(self, main_cards: List[Tuple[str, int]], 
@@ -151,14 +165,12 @@ class DeckProcessor:
         )
     
     def _is_basic_land(self, card_name: str) -> bool:
-        """Vérifie si c'est un terrain de base"""
-        basics = {
-            'plains', 'island', 'swamp', 'mountain', 'forest',
-            'plaine', 'île', 'marais', 'montagne', 'forêt',
-            'snow-covered plains', 'snow-covered island', 'snow-covered swamp',
-            'snow-covered mountain', 'snow-covered forest'
-        }
-        return card_name.lower() in basics
+        """Vérifie si c'est un terrain de base (noms imprimés traduits par l'index multilingue)"""
+        if card_name.lower() in BASIC_LANDS or card_name.lower() in FRENCH_BASIC_LANDS:
+            return True
+        printed_names = self.printed_names or loaded_shared_printed_names()
+        english = printed_names.resolve(card_name) if printed_names else None
+        return bool(english) and english.lower() in BASIC_LANDS
     
     def export_to_format(self, cards: List[ProcessedCard], format_type: str = 'mtga') -> str:
         """Exporte les cartes dans le format demandé"""
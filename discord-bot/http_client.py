@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+🌐 Shared HTTP Client
+One long-lived, pooled client for every outbound call of the bot: Discord
+attachment downloads, Scryfall, the OCR web API and bulk-data refreshes.
+Keep-alive connections, cached DNS and per-host limits mean a scan no longer
+pays a TCP + TLS handshake per request.
+
+Blocking callers (scripts) share one pooled requests.Session
+from `get_sync_session()`. `stats()` reports connection reuse for both.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, BinaryIO, Dict, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'MTG-Discord-Scanner-Enhanced/2.0 (https://github.com/user/mtg-scanner)',
+}
+
+
+class HttpDownloadError(Exception):
+    """Download refused (bad status or larger than allowed)"""
+
+
+class HttpClient:
+    """Application-wide aiohttp session (created lazily on the running loop) plus reuse statistics"""
+
+    def __init__(self, limit: Optional[int] = None, limit_per_host: Optional[int] = None,
+                 dns_cache_ttl: int = 300, keepalive_timeout: float = 60,
+                 timeout: Optional[aiohttp.ClientTimeout] = None):
+        self.limit = limit or int(os.getenv('HTTP_POOL_LIMIT', '64'))
+        self.limit_per_host = limit_per_host or int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '16'))
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout or aiohttp.ClientTimeout(total=60, connect=10)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sessions_created = 0
+        self.counters = {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0,
+            'bytes_downloaded': 0,
+        }
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        counters = self.counters
+
+        def counter(name):
+            async def increment(session, context, params):
+                counters[name] += 1
+            return increment
+
+        trace.on_request_start.append(counter('requests'))
+        trace.on_connection_create_end.append(counter('connections_created'))
+        trace.on_connection_reuseconn.append(counter('connections_reused'))
+        trace.on_dns_cache_hit.append(counter('dns_cache_hits'))
+        trace.on_dns_cache_miss.append(counter('dns_cache_misses'))
+        return trace
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled session of the running event loop (re-created if the loop changed)"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._drop_stale_session()
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout, headers=DEFAULT_HEADERS,
+                trace_configs=[self._trace_config()],
+            )
+            self._loop = loop
+            self.sessions_created += 1
+        return self._session
+
+    def _drop_stale_session(self):
+        """Close the session of a previous event loop (asyncio.run called again) instead of leaking it"""
+        session, loop = self._session, self._loop
+        self._session = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            # Still serving another thread: close it there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        elif session.connector is not None:
+            # Its loop is finished or idle, nothing can await there: drop the pooled connections now
+            session.connector._close()
+
+    async def download(self, url: str, out: BinaryIO, max_bytes: Optional[int] = None,
+                       chunk_size: int = 64 * 1024, **kwargs) -> int:
+        """Stream `url` into `out` chunk by chunk; returns the number of bytes written"""
+        written = 0
+        async with self.session.get(url, **kwargs) as response:
+            if response.status != 200:
+                raise HttpDownloadError(f"Failed to download {url}: HTTP {response.status}")
+            if max_bytes and (response.content_length or 0) > max_bytes:
+                raise HttpDownloadError(f"{url} is {response.content_length} bytes (max {max_bytes})")
+            async for chunk in response.content.iter_chunked(chunk_size):
+                written += len(chunk)
+                if max_bytes and written > max_bytes:
+                    raise HttpDownloadError(f"{url} is larger than {max_bytes} bytes")
+                out.write(chunk)
+        self.counters['bytes_downloaded'] += written
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection reuse statistics (async pool and shared blocking session)"""
+        requests_made = self.counters['requests']
+        return {
+            **self.counters,
+            'reuse_ratio': round(self.counters['connections_reused'] / requests_made, 3) if requests_made else 0.0,
+            'sessions_created': self.sessions_created,
+            'sync': sync_session_stats(),
+        }
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_shared_client: Optional[HttpClient] = None
+_sync_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide pooled client"""
+    global _shared_client
+    with _lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+    return _shared_client
+
+
+def get_sync_session() -> requests.Session:
+    """Process-wide pooled requests.Session for blocking callers (keep-alive, per-host pools)"""
+    global _sync_session
+    with _lock:
+        if _sync_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '16')))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _sync_session = session
+    return _sync_session
+
+
+def sync_session_stats() -> Dict[str, int]:
+    """Requests and connections of the shared blocking session, summed over its host pools"""
+    if _sync_session is None:
+        return {'requests': 0, 'connections_created': 0}
+    requests_made = connections = 0
+    for adapter in set(_sync_session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                requests_made += pool.num_requests
+                connections += pool.num_connections
+    return {'requests': requests_made, 'connections_created': connections}
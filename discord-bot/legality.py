@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+⚖️ Deck Legality Engine
+Format detection and legality checks over per-card bitmasks (one bit per
+format in card_store.FORMATS) instead of walking each card's `legalities` dict.
+
+A deck is a handful of parallel arrays (legal / restricted / banned masks,
+quantities, basic-land flags); detection is one AND-reduction and the issue
+list is a few boolean masks. `batch_*` functions run the same checks over
+thousands of decks at once against a CardStore, for offline analytics.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from card_store import FORMAT_BITS, legality_masks
+
+ALL_FORMATS = (1 << 32) - 1
+
+# Constructed formats tried for 60-card decks, narrowest first
+CONSTRUCTED_FORMATS = ('standard', 'modern', 'legacy', 'vintage')
+
+MAX_COPIES = 4
+
+
+def is_basic_land(type_line: Optional[str]) -> bool:
+    return 'basic' in (type_line or '').lower()
+
+
+def is_commander_type(type_line: Optional[str]) -> bool:
+    type_line = (type_line or '').lower()
+    return 'legendary' in type_line and ('creature' in type_line or 'planeswalker' in type_line)
+
+
+def detect_format_from_mask(playable: int, total_cards: int, has_commander: bool) -> str:
+    """Most likely format from the formats every card is playable in, the deck size and commander"""
+    if has_commander and total_cards in (99, 100):  # Commander + 99 other cards
+        return 'commander'
+
+    if 58 <= total_cards <= 62:  # Allow for slight OCR errors
+        for format_name in CONSTRUCTED_FORMATS:
+            if playable & FORMAT_BITS[format_name]:
+                return format_name
+        return 'legacy'  # Default for older cards
+
+    if total_cards < 40:
+        return 'limited'  # Draft/Sealed
+    elif total_cards > 100:
+        return 'casual'
+    return 'unknown'
+
+
+@dataclass
+class DeckLegality:
+    """Legality vectors of one deck, one entry per distinct card"""
+    names: List[str]
+    quantities: np.ndarray      # int32
+    legal: np.ndarray           # uint32 bitmasks over FORMATS
+    restricted: np.ndarray
+    banned: np.ndarray
+    known: np.ndarray           # bool: card came with legality data
+    basic: np.ndarray           # bool: basic land (no copy limit)
+
+    @classmethod
+    def from_cards(cls, cards: Sequence[Dict[str, Any]]) -> 'DeckLegality':
+        """From deck entries ({'quantity', 'card_data'}); copies of the same card are summed"""
+        rows: Dict[str, List[Any]] = {}
+        for card in cards:
+            card_data = card.get('card_data')
+            if not card_data or not card_data.get('name'):
+                continue
+            row = rows.get(card_data['name'])
+            if row is None:
+                legalities = card_data.get('legalities')
+                rows[card_data['name']] = [
+                    card.get('quantity', 1), *legality_masks(legalities),
+                    bool(legalities), is_basic_land(card_data.get('type_line')),
+                ]
+            else:
+                row[0] += card.get('quantity', 1)
+
+        columns = list(zip(*rows.values())) or [()] * 6
+        return cls(
+            names=list(rows),
+            quantities=np.array(columns[0], dtype=np.int32),
+            legal=np.array(columns[1], dtype=np.uint32),
+            restricted=np.array(columns[2], dtype=np.uint32),
+            banned=np.array(columns[3], dtype=np.uint32),
+            known=np.array(columns[4], dtype=bool),
+            basic=np.array(columns[5], dtype=bool),
+        )
+
+    @property
+    def total_cards(self) -> int:
+        return int(self.quantities.sum())
+
+    def playable_formats(self) -> int:
+        """Bitmask of the formats every card (with legality data) is legal or restricted in"""
+        masks = (self.legal | self.restricted)[self.known]
+        return int(np.bitwise_and.reduce(masks)) if len(masks) else ALL_FORMATS
+
+    def detect_format(self, total_cards: Optional[int] = None, has_commander: bool = False) -> str:
+        if total_cards is None:
+            total_cards = self.total_cards
+        return detect_format_from_mask(self.playable_formats(), total_cards, has_commander)
+
+    def violations(self, format_name: str) -> Dict[str, np.ndarray]:
+        """
+        Boolean masks per card: banned, over the restricted limit, not legal,
+        over the 4-copy limit. Status checks only apply to formats with a
+        legality bit ('limited', 'casual'... only get the copy check).
+        """
+        format_name = format_name.lower()
+        bit = FORMAT_BITS.get(format_name, 0)
+        known = self.known & (bit != 0)
+        banned = known & ((self.banned & bit) != 0)
+        restricted = known & ((self.restricted & bit) != 0)
+        not_legal = known & ~banned & ~restricted & ((self.legal & bit) == 0)
+        too_many = ~self.basic & (self.quantities > MAX_COPIES)
+        if format_name == 'commander':
+            too_many = np.zeros_like(too_many)
+        return {
+            'banned': banned,
+            'restricted': restricted & (self.quantities > 1),
+            'not_legal': not_legal,
+            'too_many': too_many,
+        }
+
+    def issues(self, format_name: str) -> List[str]:
+        """Human-readable legality issues, in deck order"""
+        flags = self.violations(format_name)
+        flagged = np.flatnonzero(flags['banned'] | flags['restricted'] | flags['not_legal'] | flags['too_many'])
+        issues = []
+        for i in flagged:
+            name = self.names[i]
+            if flags['banned'][i]:
+                issues.append(f"❌ {name} is banned in {format_name}")
+            elif flags['restricted'][i]:
+                issues.append(f"⚠️ {name} is restricted to 1 copy in {format_name}")
+            elif flags['not_legal'][i]:
+                issues.append(f"❌ {name} is not legal in {format_name}")
+            if flags['too_many'][i]:
+                issues.append(f"❌ Too many copies of {name} ({self.quantities[i]}/{MAX_COPIES})")
+        return issues
+
+
+def _type_line_flags(store, predicate: Callable[[str], bool]) -> np.ndarray:
+    """Per-row bool column: `predicate` evaluated once per distinct type line"""
+    type_ids, inverse = np.unique(np.asarray(store.type_line_id), return_inverse=True)
+    per_type = np.array([predicate(store.string(int(t))) for t in type_ids], dtype=bool)
+    return per_type[inverse] if len(type_ids) else np.zeros(0, dtype=bool)
+
+
+def _deck_rows(deck_ids: Sequence[int], rows: Sequence[int], quantities: Optional[Sequence[int]],
+               n_decks: Optional[int]):
+    """Merge duplicate (deck, row) pairs, summing their quantities"""
+    deck_ids = np.asarray(deck_ids, dtype=np.int64)
+    rows = np.asarray(rows, dtype=np.int64)
+    quantities = (np.ones(len(rows), dtype=np.int64) if quantities is None
+                  else np.asarray(quantities, dtype=np.int64))
+    if n_decks is None:
+        n_decks = int(deck_ids.max()) + 1 if len(deck_ids) else 0
+
+    stride = int(rows.max()) + 1 if len(rows) else 1
+    pairs, inverse = np.unique(deck_ids * stride + rows, return_inverse=True)
+    merged = np.bincount(inverse, weights=quantities, minlength=len(pairs)).astype(np.int64)
+    return pairs // stride, pairs % stride, merged, n_decks
+
+
+def batch_detect_formats(store, deck_ids: Sequence[int], rows: Sequence[int],
+                         quantities: Optional[Sequence[int]] = None,
+                         n_decks: Optional[int] = None) -> List[str]:
+    """
+    Detected format of every deck. Decks are given as flat parallel arrays:
+    deck number, CardStore row and quantity of each entry.
+    """
+    decks, rows, quantities, n_decks = _deck_rows(deck_ids, rows, quantities, n_decks)
+
+    playable = np.full(n_decks, ALL_FORMATS, dtype=np.uint32)
+    np.bitwise_and.at(playable, decks, (np.asarray(store.legal) | np.asarray(store.restricted))[rows])
+    totals = np.bincount(decks, weights=quantities, minlength=n_decks).astype(np.int64)
+
+    commander_rows = _type_line_flags(store, is_commander_type)[rows] & (
+        (np.asarray(store.legal)[rows] & FORMAT_BITS['commander']) != 0)
+    has_commander = np.bincount(decks, weights=commander_rows.astype(np.float64), minlength=n_decks) > 0
+
+    return [detect_format_from_mask(int(p), int(t), bool(c))
+            for p, t, c in zip(playable, totals, has_commander)]
+
+
+def batch_issue_counts(store, format_name: str, deck_ids: Sequence[int], rows: Sequence[int],
+                       quantities: Optional[Sequence[int]] = None,
+                       n_decks: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Per-deck counts of each violation kind (see DeckLegality.violations) in `format_name`"""
+    decks, rows, quantities, n_decks = _deck_rows(deck_ids, rows, quantities, n_decks)
+    deck = DeckLegality(
+        names=[],
+        quantities=quantities,
+        legal=np.asarray(store.legal)[rows],
+        restricted=np.asarray(store.restricted)[rows],
+        banned=np.asarray(store.banned)[rows],
+        known=np.ones(len(rows), dtype=bool),
+        basic=_type_line_flags(store, is_basic_land)[rows],
+    )
+    return {kind: np.bincount(decks, weights=flags.astype(np.float64), minlength=n_decks).astype(np.int64)
+            for kind, flags in deck.violations(format_name).items()}
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+📈 Metrics
+Prometheus instruments (prometheus_client) for the bot's /metrics endpoint:
+per-stage scan latency histograms, Scryfall request and cache counters,
+queue depth, OCR worker utilization and memory, and process RSS (the
+client's default process collector).
+
+Instruments are module-level and process-wide; values that already live
+elsewhere (bot.stats, cache stats, pool stats) are read at scrape time
+through collectors (`add_collector`) instead of being mirrored.
+"""
+
+import logging
+import os
+import resource
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import Metric
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Scan stages, in pipeline order
+STAGES = ('download', 'preprocess', 'ocr', 'parse', 'validate', 'export')
+
+# Seconds: covers a cached Scryfall hit (ms) up to a cold CPU OCR pass (tens of s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def process_rss_bytes(pid: Optional[int] = None) -> float:
+    """Current resident set size of this process, or of `pid` (0 if it is gone); peak RSS where /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return float(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE'))
+    except (OSError, ValueError, IndexError):
+        if pid is not None:
+            return 0.0
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return float(peak if os.uname().sysname == 'Darwin' else peak * 1024)
+
+
+class _ScrapeCollector:
+    """Runs `function()` (yielding metric families) at each scrape; a failing one is logged, not fatal"""
+
+    def __init__(self, name: str, function: Callable[[], Iterable[Metric]]):
+        self.name = name
+        self.function = function
+
+    def collect(self):
+        try:
+            yield from self.function()
+        except Exception as e:
+            logger.warning(f"Metrics collector {self.name} failed: {e}")
+
+    def describe(self):
+        return []  # families vary at runtime: no name check at registration
+
+
+_collectors: Dict[str, _ScrapeCollector] = {}
+_collectors_lock = threading.Lock()
+
+
+def add_collector(name: str, function: Callable[[], Iterable[Metric]]):
+    """Register `function()` (yields GaugeMetricFamily & co) for scrape time; re-adding a name replaces it"""
+    collector = _ScrapeCollector(name, function)
+    with _collectors_lock:
+        previous = _collectors.pop(name, None)
+        if previous is not None:
+            REGISTRY.unregister(previous)
+        REGISTRY.register(collector)
+        _collectors[name] = collector
+
+
+SCAN_STAGE_SECONDS = Histogram(
+    'mtg_scan_stage_seconds', 'Time spent in each scan stage', ['stage'], buckets=LATENCY_BUCKETS)
+SCANS = Counter(
+    'mtg_scans', 'Scans finished, by outcome', ['outcome'])
+SCANS_IN_PROGRESS = Gauge(
+    'mtg_scans_in_progress', 'Scans accepted and not finished yet (queue depth)')
+OCR_WORKERS = Gauge(
+    'mtg_ocr_workers', 'OCR workers available')
+OCR_WORKERS_BUSY = Gauge(
+    'mtg_ocr_workers_busy', 'OCR workers currently recognizing an image')
+SCRYFALL_REQUESTS = Counter(
+    'mtg_scryfall_requests', 'Scryfall HTTP attempts, by status (or error kind)', ['status'])
+SCRYFALL_REQUEST_SECONDS = Histogram(
+    'mtg_scryfall_request_seconds', 'Scryfall HTTP attempt latency', buckets=LATENCY_BUCKETS)
+SCRYFALL_CACHE = Counter(
+    'mtg_scryfall_cache', 'Scryfall lookups answered from cache (hit) or the network (miss)', ['result'])
+
+
+def observe_stage(stage: str):
+    """Context manager timing one scan stage into mtg_scan_stage_seconds"""
+    return SCAN_STAGE_SECONDS.labels(stage=stage).time()
+
+
+def stage_seconds() -> Dict[str, float]:
+    """Total seconds observed per stage so far (OCR workers report deltas to the bot)"""
+    totals = dict.fromkeys(STAGES, 0.0)
+    for family in SCAN_STAGE_SECONDS.collect():
+        for sample in family.samples:
+            if sample.name == 'mtg_scan_stage_seconds_sum' and sample.labels.get('stage') in totals:
+                totals[sample.labels['stage']] = sample.value
+    return totals
+
+
+def observe_stages(durations: Dict[str, float]):
+    """Record stage durations measured in another process"""
+    for stage, seconds in durations.items():
+        if stage in STAGES:
+            SCAN_STAGE_SECONDS.labels(stage=stage).observe(seconds)
+
+
+def render() -> bytes:
+    return generate_latest(REGISTRY)
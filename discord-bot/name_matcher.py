@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+🔎 Card Name Matcher
+In-process approximate matching over the full card-name universe (~30k names).
+A trigram inverted index scores every name at once with numpy (shared trigram
+counts -> Dice coefficient), then only the best candidates are rescored with
+Levenshtein ratios. Typical queries take well under a millisecond.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from fuzzywuzzy import fuzz
+
+_NORMALIZE_RE = re.compile(r"[^a-z0-9 ]+")
+
+
+def _normalize(name: str) -> str:
+    return ' '.join(_NORMALIZE_RE.sub(' ', name.lower().replace("'", '')).split())
+
+
+def _trigrams(key: str) -> List[str]:
+    padded = f"  {key} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class CardNameMatcher:
+    """Ranked approximate name lookup: trigram candidates + vectorized scoring"""
+
+    def __init__(self, names: Iterable[str], candidates: int = 25):
+        self.candidates = candidates
+        self.names: List[str] = sorted(set(n for n in names if n))
+        self._keys: List[str] = [_normalize(n) for n in self.names]
+        self._key_to_id: Dict[str, int] = {}
+        for name_id, key in enumerate(self._keys):
+            self._key_to_id.setdefault(key, name_id)
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        counts = np.zeros(len(self.names), dtype=np.float32)
+        for name_id, key in enumerate(self._keys):
+            grams = set(_trigrams(key))
+            counts[name_id] = len(grams)
+            for gram in grams:
+                postings[gram].append(name_id)
+
+        self._postings: Dict[str, np.ndarray] = {
+            gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()
+        }
+        self._trigram_counts = counts
+
+    def match(self, query: str, limit: int = 5, score_cutoff: float = 0,
+              partial: bool = False) -> List[Tuple[str, float]]:
+        """
+        Return up to `limit` (name, score) pairs, best first, scores on a 0-100 scale.
+        `partial` scores truncated queries ("Overlord of the Mis...") by best substring.
+        """
+        key = _normalize(query)
+        if not key or not self.names:
+            return []
+
+        exact_id = self._key_to_id.get(key)
+        if exact_id is not None and limit == 1:
+            return [(self.names[exact_id], 100.0)]
+
+        grams = set(_trigrams(key))
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return []
+
+        # Shared trigram counts for every name in one vectorized pass
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.names)).astype(np.float32)
+        dice = 2.0 * shared / (self._trigram_counts + len(grams))
+
+        k = min(self.candidates, len(self.names))
+        top_ids = np.argpartition(-dice, k - 1)[:k]
+        top_ids = top_ids[dice[top_ids] > 0]
+
+        scorer = fuzz.partial_ratio if partial else fuzz.ratio
+        scored = []
+        for name_id in top_ids:
+            score = float(scorer(key, self._keys[name_id]))
+            if score >= score_cutoff:
+                scored.append((self.names[name_id], score))
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def best(self, query: str, score_cutoff: float = 0, partial: bool = False) -> Optional[Tuple[str, float]]:
+        """Best (name, score) pair or None"""
+        matches = self.match(query, limit=1, score_cutoff=score_cutoff, partial=partial)
+        return matches[0] if matches else None
+
+    def match_many(self, queries: Iterable[str], limit: int = 5,
+                   score_cutoff: float = 0) -> Dict[str, List[Tuple[str, float]]]:
+        """Rank candidates for a batch of OCR strings"""
+        return {query: self.match(query, limit, score_cutoff) for query in queries}
+
+    def __len__(self) -> int:
+        return len(self.names)
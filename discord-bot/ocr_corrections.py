@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+🔤 OCR Correction Engine
+Compiled, memoized card-name cleanup shared by ScryfallService and
+ScryfallValidator. All substring fixes run in a single regex pass
+(one alternation, longest pattern first), digit/letter confusions are fixed
+with position-aware translation tables, and results are memoized per raw
+OCR string in a bounded LRU (memo_size=0 for cheap pipelines, e.g. a bare
+exact-name table, where the memo would cost more than it saves).
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional
+
+# OCR digit -> letter confusions
+DIGIT_FIXES = {
+    '0': 'o',  # Zero to o
+    '1': 'l',  # One to l
+    '5': 's',  # Five to s
+    '8': 'b',  # Eight to b
+    '6': 'g',  # Six to g
+    '9': 'g',  # Nine to g
+}
+
+_DIGIT_TABLE = str.maketrans(DIGIT_FIXES)
+# 3-letter words keep a leading digit ("1st", "5th"): one table per excluded digit
+_DIGIT_TABLES_KEEP_FIRST = {
+    digit: str.maketrans({d: c for d, c in DIGIT_FIXES.items() if d != digit})
+    for digit in DIGIT_FIXES
+}
+_HAS_FIXABLE_DIGIT = re.compile('[' + ''.join(DIGIT_FIXES) + ']')
+
+
+def fix_digits(word: str) -> str:
+    """
+    Replace digits OCR confuses with letters. Words of 2 characters or less
+    are left alone, and a 3-character word keeps a digit it starts with.
+    """
+    if len(word) <= 2 or not _HAS_FIXABLE_DIGIT.search(word):
+        return word
+    if len(word) == 3 and word[0] in DIGIT_FIXES:
+        return word.translate(_DIGIT_TABLES_KEEP_FIRST[word[0]])
+    return word.translate(_DIGIT_TABLE)
+
+
+class OcrCorrectionEngine:
+    """
+    Card-name correction pipeline:
+    1. whole-name table (`exact`, case-sensitive, returned as is)
+    2. lowercase (when `normalize_case`)
+    3. substring fixes (`substitutions`) in one leftmost-longest pass
+    4. digit/letter fixes per word (when `digit_fixes`)
+    5. word capitalization (when `normalize_case`)
+    """
+
+    def __init__(self, substitutions: Optional[Dict[str, str]] = None,
+                 exact: Optional[Dict[str, str]] = None,
+                 digit_fixes: bool = True, normalize_case: bool = True,
+                 memo_size: int = 4096):
+        self.exact = dict(exact or {})
+        # Identity entries ('sorcery': 'sorcery') are no-ops
+        self.substitutions = {
+            (wrong.lower() if normalize_case else wrong): correct
+            for wrong, correct in (substitutions or {}).items() if wrong != correct
+        }
+        self.digit_fixes = digit_fixes
+        self.normalize_case = normalize_case
+
+        self._pattern = None
+        if self.substitutions:
+            alternatives = sorted(self.substitutions, key=len, reverse=True)
+            self._pattern = re.compile('|'.join(map(re.escape, alternatives)))
+
+        self._memo = lru_cache(maxsize=memo_size)(self._correct) if memo_size else None
+
+    def correct(self, text: str) -> str:
+        """Corrected name (memoized on the raw OCR string unless memo_size=0)"""
+        if self._memo is None:
+            return self._correct(text)
+        return self._memo(text)
+
+    def _correct(self, text: str) -> str:
+        if text in self.exact:
+            return self.exact[text]
+        if not (self.normalize_case or self.digit_fixes or self._pattern is not None):
+            return text
+
+        corrected = text.lower() if self.normalize_case else text
+        if self._pattern is not None:
+            corrected = self._pattern.sub(self._replace, corrected)
+
+        words = corrected.split()
+        if self.digit_fixes:
+            words = [fix_digits(word) for word in words]
+        if self.normalize_case:
+            words = [word.capitalize() for word in words]
+        return ' '.join(words)
+
+    def _replace(self, match: 're.Match') -> str:
+        return self.substitutions[match.group(0)]
+
+    def cache_info(self):
+        """Memo statistics (hits, misses, maxsize, currsize); None without a memo"""
+        return self._memo.cache_info() if self._memo is not None else None
+
+    def clear(self):
+        if self._memo is not None:
+            self._memo.cache_clear()
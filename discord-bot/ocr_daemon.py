@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+🛰️ OCR Daemon
+Long-lived OCR worker for the web server, the Python wrappers and the bot's
+worker pool (ocr_pool.py): torch is imported and the EasyOCR readers (plus the
+deck parser) are built once, then every request pays inference time only.
+
+Requests are JSON lines over stdin/stdout and/or a Unix socket:
+
+    python ocr_daemon.py --stdio [--socket /tmp/mtg-ocr.sock]
+
+    -> {"id": 1, "op": "deck", "image": "/tmp/deck.png"}       (or "image_base64")
+    <- {"id": 1, "ok": true, "result": {...}, "elapsed_ms": 812}
+
+On stdio, {"event": "ready"} is written once the default readers are warm,
+or {"event": "error"} if they cannot be built, after which the daemon exits 1.
+`health` answers at any time (ready flag, uptime, requests served); the
+supervisor (server/src/services/ocrDaemon.ts) restarts the daemon if it dies,
+and `--max-requests` recycles it to bound memory growth.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Sequence
+
+from reader_registry import ReaderRegistry, get_registry
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SOCKET_PATH = os.getenv('OCR_DAEMON_SOCKET')
+MAX_LINE_BYTES = 64 * 1024 * 1024  # base64 screenshots
+
+
+class OcrDaemonError(Exception):
+    """The daemon answered with an error, or could not be reached"""
+
+
+def _jsonable_bbox(bbox) -> list:
+    return [[float(x), float(y)] for x, y in bbox]
+
+
+class _BackgroundLoop:
+    """Event loop on its own thread, for the async deck pipeline (ScryfallService lives there)"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='ocr-pipeline', daemon=True)
+        self.thread.start()
+
+    async def run(self, coroutine: Awaitable[Any]) -> Any:
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, self.loop))
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class OcrDaemon:
+    """Warm readers + op handlers; transports call `handle(request)`"""
+
+    def __init__(self, languages: Sequence[str] = ('en',), concurrency: int = 1, max_requests: int = 0,
+                 reader_factory: Optional[Callable[..., Any]] = None):
+        self.languages = tuple(languages)
+        self.concurrency = max(1, concurrency)
+        self.max_requests = max_requests
+        # Shared process-wide readers unless a factory is given (tests)
+        self.readers = ReaderRegistry(reader_factory) if reader_factory else get_registry()
+
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+            'readtext': self._op_readtext,
+            'extract_text': self._op_extract_text,
+            'deck': self._op_deck,
+            'mtga_zone': self._op_mtga_zone,
+            'sideboard': self._op_sideboard,
+            'super_resolution': self._op_super_resolution,
+        }
+
+        self._pipeline: Optional[_BackgroundLoop] = None
+        self._deck_parser = None
+        self._arena_ocr = None
+        self._sideboard_ocr = None
+        self._super_resolution = None
+
+        self.ready = asyncio.Event()
+        self.warmed = asyncio.Event()  # warm-up over, successfully or not
+        self.warmup_error: Optional[str] = None
+        self.stopping = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self.started_at = time.time()
+        self.warmup_seconds: Optional[float] = None
+        self.served = 0
+        self.failed = 0
+        self.busy = 0
+
+    # --- Warm state ---
+
+    def reader(self, languages: Optional[Sequence[str]] = None):
+        """EasyOCR reader for `languages`, built once and kept"""
+        return self.readers.get(tuple(languages or self.languages))
+
+    async def warm_up(self):
+        """Build the default reader off the event loop, then open for inference"""
+        start_time = time.time()
+        try:
+            if self.languages:
+                await asyncio.to_thread(self.reader, self.languages)
+        except Exception as e:
+            # Nothing can be served: answer what is queued, then stop so the supervisor restarts us
+            self.warmup_error = f"{type(e).__name__}: {e}"
+            logger.error(f"❌ OCR daemon warm-up failed: {self.warmup_error}", exc_info=True)
+            self.warmed.set()
+            self.stopping.set()
+            raise
+        self.warmup_seconds = time.time() - start_time
+        self.ready.set()
+        self.warmed.set()
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            'ready': self.ready.is_set(),
+            'warmup_error': self.warmup_error,
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'warmup_seconds': round(self.warmup_seconds, 2) if self.warmup_seconds is not None else None,
+            'readers': [stat['languages'] for stat in self.readers.stats()],
+            'served': self.served,
+            'failed': self.failed,
+            'busy': self.busy,
+            'concurrency': self.concurrency,
+            'max_requests': self.max_requests,
+        }
+
+    # --- Request handling ---
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        request_id = request.get('id')
+        op = request.get('op')
+        if op == 'health':
+            return {'id': request_id, 'ok': True, 'result': self.health()}
+        if op == 'shutdown':
+            self.stopping.set()
+            return {'id': request_id, 'ok': True, 'result': {'stopping': True}}
+        handler = self.handlers.get(op)
+        if handler is None:
+            return {'id': request_id, 'ok': False, 'error': f"Unknown op {op!r}"}
+
+        await self.warmed.wait()
+        if self.warmup_error:
+            return {'id': request_id, 'ok': False, 'error': f"OCR daemon warm-up failed: {self.warmup_error}"}
+        start_time = time.time()
+        async with self._slots:
+            self.busy += 1
+            try:
+                result = await handler(request)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"❌ {op} failed: {e}", exc_info=True)
+                return {'id': request_id, 'ok': False, 'error': f"{type(e).__name__}: {e}",
+                        'elapsed_ms': int((time.time() - start_time) * 1000)}
+            finally:
+                self.busy -= 1
+                self.served += 1
+                if self.max_requests and self.served >= self.max_requests:
+                    logger.info(f"♻️ {self.served} requests served, recycling the daemon")
+                    self.stopping.set()
+        return {'id': request_id, 'ok': True, 'result': result,
+                'elapsed_ms': int((time.time() - start_time) * 1000)}
+
+    @staticmethod
+    @contextmanager
+    def _image_path(request: Dict[str, Any]) -> Iterator[str]:
+        """Path of the request image; base64 payloads go through a temp file removed afterwards"""
+        if request.get('image'):
+            yield request['image']
+            return
+        data = request.get('image_base64')
+        if not data:
+            raise ValueError("Request needs 'image' (path) or 'image_base64'")
+        fd, path = tempfile.mkstemp(suffix='.png', prefix='ocr-daemon-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(base64.b64decode(data))
+            yield path
+        finally:
+            os.remove(path)
+
+    async def _in_thread(self, request: Dict[str, Any], work: Callable[[str], Any]) -> Any:
+        def run():
+            with self._image_path(request) as path:
+                return work(path)
+        return await asyncio.to_thread(run)
+
+    # --- Ops ---
+
+    async def _op_readtext(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Raw EasyOCR blocks: [{text, confidence, bbox}]"""
+        reader = await asyncio.to_thread(self.reader, request.get('languages'))
+        paragraph = bool(request.get('paragraph', False))
+
+        def work(path):
+            blocks = []
+            for item in reader.readtext(path, detail=1, paragraph=paragraph):
+                bbox, text = item[0], item[1]
+                confidence = float(item[2]) if len(item) > 2 else None
+                blocks.append({'text': text, 'confidence': confidence, 'bbox': _jsonable_bbox(bbox)})
+            return {'blocks': blocks}
+        return await self._in_thread(request, work)
+
+    async def _op_extract_text(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """The bot's OCR stage (UltraAdvancedOCR): {text, stages} with per-stage seconds"""
+        if self._arena_ocr is None:
+            from ocr_parser_easyocr import UltraAdvancedOCR
+            self._arena_ocr = UltraAdvancedOCR(reader=await asyncio.to_thread(self.reader, ('en',)))
+        from metrics import stage_seconds
+
+        def work(path):
+            before = stage_seconds()
+            text = self._arena_ocr.extract_text_from_image(path)
+            after = stage_seconds()
+            return {'text': text, 'stages': {stage: after[stage] - before[stage]
+                                             for stage in after if after[stage] > before[stage]}}
+        return await self._in_thread(request, work)
+
+    async def _op_deck(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Full bot pipeline (OCR, parsing, Scryfall validation): {mainboard, sideboard, confidence}"""
+        if self._pipeline is None:
+            self._pipeline = _BackgroundLoop()
+        language = request.get('language', 'en')
+
+        async def parse(path):
+            if self._deck_parser is None:
+                from ocr_parser_easyocr import MTGOCRParser
+                from scryfall_service import ScryfallService
+                service = await ScryfallService().__aenter__()
+                self._deck_parser = MTGOCRParser(service, reader=self.reader(('en',)))
+            return deck_result(await self._deck_parser.parse_deck_image(path, language=language))
+
+        with self._image_path(request) as path:
+            return await self._pipeline.run(parse(path))
+
+    async def _op_mtga_zone(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """MTGA right-hand deck list panel (easyocr_mtga_fixed)"""
+        _import_repo_scripts()
+        from easyocr_mtga_fixed import process_with_easyocr
+        reader = await asyncio.to_thread(self.reader, ('en',))
+        return await self._in_thread(request, lambda path: process_with_easyocr(path, reader=reader))
+
+    async def _op_sideboard(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """MTGA sideboard column, multi-pass (robust_ocr_solution)"""
+        if self._sideboard_ocr is None:
+            _import_repo_scripts()
+            from robust_ocr_solution import MTGSideboardOCR
+            reader = await asyncio.to_thread(self.reader, ('en',))
+            self._sideboard_ocr = MTGSideboardOCR(reader=reader)
+        return await self._in_thread(request, self._sideboard_ocr.process_multiple_passes)
+
+    async def _op_super_resolution(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Upscale `image` into `output` (super_resolution_free)"""
+        if self._super_resolution is None:
+            _import_repo_scripts()
+            from super_resolution_free import OptimizedSuperResolution
+            self._super_resolution = OptimizedSuperResolution()
+        target_width = int(request.get('target_width') or 2400)
+        output = request.get('output')
+
+        def work(path):
+            self._super_resolution.target_width = target_width
+            return {'output': self._super_resolution.process_image(path, output)}
+        return await self._in_thread(request, work)
+
+    def close(self):
+        if self._pipeline is not None:
+            self._pipeline.stop()
+
+
+def _import_repo_scripts():
+    """The root-level OCR scripts are importable from the daemon"""
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.append(str(REPO_ROOT))
+
+
+def deck_result(parse_result) -> Dict[str, Any]:
+    """ParseResult -> the JSON shape of the stdin wrappers"""
+    result = {'mainboard': [], 'sideboard': [], 'confidence': 0.0, 'raw_text': ''}
+    if parse_result and parse_result.cards:
+        for card in parse_result.cards:
+            entry = {'name': card.name, 'quantity': card.quantity, 'confidence': card.confidence}
+            result['sideboard' if card.is_sideboard else 'mainboard'].append(entry)
+        confidences = [c.confidence for c in parse_result.cards if c.confidence > 0]
+        if confidences:
+            result['confidence'] = sum(confidences) / len(confidences)
+    if parse_result is not None and parse_result.errors:
+        result['errors'] = parse_result.errors
+    return result
+
+
+# --- Transports ---
+
+def _decode(line: bytes) -> Dict[str, Any]:
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+    return request
+
+
+async def _serve_lines(daemon: OcrDaemon, reader: asyncio.StreamReader, write: Callable[[Dict[str, Any]], None]):
+    """Read requests until EOF; each one runs as its own task so health stays responsive"""
+    tasks = set()
+
+    async def answer(line: bytes):
+        try:
+            request = _decode(line)
+        except ValueError as e:
+            write({'id': None, 'ok': False, 'error': f"Bad request: {e}"})
+            return
+        write(await daemon.handle(request))
+
+    stopping = asyncio.create_task(daemon.stopping.wait())
+    while True:
+        read = asyncio.create_task(reader.readline())
+        await asyncio.wait({read, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        if not read.done():
+            read.cancel()
+            break
+        line = read.result()
+        if not line:
+            break
+        if line.strip():
+            task = asyncio.create_task(answer(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    stopping.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def serve_stdio(daemon: OcrDaemon, protocol_out):
+    """JSON lines on stdin/stdout (stdout reserved for the protocol)"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=MAX_LINE_BYTES)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    def write(message: Dict[str, Any]):
+        protocol_out.write((json.dumps(message) + '\n').encode('utf-8'))
+        protocol_out.flush()
+
+    async def announce_ready():
+        await daemon.warmed.wait()
+        if daemon.warmup_error:
+            write({'event': 'error', 'error': daemon.warmup_error, 'pid': os.getpid()})
+        else:
+            write({'event': 'ready', **daemon.health()})
+
+    announcer = asyncio.create_task(announce_ready())
+    try:
+        await _serve_lines(daemon, reader, write)
+    finally:
+        if daemon.warmed.is_set():
+            await announcer  # the error event must go out before we exit
+        else:
+            announcer.cancel()
+        daemon.stopping.set()
+
+
+async def serve_socket(daemon: OcrDaemon, path: str) -> asyncio.AbstractServer:
+    """JSON lines over a Unix socket, one connection per client"""
+    if os.path.exists(path):
+        os.remove(path)
+
+    async def client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        def write(message: Dict[str, Any]):
+            writer.write((json.dumps(message) + '\n').encode('utf-8'))
+        try:
+            await _serve_lines(daemon, reader, write)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(client, path=path, limit=MAX_LINE_BYTES)
+    logger.info(f"🛰️ OCR daemon listening on {path}")
+    return server
+
+
+class OcrDaemonClient:
+    """Blocking client of the daemon's Unix socket (for the Python wrappers)"""
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 120):
+        self.path = path or DEFAULT_SOCKET_PATH
+        self.timeout = timeout
+        self._next_id = 0
+
+    def available(self) -> bool:
+        return bool(self.path) and os.path.exists(self.path)
+
+    def request(self, op: str, **fields) -> Any:
+        """Send one request and return its result; raises OcrDaemonError"""
+        if not self.available():
+            raise OcrDaemonError(f"No OCR daemon socket at {self.path}")
+        self._next_id += 1
+        message = json.dumps({'id': self._next_id, 'op': op, **fields}).encode('utf-8') + b'\n'
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.path)
+                sock.sendall(message)
+                sock.shutdown(socket.SHUT_WR)
+                with sock.makefile('rb') as stream:
+                    line = stream.readline()
+        except OSError as e:
+            raise OcrDaemonError(f"OCR daemon unreachable: {e}") from e
+        if not line:
+            raise OcrDaemonError("OCR daemon closed the connection")
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise OcrDaemonError(response.get('error', 'unknown error'))
+        return response['result']
+
+
+def request_via_daemon(op: str, **fields) -> Optional[Any]:
+    """Result from a running daemon (OCR_DAEMON_SOCKET), or None to fall back to in-process OCR"""
+    client = OcrDaemonClient()
+    if not client.available():
+        return None
+    try:
+        return client.request(op, **fields)
+    except OcrDaemonError as e:
+        print(f"OCR daemon unavailable, processing locally: {e}", file=sys.stderr)
+        return None
+
+
+async def run(args) -> int:
+    daemon = OcrDaemon([l for l in args.languages.split(',') if l], concurrency=args.concurrency, max_requests=args.max_requests)
+    protocol_out = None
+    if args.stdio:
+        # Libraries print progress on stdout: keep a private handle for the protocol, send the rest to stderr
+        protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    server = await serve_socket(daemon, args.socket) if args.socket else None
+    exit_code = 0
+
+    def warm_up_done(task: asyncio.Task):
+        nonlocal exit_code
+        if not task.cancelled() and task.exception() is not None:
+            # warm_up already stopped the daemon; a non-zero exit sends the supervisor into restart/backoff
+            exit_code = 1
+
+    warm = asyncio.create_task(daemon.warm_up())
+    warm.add_done_callback(warm_up_done)
+    try:
+        if args.stdio:
+            await serve_stdio(daemon, protocol_out)
+        else:
+            await daemon.stopping.wait()
+    finally:
+        warm.cancel()
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            if os.path.exists(args.socket):
+                os.remove(args.socket)
+        daemon.close()
+    return exit_code
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Persistent EasyOCR worker (JSON lines)")
+    parser.add_argument('--stdio', action='store_true', help="serve requests on stdin/stdout")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help="also serve on this Unix socket")
+    parser.add_argument('--languages', default=os.getenv('OCR_LANGUAGES', 'en'), help="readers warmed at startup")
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('OCR_DAEMON_CONCURRENCY', '1')))
+    parser.add_argument('--max-requests', type=int, default=int(os.getenv('OCR_DAEMON_MAX_REQUESTS', '0')),
+                        help="exit after N requests so the supervisor starts a fresh process (0 = never)")
+    args = parser.parse_args(argv)
+    if not args.stdio and not args.socket:
+        parser.error("choose --stdio and/or --socket")
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,6 @@ caractères nettement supérieure.
 """
 
 import cv2
-import easyocr  # Import du nouveau moteur
 import numpy as np
 import re
 import logging
@@ -20,6 +19,10 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from skimage.filters import threshold_local
 from utils.logger import setup_logger, trace_ocr_performance
+from metrics import OCR_WORKERS_BUSY, observe_stage
+from ocr_pool import OcrPool, OcrPoolError
+from reader_registry import get_reader  # Lecteurs EasyOCR partagés par tout le processus
+from text_bands import detect_text_bands, recognize_bands  # Lignes de texte sans détection CRAFT
 
 from deck_processor import DeckProcessor, ProcessedCard, ValidationResult
 from scryfall_service import ScryfallService
@@ -73,16 +76,24 @@ class UltraAdvancedOCR:
     """
     Module OCR utilisant EasyOCR pour une reconnaissance de haute performance.
     """
-    def __init__(self, languages=['en']):
-        # Initialise le lecteur EasyOCR. Cela peut télécharger les modèles la première fois.
-        logger.info(f"🤖 Initialisation du moteur EasyOCR pour la langue : {languages}")
-        logger.info("   (Le premier chargement peut être long - téléchargement des modèles IA)")
-        try:
-            self.reader = easyocr.Reader(languages, gpu=False)  # Mettre gpu=True si vous avez un GPU configuré
-            logger.info("✅ Moteur EasyOCR prêt.")
-        except Exception as e:
-            logger.error(f"❌ Erreur lors de l'initialisation d'EasyOCR: {e}")
-            raise
+    def __init__(self, languages=['en'], reader=None, text_bands: Optional[bool] = None):
+        self.languages = list(languages)
+        # Lecteur déjà chargé (démon OCR), sinon celui du registre partagé au premier usage
+        self._reader = reader
+        # Reconnaissance directe des lignes détectées (OCR_TEXT_BANDS=0 pour toujours passer par readtext)
+        self.text_bands = os.getenv('OCR_TEXT_BANDS', '1') != '0' if text_bands is None else text_bands
+
+    @property
+    def reader(self):
+        if self._reader is None:
+            # Chargé une seule fois par processus (téléchargement des modèles la première fois) ; OCR_GPU=1 pour le GPU
+            try:
+                self._reader = get_reader(self.languages)
+                logger.info("✅ Moteur EasyOCR prêt.")
+            except Exception as e:
+                logger.error(f"❌ Erreur lors de l'initialisation d'EasyOCR: {e}")
+                raise
+        return self._reader
 
     @trace_ocr_performance
     def extract_text_from_image(self, image_path: str) -> str:
@@ -92,34 +103,43 @@ class UltraAdvancedOCR:
         """
         logger.info(f"🔍 Début de l'extraction avec EasyOCR depuis : {image_path}")
         try:
-            image = cv2.imread(image_path)
-            if image is None:
-                raise FileNotFoundError(f"Image introuvable ou illisible à : {image_path}")
+            with observe_stage('preprocess'):
+                image = cv2.imread(image_path)
+                if image is None:
+                    raise FileNotFoundError(f"Image introuvable ou illisible à : {image_path}")
 
-            # --- DÉBUT DU PRÉTRAITEMENT D'IMAGE ---
-            logger.info("  🖼️  Application du prétraitement d'image...")
+                # --- DÉBUT DU PRÉTRAITEMENT D'IMAGE ---
+                logger.info("  🖼️  Application du prétraitement d'image...")
             
-            # 1. Conversion en niveaux de gris
-            gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                # 1. Conversion en niveaux de gris
+                gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
             
-            # 2. Augmentation du contraste (CLAHE)
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            contrast_image = clahe.apply(gray_image)
-
-            # 3. Binarisation adaptative pour mieux gérer les variations de luminosité
-            processed_image = cv2.adaptiveThreshold(
-                contrast_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                cv2.THRESH_BINARY, 11, 2
-            )
+                # 2. Augmentation du contraste (CLAHE)
+                clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+                contrast_image = clahe.apply(gray_image)
+
+                # 3. Binarisation adaptative pour mieux gérer les variations de luminosité
+                processed_image = cv2.adaptiveThreshold(
+                    contrast_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                    cv2.THRESH_BINARY, 11, 2
+                )
             
-            # Sauvegarder l'image prétraitée pour le debug
-            debug_image_path = os.path.join(os.path.dirname(image_path), "debug_preprocessed_image.png")
-            cv2.imwrite(debug_image_path, processed_image)
-            logger.info(f"  💾 Image prétraitée sauvegardée pour debug : {debug_image_path}")
+                # 4. Lignes de texte (nom + quantité) : si la mise en page est reconnue, pas de détection CRAFT
+                bands = detect_text_bands(contrast_image) if self.text_bands else []
+
+                # Sauvegarder l'image prétraitée pour le debug
+                debug_image_path = os.path.join(os.path.dirname(image_path), "debug_preprocessed_image.png")
+                cv2.imwrite(debug_image_path, processed_image)
+                logger.info(f"  💾 Image prétraitée sauvegardée pour debug : {debug_image_path}")
             # --- FIN DU PRÉTRAITEMENT D'IMAGE ---
             
             logger.info("  🤖 Traitement par l'IA EasyOCR en cours...")
-            results = self.reader.readtext(processed_image, detail=1, paragraph=True)
+            with observe_stage('ocr'), OCR_WORKERS_BUSY.track_inprogress():
+                if bands:
+                    logger.info(f"  📏 {len(bands)} lignes de texte détectées : reconnaissance seule, en un lot")
+                    results = recognize_bands(self.reader, processed_image, bands)
+                else:
+                    results = self.reader.readtext(processed_image, detail=1, paragraph=True)
             
             # Log des résultats avec confiance
             logger.info(f"  📊 EasyOCR a détecté {len(results)} blocs de texte")
@@ -175,12 +195,16 @@ class MTGOCRParser:
     """
     Parser principal utilisant EasyOCR pour une reconnaissance supérieure.
     """
-    def __init__(self, scryfall_service: ScryfallService):
+    def __init__(self, scryfall_service: ScryfallService, reader=None, ocr_pool: Optional[OcrPool] = None):
         self.scryfall_service = scryfall_service
+        # Pool de processus OCR : le lecteur EasyOCR vit dans les workers, pas dans ce processus
+        self.ocr_pool = ocr_pool
         # ON CHANGE DE MOTEUR ICI
-        self.arena_ocr = UltraAdvancedOCR()
-        self.deck_processor = DeckProcessor(strict_mode=False)
+        self.arena_ocr = UltraAdvancedOCR(reader=reader) if ocr_pool is None else None
+        self.deck_processor = DeckProcessor(strict_mode=False, printed_names=getattr(scryfall_service, "printed_names", None))
         self.logger = logger
+        # Validation du deck entier par lots (/cards/collection) plutôt que carte par carte
+        self.batch_validation = True
         # Initialiser le correcteur MTGO si disponible
         self.mtgo_corrector = MTGOLandCorrector() if MTGOLandCorrector else None
 
@@ -286,9 +310,30 @@ class MTGOCRParser:
         logger.info(f"  ✅ Parsing terminé. Main: {len(main_cards)} entrées, Side: {len(side_cards)} entrées")
         return main_cards, side_cards
 
-    async def _validate_and_normalize_cards(self, card_tuples: List[Tuple[str, int]], is_sideboard: bool) -> List[ParsedCard]:
+    async def _resolve_deck_names(self, card_tuples: List[Tuple[str, int]],
+                                  language: str = 'en') -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Résout tous les noms du deck en une passe (index local, /cards/collection
+        par lots de 75, puis recherche floue concurrente pour les seuls échecs).
+        Les noms imprimés non anglais sont traduits (langue `language` en priorité).
+        Retourne None si la résolution par lots est indisponible.
+        """
+        if not self.batch_validation:
+            return None
+        
+        names = [name for name, _ in card_tuples]
+        logger.info(f"🔍 Résolution par lots de {len(set(names))} noms uniques")
+        try:
+            return await self.scryfall_service.resolve_card_names(names, lang=language)
+        except Exception as e:
+            logger.error(f"    ❌ Erreur lors de la résolution par lots: {e}")
+            return None
+
+    async def _validate_and_normalize_cards(self, card_tuples: List[Tuple[str, int]], is_sideboard: bool,
+                                            resolved: Optional[Dict[str, Optional[Dict[str, Any]]]] = None) -> List[ParsedCard]:
         """
         Valide une liste de cartes avec la recherche floue Scryfall.
+        Si `resolved` est fourni (résolution par lots), aucun appel réseau n'est fait ici.
         """
         zone_name = "sideboard" if is_sideboard else "main"
         logger.info(f"🔍 Validation {zone_name} avec recherche floue Scryfall")
@@ -298,8 +343,11 @@ class MTGOCRParser:
             logger.info(f"  🔎 Validation de '{name}'...")
             
             try:
-                # Utilisation de la recherche FUZZY existante
-                match_data = await self.scryfall_service.search_card_fuzzy(name)
+                if resolved is not None:
+                    match_data = resolved.get(name.strip())
+                else:
+                    # Utilisation de la recherche FUZZY existante
+                    match_data = await self.scryfall_service.search_card_fuzzy(name)
 
                 if match_data:
                     canonical_name = match_data['name']
@@ -347,7 +395,7 @@ class MTGOCRParser:
         try:
             # 1. OCR avec EasyOCR (IA)
             logger.info("🤖 Phase 1: OCR avec Intelligence Artificielle (EasyOCR)")
-            raw_text = self.arena_ocr.extract_text_from_image(image_path)
+            raw_text = await self._extract_text(image_path)
             if not raw_text or len(raw_text.strip()) < 10:
                 return ParseResult(
                     errors=["Échec critique de l'OCR EasyOCR. L'image est peut-être vide ou illisible."],
@@ -356,7 +404,8 @@ class MTGOCRParser:
 
             # 2. Analyse du texte pour séparer deck/sideboard
             logger.info("📋 Phase 2: Parsing et nettoyage du texte")
-            raw_main, raw_side = self._parse_raw_text(raw_text)
+            with observe_stage('parse'):
+                raw_main, raw_side = self._parse_raw_text(raw_text)
 
             if not raw_main and not raw_side:
                 return ParseResult(
@@ -377,8 +426,10 @@ class MTGOCRParser:
 
             # 3. Validation et normalisation avec Scryfall (recherche floue)
             logger.info("🔍 Phase 3: Validation Scryfall avec recherche floue")
-            validated_main = await self._validate_and_normalize_cards(raw_main, is_sideboard=False)
-            validated_side = await self._validate_and_normalize_cards(raw_side, is_sideboard=True)
+            with observe_stage('validate'):
+                resolved = await self._resolve_deck_names(raw_main + raw_side, language)
+                validated_main = await self._validate_and_normalize_cards(raw_main, is_sideboard=False, resolved=resolved)
+                validated_side = await self._validate_and_normalize_cards(raw_side, is_sideboard=True, resolved=resolved)
 
             all_cards = validated_main + validated_side
             validated_cards = [c for c in all_cards if c.is_validated]
@@ -398,11 +449,12 @@ class MTGOCRParser:
 
             logger.info(f"  📊 Données pour DeckProcessor: {len(main_tuples)} main, {len(side_tuples)} side")
             
-            processed_cards, validation = self.deck_processor.process_deck(main_tuples, side_tuples)
+            with observe_stage('export'):
+                processed_cards, validation = self.deck_processor.process_deck(main_tuples, side_tuples)
             
-            # 5. Génération du texte d'export final
-            logger.info("📤 Phase 5: Génération de l'export")
-            export_text = self.deck_processor.export_to_format(processed_cards, 'mtga')
+                # 5. Génération du texte d'export final
+                logger.info("📤 Phase 5: Génération de l'export")
+                export_text = self.deck_processor.export_to_format(processed_cards, 'mtga')
             
             # 6. Calcul des statistiques
             confidence_score = sum(c.confidence for c in validated_cards) / len(validated_cards) if validated_cards else 0.0
@@ -430,6 +482,9 @@ class MTGOCRParser:
                 side_count=len(side_tuples)
             )
 
+        except OcrPoolError:
+            # Pool saturé ou délai dépassé : l'appelant prévient l'utilisateur
+            raise
         except Exception as e:
             logger.error(f"❌ Erreur critique dans le pipeline EasyOCR: {e}", exc_info=True)
             return ParseResult(
@@ -437,8 +492,18 @@ class MTGOCRParser:
                 processing_notes=[f"Pipeline interrompu à cause de: {type(e).__name__}"]
             )
 
+    async def _extract_text(self, image_path: str) -> str:
+        """
+        OCR hors de la boucle d'événements : dans un worker du pool, sinon dans un thread.
+        """
+        if self.ocr_pool is not None:
+            return await self.ocr_pool.extract_text(image_path)
+        return await asyncio.to_thread(self.arena_ocr.extract_text_from_image, image_path)
+
     def extract_text_from_image(self, image_path: str) -> List[str]:
         """Méthode de compatibilité pour l'ancien code"""
+        if self.arena_ocr is None:
+            self.arena_ocr = UltraAdvancedOCR()
         raw_text = self.arena_ocr.extract_text_from_image(image_path)
         return raw_text.split('\n') if raw_text else []
 
@@ -493,8 +558,8 @@ def extract_text_from_image_easyocr(image_path: str, lang: str = 'fr'):
     # Prétraitement de l'image
     preprocessed_image = preprocess_for_easyocr(image_path)
     
-    # Initialisation de EasyOCR
-    reader = easyocr.Reader([lang, 'en'], gpu=False)
+    # Lecteur EasyOCR partagé (chargé au premier appel seulement)
+    reader = get_reader([lang, 'en'])
     
     # Extraction du texte
     results = reader.readtext(preprocessed_image, detail=1, paragraph=False)
@@ -7,7 +7,6 @@ caractères nettement supérieure.
 """
 
 import cv2
-import easyocr  # Import du nouveau moteur
 import numpy as np
 import re
 import logging
@@ -18,6 +17,7 @@ from dataclasses import dataclass, field
 
 from deck_processor import DeckProcessor, ProcessedCard, ValidationResult
 from scryfall_service import ScryfallService
+from reader_registry import get_reader  # Lecteurs EasyOCR partagés par tout le processus
 
 # Configuration du logger
 logger = logging.getLogger("ocr_parser_easyocr")
@@ -61,7 +61,7 @@ class UltraAdvancedOCR:
         logger.info(f"🤖 Initialisation du moteur EasyOCR pour la langue : {languages}")
         logger.info("   (Le premier chargement peut être long - téléchargement des modèles IA)")
         try:
-            self.reader = easyocr.Reader(languages, gpu=False)  # Mettre gpu=True si vous avez un GPU configuré
+            self.reader = get_reader(languages)  # OCR_GPU=1 si vous avez un GPU configuré
             logger.info("✅ Moteur EasyOCR prêt.")
         except Exception as e:
             logger.error(f"❌ Erreur lors de l'initialisation d'EasyOCR: {e}")
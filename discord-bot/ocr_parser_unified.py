@@ -19,12 +19,13 @@ import logging
 import base64
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
-import requests
+import aiohttp
 from dataclasses import dataclass, field
 
 # Try to import OCR engines
 try:
     import easyocr
+    from reader_registry import get_reader
     EASYOCR_AVAILABLE = True
 except ImportError:
     EASYOCR_AVAILABLE = False
@@ -40,6 +41,8 @@ except ImportError:
 import cv2
 import numpy as np
 
+from http_client import get_http_client
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -108,7 +111,7 @@ class UnifiedOCRParser:
         if EASYOCR_AVAILABLE and not use_api:
             try:
                 logger.info("Initializing EasyOCR...")
-                self.easyocr_reader = easyocr.Reader(['en'], gpu=False)
+                self.easyocr_reader = get_reader(['en'])  # shared with the other parsers
                 logger.info("EasyOCR ready")
             except Exception as e:
                 logger.error(f"Failed to initialize EasyOCR: {e}")
@@ -159,18 +162,18 @@ class UnifiedOCRParser:
         """
         try:
             with open(image_path, 'rb') as f:
-                files = {'image': f}
-                response = requests.post(
+                form = aiohttp.FormData()
+                form.add_field('image', f, filename=os.path.basename(image_path))
+                async with get_http_client().session.post(
                     f'{self.api_url}/api/ocr/enhanced',
-                    files=files,
-                    timeout=60
-                )
+                    data=form,
+                    timeout=aiohttp.ClientTimeout(total=60)
+                ) as response:
+                    if response.status != 200:
+                        raise Exception(f"API returned status {response.status}")
+                    data = await response.json()
             
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_api_response(data)
-            else:
-                raise Exception(f"API returned status {response.status_code}")
+            return self._parse_api_response(data)
                 
         except Exception as e:
             logger.error(f"API processing failed: {e}")
@@ -621,4 +624,4 @@ async def main():
 
 
 if __name__ == '__main__':
-    asyncio.run(main()
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+🧵 OCR Pool
+Keeps EasyOCR off the bot's event loop: N worker processes (ocr_daemon.py
+over stdio), each holding its own reader and torch thread pool, behind a
+bounded async API.
+
+    pool = OcrPool.from_env()
+    text = await pool.extract_text('/tmp/deck.png')
+
+Submissions beyond `max_pending` (queued + running) fail fast with
+OcrPoolFull; a scan exceeding `timeout` raises OcrTimeout. A worker that
+times out, is cancelled mid-inference or dies is killed and replaced, so a
+stuck image never holds a core. A worker slot that fails to start
+`start_attempts` times in a row gives up; once every slot has, wait_ready()
+and submissions fail with the workers' last error instead of waiting.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from prometheus_client.core import GaugeMetricFamily
+
+import metrics
+from metrics import OCR_WORKERS, OCR_WORKERS_BUSY, observe_stages
+
+logger = logging.getLogger(__name__)
+
+DAEMON_SCRIPT = Path(__file__).resolve().with_name('ocr_daemon.py')
+MAX_LINE_BYTES = 16 * 1024 * 1024
+MAX_BACKOFF_SECONDS = 30.0
+STDERR_TAIL_LINES = 20
+
+
+class OcrPoolError(Exception):
+    """OCR could not be run (or failed) in the worker pool"""
+
+
+class OcrPoolFull(OcrPoolError):
+    """Too many scans already queued or running"""
+
+
+class OcrTimeout(OcrPoolError):
+    """The scan did not finish in time (its worker was replaced)"""
+
+
+class _Worker:
+    """One warm ocr_daemon.py process, serving one request at a time"""
+
+    def __init__(self, index: int, process: asyncio.subprocess.Process):
+        self.index = index
+        self.process = process
+
+    async def call(self, request: Dict[str, Any]) -> Any:
+        self.process.stdin.write(json.dumps(request).encode('utf-8') + b'\n')
+        await self.process.stdin.drain()
+        line = await self.process.stdout.readline()
+        if not line:
+            raise ConnectionError(f"OCR worker {self.process.pid} exited")
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise OcrPoolError(response.get('error', 'unknown error'))
+        return response['result']
+
+
+class OcrPool:
+    """Bounded async front of N OCR worker processes"""
+
+    def __init__(self, workers: int = 1, torch_threads: Optional[int] = None, max_pending: Optional[int] = None,
+                 timeout: float = 180.0, languages: Sequence[str] = ('en',),
+                 command: Optional[List[str]] = None, startup_timeout: float = 600.0, start_attempts: int = 3):
+        self.workers = max(1, workers)
+        # Split the cores between workers instead of letting each torch grab them all
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self.max_pending = max_pending or self.workers * 4
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.start_attempts = max(1, start_attempts)
+        self.command = command or [sys.executable, str(DAEMON_SCRIPT), '--stdio',
+                                   '--languages', ','.join(languages), '--concurrency', '1']
+
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._processes: Dict[int, asyncio.subprocess.Process] = {}
+        self._starting: Set[asyncio.Task] = set()
+        self._ids = itertools.count(1)
+        self._ready = asyncio.Event()  # at least one worker has loaded its reader
+        self._failed = asyncio.Event()  # every worker slot gave up starting
+        self._gave_up: Set[int] = set()
+        self._stderr: Dict[int, deque] = {}
+        self.startup_error: Optional[str] = None
+        self._started = False
+        self._closed = False
+
+        self.pending = 0
+        self.busy = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.restarts = 0
+
+    @classmethod
+    def from_env(cls) -> Optional['OcrPool']:
+        """Pool configured by OCR_WORKERS & co; None when OCR_WORKERS=0 (OCR in a thread of the bot)"""
+        workers = int(os.getenv('OCR_WORKERS', '1'))
+        if workers <= 0:
+            return None
+        return cls(workers=workers,
+                   torch_threads=int(os.getenv('OCR_TORCH_THREADS', '0')) or None,
+                   max_pending=int(os.getenv('OCR_MAX_PENDING', '0')) or None,
+                   timeout=float(os.getenv('OCR_TIMEOUT_SECONDS', '180')),
+                   languages=os.getenv('OCR_LANGUAGES', 'en').split(','),
+                   start_attempts=int(os.getenv('OCR_WORKER_START_ATTEMPTS', '3')))
+
+    # --- Workers ---
+
+    def start(self):
+        """Spawn the workers in the background; each takes work once its reader is loaded"""
+        if self._started:
+            return
+        self._started = True
+        OCR_WORKERS.set(self.workers)
+        OCR_WORKERS_BUSY.set_function(lambda: self.busy)
+        # The readers (and most of the memory) live in the workers, not in this process
+        metrics.add_collector('ocr_pool', self.collect_metrics)
+        for index in range(self.workers):
+            self._launch(index)
+
+    async def wait_ready(self):
+        """Start the workers if needed and wait until one can take work; OcrPoolError if none can start"""
+        self.start()
+        waits = [asyncio.ensure_future(self._ready.wait()), asyncio.ensure_future(self._failed.wait())]
+        try:
+            await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for wait in waits:
+                wait.cancel()
+        if not self._ready.is_set():
+            raise OcrPoolError(self.startup_error)
+
+    def _launch(self, index: int, previous: Optional[asyncio.subprocess.Process] = None):
+        task = asyncio.create_task(self._start_worker(index, previous))
+        self._starting.add(task)
+        task.add_done_callback(self._starting.discard)
+
+    def _worker_env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.pop('OCR_DAEMON_SOCKET', None)  # workers talk over stdio only
+        env['OCR_TORCH_THREADS'] = str(self.torch_threads)
+        env['OMP_NUM_THREADS'] = str(self.torch_threads)
+        return env
+
+    async def _forward_stderr(self, index: int, process: asyncio.subprocess.Process):
+        """Pass the worker's stderr through, keeping its last lines for startup errors"""
+        tail = self._stderr[index] = deque(maxlen=STDERR_TAIL_LINES)
+        async for line in process.stderr:
+            text = line.decode('utf-8', 'replace')
+            tail.append(text.rstrip())
+            sys.stderr.write(text)
+
+    async def _start_worker(self, index: int, previous: Optional[asyncio.subprocess.Process] = None):
+        if previous is not None:
+            await previous.wait()
+        backoff = 0.0
+        attempts = 0
+        while not self._closed:
+            if backoff:
+                await asyncio.sleep(backoff)
+            process = None
+            forwarder = None
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *self.command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE, env=self._worker_env(), limit=MAX_LINE_BYTES)
+                forwarder = asyncio.create_task(self._forward_stderr(index, process))
+                line = await asyncio.wait_for(process.stdout.readline(), self.startup_timeout)
+                event = json.loads(line) if line else {}
+                if event.get('event') == 'error':
+                    raise OcrPoolError(event.get('error', 'warm-up failed'))
+                if event.get('event') != 'ready':
+                    raise OcrPoolError(f"no ready event (got {line[:200]!r})")
+            except (OSError, ValueError, OcrPoolError, asyncio.TimeoutError) as e:
+                attempts += 1
+                error = str(e) or type(e).__name__
+                if process is not None:
+                    if process.returncode is None:
+                        try:
+                            await asyncio.wait_for(process.wait(), 2)  # a failed warm-up exits on its own
+                        except asyncio.TimeoutError:
+                            process.kill()
+                            await process.wait()
+                    await forwarder
+                    error = f"{error} (exit code {process.returncode})"
+                    if self._stderr[index]:
+                        error += f": {self._stderr[index][-1]}"
+                logger.error(f"❌ OCR worker {index} failed to start ({attempts}/{self.start_attempts}): {error}")
+                if attempts >= self.start_attempts:
+                    self._give_up(index, error)
+                    return
+                backoff = min(max(backoff * 2, 1.0), MAX_BACKOFF_SECONDS)
+                continue
+
+            if self._closed:
+                process.kill()
+                await process.wait()
+                return
+            self._gave_up.discard(index)
+            self._processes[index] = process
+            logger.info(f"🧵 OCR worker {index} ready (pid {process.pid}, {self.torch_threads} torch threads)")
+            self._idle.put_nowait(_Worker(index, process))
+            self._ready.set()
+            return
+
+    def _give_up(self, index: int, error: str):
+        self._gave_up.add(index)
+        self.startup_error = f"OCR worker {index} failed to start {self.start_attempts} times: {error}"
+        if len(self._gave_up) == self.workers:
+            logger.error(f"❌ No OCR worker could start, OCR is unavailable: {error}")
+            self._failed.set()
+            # Wake whoever waits for a worker; the marker stays queued for the next ones
+            self._idle.put_nowait(None)
+
+    def _replace(self, worker: _Worker):
+        """Kill a worker whose state is unknown (timed out, cancelled, dead) and start a fresh one"""
+        self._processes.pop(worker.index, None)
+        if worker.process.returncode is None:
+            worker.process.kill()
+        if not self._closed:
+            self.restarts += 1
+            self._launch(worker.index, previous=worker.process)
+
+    # --- Submission ---
+
+    async def submit(self, op: str, timeout: Optional[float] = None, **fields) -> Any:
+        """Run one daemon op on the next free worker"""
+        if self._closed:
+            raise OcrPoolError("OCR pool is closed")
+        if self._failed.is_set():
+            raise OcrPoolError(self.startup_error)
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise OcrPoolFull(f"{self.pending} scans already queued or running")
+        self.start()
+
+        timeout = self.timeout if timeout is None else timeout
+        self.pending += 1
+        self.submitted += 1
+        try:
+            return await asyncio.wait_for(self._run({'id': next(self._ids), 'op': op, **fields}), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise OcrTimeout(f"OCR did not finish within {timeout:.0f}s") from None
+        finally:
+            self.pending -= 1
+
+    async def _run(self, request: Dict[str, Any]) -> Any:
+        worker = await self._idle.get()
+        if worker is None:
+            self._idle.put_nowait(None)
+            raise OcrPoolError(self.startup_error)
+        self.busy += 1
+        try:
+            result = await worker.call(request)
+        except OcrPoolError:
+            # The worker answered with an error: it is still fine
+            self.failed += 1
+            self._idle.put_nowait(worker)
+            raise
+        except (ConnectionError, ValueError) as e:
+            self.failed += 1
+            self._replace(worker)
+            raise OcrPoolError(f"OCR worker died: {e}") from e
+        except BaseException:
+            # Cancelled or timed out mid-inference
+            self._replace(worker)
+            raise
+        finally:
+            self.busy -= 1
+        self.completed += 1
+        self._idle.put_nowait(worker)
+        return result
+
+    async def extract_text(self, image_path: str, timeout: Optional[float] = None) -> str:
+        """UltraAdvancedOCR.extract_text_from_image in a worker; stage timings land in this process' metrics"""
+        result = await self.submit('extract_text', timeout=timeout, image=os.path.abspath(image_path))
+        observe_stages(result.get('stages', {}))
+        return result['text']
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'workers_ready': sum(1 for p in self._processes.values() if p.returncode is None),
+            'torch_threads': self.torch_threads,
+            'busy': self.busy,
+            'pending': self.pending,
+            'max_pending': self.max_pending,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timeouts': self.timeouts,
+            'rejected': self.rejected,
+            'restarts': self.restarts,
+            'startup_error': self.startup_error,
+            'worker_rss_bytes': self.worker_rss_bytes(),
+        }
+
+    def worker_rss_bytes(self) -> Dict[int, float]:
+        """Resident memory of each live worker process, by worker index"""
+        return {index: metrics.process_rss_bytes(process.pid)
+                for index, process in list(self._processes.items()) if process.returncode is None}
+
+    def collect_metrics(self):
+        rss = GaugeMetricFamily('mtg_ocr_worker_resident_memory_bytes', 'Resident memory of each OCR worker process',
+                                labels=['worker'])
+        for index, value in sorted(self.worker_rss_bytes().items()):
+            rss.add_metric([str(index)], value)
+        yield rss
+
+    async def close(self):
+        """Stop the workers (stdin EOF, then kill after a grace period)"""
+        self._closed = True
+        for task in list(self._starting):
+            task.cancel()
+        for process in list(self._processes.values()):
+            if process.returncode is None:
+                process.stdin.close()
+                try:
+                    await asyncio.wait_for(process.wait(), 5)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+        self._processes.clear()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+🔤 Card Name Prefix Index
+Local autocomplete over the full card-name universe: punctuation-insensitive
+keys in one sorted array, a prefix query is two binary searches. Each key
+carries its card's color identity and playable-format bitmasks so matches can
+be filtered by deck colors or format without touching the card data.
+
+Powers ScryfallService.autocomplete_card_names and the completion of truncated
+names ("Overlord of the Mis...", cut-off MTGA sideboard rows) without any
+network access.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from card_index import loose_name
+from card_store import FORMAT_BITS, color_mask, legality_masks
+
+# "...", "…" and stray dots left by truncated captures
+_TRUNCATION_RE = re.compile(r'(\s*(\.{2,}|…))+\s*$')
+
+
+def strip_truncation(name: str) -> str:
+    """'Overlord of the Mis...' -> 'Overlord of the Mis'"""
+    return _TRUNCATION_RE.sub('', name.strip())
+
+
+def is_truncated(name: str) -> bool:
+    return bool(_TRUNCATION_RE.search(name.strip()))
+
+
+class CardPrefixIndex:
+    """Sorted-key prefix lookup with color identity and legality filters"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, int, int]]):
+        """`entries`: (lookup name, canonical name, color identity mask, playable formats mask)"""
+        rows = sorted((loose_name(key), name, identity, playable)
+                      for key, name, identity, playable in entries if key and name)
+        self._keys: List[str] = [row[0] for row in rows]
+        self._names: List[str] = [row[1] for row in rows]
+        self._identity = np.array([row[2] for row in rows], dtype=np.uint8)
+        self._playable = np.array([row[3] for row in rows], dtype=np.uint32)
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[dict]) -> 'CardPrefixIndex':
+        """From card JSON: every card is found by its name and by each face name"""
+        def entries():
+            for card in cards:
+                legal, restricted, _ = legality_masks(card.get('legalities'))
+                identity = color_mask(card.get('color_identity'))
+                yield card['name'], card['name'], identity, legal | restricted
+                for face in card.get('card_faces') or []:
+                    if face.get('name') and face['name'] != card['name']:
+                        yield face['name'], card['name'], identity, legal | restricted
+
+        return cls(entries())
+
+    def complete(self, prefix: str, limit: int = 20,
+                 within_colors: Optional[str] = None,
+                 with_colors: Optional[str] = None,
+                 formats: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        Canonical names starting with `prefix` (truncation dots ignored), in key order.
+        `within_colors` keeps cards whose color identity fits in those colors ('UR'),
+        `with_colors` cards whose identity includes them, `formats` cards legal in any of them.
+        """
+        key = loose_name(strip_truncation(prefix))
+        if not key:
+            return []
+
+        start = bisect_left(self._keys, key)
+        end = bisect_left(self._keys, key + '\uffff', lo=start)
+        if start == end:
+            return []
+
+        keep = np.ones(end - start, dtype=bool)
+        identity = self._identity[start:end]
+        if within_colors is not None:
+            keep &= (identity & ~np.uint8(color_mask(within_colors.upper()))) == 0
+        if with_colors:
+            required = np.uint8(color_mask(with_colors.upper()))
+            keep &= (identity & required) == required
+        if formats:
+            wanted = 0
+            for format_name in formats:
+                wanted |= FORMAT_BITS.get(format_name.lower(), 0)
+            keep &= (self._playable[start:end] & wanted) != 0
+
+        names: List[str] = []
+        for offset in np.flatnonzero(keep):
+            name = self._names[start + offset]
+            if name not in names:
+                names.append(name)
+                if len(names) >= limit:
+                    break
+        return names
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+💰 Price Snapshot Table
+Compact price table built from the Scryfall bulk file: every printing id and
+every card name -> float32 prices (usd, usd_foil, eur, tix). Deck price
+estimates are a gather + dot product over this table, so card JSON never has
+to be kept (or re-fetched) just for its `prices`.
+
+The snapshot is rebuilt whenever the bulk file is newer than it (bulk_refresh
+checks on its schedule):
+
+    python price_table.py build [data/scryfall-default-cards.json] [data/scryfall-prices.npz]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from card_index import DEFAULT_BULK_PATH, SKIPPED_LAYOUTS, iter_bulk_cards, normalize_name, printing_rank
+from card_store import PRICE_FIELDS, parse_price
+
+logger = logging.getLogger(__name__)
+
+PRICE_TABLE_VERSION = 1
+DEFAULT_PRICES_PATH = Path(__file__).resolve().parent.parent / 'data' / 'scryfall-prices.npz'
+
+
+def _sorted_keys(keys: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Fixed-width sorted byte keys and the row each one came from"""
+    encoded = [key.encode('utf-8') for key in keys]
+    width = max((len(k) for k in encoded), default=1)
+    array = np.array(encoded, dtype=f'S{max(width, 1)}')
+    order = np.argsort(array, kind='stable')
+    return array[order], order.astype(np.uint32)
+
+
+class PriceTable:
+    """Sorted id and name keys over one (rows x PRICE_FIELDS) float32 matrix"""
+
+    def __init__(self, ids: np.ndarray, id_rows: np.ndarray, names: np.ndarray, name_rows: np.ndarray,
+                 prices: np.ndarray, fields: Sequence[str] = PRICE_FIELDS,
+                 meta: Optional[Dict[str, Any]] = None):
+        self.ids, self.id_rows = ids, id_rows
+        self.names, self.name_rows = names, name_rows
+        self.prices = prices
+        self.fields = tuple(fields)
+        self.meta = meta or {}
+
+    @classmethod
+    def from_cards(cls, cards, meta: Optional[Dict[str, Any]] = None) -> 'PriceTable':
+        """One row per printing; a name points at its preferred printing (paper, most recent)"""
+        ids: List[str] = []
+        rows: List[List[float]] = []
+        best: Dict[str, Tuple[tuple, int]] = {}
+        for card in cards:
+            if card.get('layout') in SKIPPED_LAYOUTS or not card.get('id') or not card.get('name'):
+                continue
+            row = len(ids)
+            ids.append(card['id'])
+            card_prices = card.get('prices') or {}
+            rows.append([parse_price(card_prices.get(field)) for field in PRICE_FIELDS])
+
+            rank = printing_rank(card)
+            names = [card['name']] + [face['name'] for face in card.get('card_faces') or []
+                                      if face.get('name') and face['name'] != card['name']]
+            for name in names:
+                key = normalize_name(name)
+                if key not in best or rank > best[key][0]:
+                    best[key] = (rank, row)
+
+        id_keys, id_order = _sorted_keys(ids)
+        name_keys, name_order = _sorted_keys(list(best))
+        name_rows = np.array([row for _, row in best.values()], dtype=np.uint32)[name_order]
+        prices = np.array(rows, dtype=np.float32).reshape(len(rows), len(PRICE_FIELDS))
+        return cls(id_keys, id_order, name_keys, name_rows, prices, PRICE_FIELDS, meta)
+
+    def save(self, path: str):
+        """Write the snapshot (.npz, temp file renamed into place)"""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.new.npz')
+        np.savez(tmp_path, ids=self.ids, id_rows=self.id_rows, names=self.names, name_rows=self.name_rows,
+                 prices=self.prices, fields=np.array(self.fields),
+                 meta=np.array([PRICE_TABLE_VERSION, self.meta.get('source_mtime', 0.0),
+                                self.meta.get('built_at', 0.0)], dtype=np.float64))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'PriceTable':
+        with np.load(path) as data:
+            version, source_mtime, built_at = data['meta'].tolist()
+            if int(version) != PRICE_TABLE_VERSION:
+                raise ValueError(f"Unsupported price table version {int(version)} in {path}")
+            return cls(data['ids'], data['id_rows'], data['names'], data['name_rows'], data['prices'],
+                       [str(f) for f in data['fields']],
+                       {'source_mtime': source_mtime, 'built_at': built_at})
+
+    @staticmethod
+    def _find(keys: np.ndarray, rows: np.ndarray, wanted: Sequence[str]) -> np.ndarray:
+        """Row per wanted key, -1 when absent (one vectorized binary search)"""
+        if not len(wanted) or not len(keys):
+            return np.full(len(wanted), -1, dtype=np.int64)
+        encoded = np.array([w.encode('utf-8') for w in wanted])
+        positions = np.searchsorted(keys, encoded).clip(0, len(keys) - 1)
+        found = keys[positions] == encoded
+        return np.where(found, rows[positions].astype(np.int64), -1)
+
+    def rows_for(self, ids: Sequence[Optional[str]], names: Sequence[Optional[str]]) -> np.ndarray:
+        """Row of each entry: by printing id, else by name; -1 when neither is known"""
+        rows = self._find(self.ids, self.id_rows, [i or '' for i in ids])
+        missing = np.flatnonzero(rows < 0)
+        if len(missing):
+            by_name = self._find(self.names, self.name_rows, [normalize_name(names[i] or '') for i in missing])
+            rows[missing] = by_name
+        return rows
+
+    def deck_total(self, ids: Sequence[Optional[str]], names: Sequence[Optional[str]],
+                   quantities: Sequence[int], field: str = 'usd') -> Tuple[float, np.ndarray]:
+        """(Σ price x quantity, bool mask of priced entries); unknown or unpriced cards count 0"""
+        rows = self.rows_for(ids, names)
+        known = rows >= 0
+        unit = np.full(len(rows), np.nan, dtype=np.float64)
+        unit[known] = self.prices[rows[known], self.fields.index(field)]
+        priced = ~np.isnan(unit)
+        total = float(np.dot(np.where(priced, unit, 0.0), np.asarray(quantities, dtype=np.float64)))
+        return total, priced
+
+    def price(self, card_id: Optional[str] = None, name: Optional[str] = None,
+              field: str = 'usd') -> Optional[float]:
+        total, priced = self.deck_total([card_id], [name], [1], field)
+        return total if priced[0] else None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def build_price_table(bulk_path: Optional[str] = None, out_path: Optional[str] = None) -> PriceTable:
+    """Stream-parse a bulk file into a price snapshot"""
+    bulk_path = str(bulk_path or DEFAULT_BULK_PATH)
+    out_path = str(out_path or DEFAULT_PRICES_PATH)
+    start_time = time.time()
+
+    table = PriceTable.from_cards(iter_bulk_cards(bulk_path), meta={
+        'source_mtime': os.stat(bulk_path).st_mtime, 'built_at': time.time(),
+    })
+    table.save(out_path)
+    logger.info(f"💰 Price table built: {len(table)} printings from {bulk_path} "
+                f"in {time.time() - start_time:.1f}s -> {out_path}")
+    return table
+
+
+def is_stale(bulk_path: str, prices_path: str) -> bool:
+    """Snapshot missing, unreadable or older than the bulk file"""
+    if not os.path.exists(prices_path):
+        return True
+    try:
+        with np.load(prices_path) as data:
+            source_mtime = float(data['meta'][1])
+    except (OSError, ValueError, KeyError):
+        return True
+    return source_mtime != os.stat(bulk_path).st_mtime
+
+
+def open_price_table(path: Optional[str] = None) -> Optional[PriceTable]:
+    """Snapshot at `path`, SCRYFALL_PRICES_PATH or data/scryfall-prices.npz; None if absent"""
+    path = path or os.getenv('SCRYFALL_PRICES_PATH') or str(DEFAULT_PRICES_PATH)
+    if not os.path.exists(path):
+        return None
+    try:
+        return PriceTable.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Failed to load price table from {path}: {e}")
+        return None
+
+
+_shared_prices: Optional[PriceTable] = None
+_shared_prices_loaded = False
+_shared_prices_lock = threading.Lock()
+
+
+def get_shared_prices() -> Optional[PriceTable]:
+    """Process-wide price snapshot, loaded once"""
+    global _shared_prices, _shared_prices_loaded
+    with _shared_prices_lock:
+        if not _shared_prices_loaded:
+            _shared_prices = open_price_table()
+            _shared_prices_loaded = True
+    return _shared_prices
+
+
+def set_shared_prices(table: Optional[PriceTable]):
+    """Swap the process-wide snapshot after a scheduled rebuild"""
+    global _shared_prices, _shared_prices_loaded
+    with _shared_prices_lock:
+        _shared_prices = table
+        _shared_prices_loaded = True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scryfall bulk data -> price snapshot")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="stream-parse a bulk file into a price table")
+    build.add_argument('bulk_path', nargs='?', default=str(DEFAULT_BULK_PATH))
+    build.add_argument('out_path', nargs='?', default=str(DEFAULT_PRICES_PATH))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    table = build_price_table(args.bulk_path, args.out_path)
+    print(f"✅ {len(table)} printings -> {args.out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
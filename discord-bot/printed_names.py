@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+🌍 Printed Name Index
+Maps the printed names of non-English cards (Scryfall `printed_name`, per
+language) to the English oracle name, so FR/DE/ES/JA... screenshots resolve
+locally in one dictionary lookup.
+
+Built once by stream-parsing the all-cards bulk export (the only export that
+carries every language) into a small JSON file:
+
+    python printed_names.py build [data/scryfall-all-cards.json] [data/scryfall-printed-names.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Any
+
+from card_index import SKIPPED_LAYOUTS, iter_bulk_cards
+
+logger = logging.getLogger(__name__)
+
+PRINTED_NAMES_VERSION = 1
+DEFAULT_ALL_CARDS_PATH = Path(__file__).resolve().parent.parent / 'data' / 'scryfall-all-cards.json'
+DEFAULT_PRINTED_NAMES_PATH = Path(__file__).resolve().parent.parent / 'data' / 'scryfall-printed-names.json'
+
+
+def printed_key(name: str) -> str:
+    """
+    Case-, punctuation- and Latin-accent-insensitive key ('Forêt' and 'foret'
+    match, as OCR often drops accents). Marks on non-Latin scripts (Japanese
+    dakuten...) are kept: they change the word.
+    """
+    decomposed = unicodedata.normalize('NFKD', name)
+    chars: List[str] = []
+    for char in decomposed:
+        if unicodedata.combining(char) and chars and chars[-1].isascii():
+            continue
+        chars.append(char)
+    text = unicodedata.normalize('NFC', ''.join(chars)).casefold().replace("'", '').replace('’', '')
+    return ' '.join(''.join(c if c.isalnum() else ' ' for c in text).split())
+
+
+class PrintedNameIndex:
+    """{language: {printed key: English name}}"""
+
+    def __init__(self, names: Optional[Dict[str, Dict[str, str]]] = None):
+        self.names: Dict[str, Dict[str, str]] = names or {}
+        self.source_path: Optional[str] = None
+
+    def add_card(self, card: Dict[str, Any]):
+        """Index the printed name(s) of one non-English printing"""
+        lang = card.get('lang')
+        if not lang or lang == 'en' or card.get('layout') in SKIPPED_LAYOUTS or not card.get('name'):
+            return
+        by_key = self.names.setdefault(lang, {})
+        printed = [card.get('printed_name')]
+        printed.extend(face.get('printed_name') for face in card.get('card_faces') or [])
+        for name in printed:
+            key = printed_key(name) if name else ''
+            if key:
+                by_key.setdefault(key, card['name'])
+
+    def load_cards(self, cards: Iterable[Dict[str, Any]]) -> int:
+        for card in cards:
+            self.add_card(card)
+        return len(self)
+
+    def resolve(self, name: str, lang: Optional[str] = None) -> Optional[str]:
+        """English name of a printed name; `lang` is tried first, then every other language"""
+        key = printed_key(name)
+        if not key:
+            return None
+        if lang and lang in self.names:
+            english = self.names[lang].get(key)
+            if english:
+                return english
+        for other, by_key in self.names.items():
+            if other != lang and key in by_key:
+                return by_key[key]
+        return None
+
+    def languages(self) -> List[str]:
+        return sorted(self.names)
+
+    def save(self, path: str):
+        """Write the index as JSON (temp file renamed into place)"""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.new')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': PRINTED_NAMES_VERSION, 'names': self.names},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'PrintedNameIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != PRINTED_NAMES_VERSION:
+            raise ValueError(f"Unsupported printed-name index version {data.get('version')} in {path}")
+        index = cls(data['names'])
+        index.source_path = str(path)
+        return index
+
+    def __len__(self) -> int:
+        return sum(len(by_key) for by_key in self.names.values())
+
+
+def build_printed_names(all_cards_path: Optional[str] = None, out_path: Optional[str] = None) -> PrintedNameIndex:
+    """Stream-parse an all-cards bulk file and write the printed-name index"""
+    all_cards_path = str(all_cards_path or DEFAULT_ALL_CARDS_PATH)
+    out_path = str(out_path or DEFAULT_PRINTED_NAMES_PATH)
+    start_time = time.time()
+
+    index = PrintedNameIndex()
+    index.load_cards(iter_bulk_cards(all_cards_path))
+    index.save(out_path)
+    logger.info(f"🌍 Printed-name index built: {len(index)} names in {len(index.names)} languages "
+                f"from {all_cards_path} in {time.time() - start_time:.1f}s -> {out_path}")
+    return index
+
+
+def load_default_printed_names(path: Optional[str] = None) -> Optional[PrintedNameIndex]:
+    """Index at `path`, SCRYFALL_PRINTED_NAMES_PATH or data/scryfall-printed-names.json; None if absent"""
+    path = path or os.getenv('SCRYFALL_PRINTED_NAMES_PATH') or str(DEFAULT_PRINTED_NAMES_PATH)
+    if not os.path.exists(path):
+        logger.info(f"No printed-name index at {path}, non-English names resolve through Scryfall")
+        return None
+    try:
+        index = PrintedNameIndex.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Failed to load printed-name index from {path}: {e}")
+        return None
+    logger.info(f"🌍 Printed-name index loaded: {len(index)} names ({', '.join(index.languages())})")
+    return index
+
+
+_shared_printed_names: Optional[PrintedNameIndex] = None
+_shared_printed_names_loaded = False
+_shared_printed_names_lock = threading.Lock()
+
+
+def get_shared_printed_names() -> Optional[PrintedNameIndex]:
+    """Process-wide printed-name index, loaded once"""
+    global _shared_printed_names, _shared_printed_names_loaded
+    with _shared_printed_names_lock:
+        if not _shared_printed_names_loaded:
+            _shared_printed_names = load_default_printed_names()
+            _shared_printed_names_loaded = True
+    return _shared_printed_names
+
+
+def loaded_shared_printed_names() -> Optional[PrintedNameIndex]:
+    """The shared index if it is already loaded, else None: never reads the disk (safe on the event loop)"""
+    return _shared_printed_names
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scryfall all-cards bulk data -> printed-name index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="stream-parse an all-cards file into a printed-name index")
+    build.add_argument('all_cards_path', nargs='?', default=str(DEFAULT_ALL_CARDS_PATH))
+    build.add_argument('out_path', nargs='?', default=str(DEFAULT_PRINTED_NAMES_PATH))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    index = build_printed_names(args.all_cards_path, args.out_path)
+    print(f"✅ {len(index)} printed names ({', '.join(index.languages())}) -> {args.out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
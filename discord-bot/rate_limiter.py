@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+🚦 Async Token Bucket
+Concurrency-safe rate limiter shared by every outbound Scryfall request.
+Tokens refill continuously at `rate` per second up to `burst`; callers
+queue on a lock, so concurrent coroutines can never all skip the wait.
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """Token bucket with FIFO waiters and server-imposed pauses (Retry-After)"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be > 0 and burst >= 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+        self.acquired = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    async def acquire(self, tokens: int = 1):
+        """Wait until `tokens` are available, then consume them"""
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    break
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+        self.acquired += tokens
+        self.total_wait += time.monotonic() - start
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds` (e.g. after a 429) and drain the bucket"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated_at = self._paused_until
+
+    @property
+    def available_tokens(self) -> float:
+        self._refill(time.monotonic())
+        return self._tokens
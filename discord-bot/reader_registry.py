@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+📚 Reader Registry
+Process-wide EasyOCR readers: each (languages, options) combination is
+loaded once, on first use or preloaded in the background, and shared by
+every parser in the process. A Reader holds hundreds of MB of weights, so
+two parsers must never build two copies.
+
+    reader = get_reader(['en'])             # blocks until loaded
+    preload_reader(['en'])                  # background thread, returns at once
+
+Load time and the RSS growth of each load are reported by `reader_stats()`
+and on /metrics.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from prometheus_client.core import GaugeMetricFamily
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+ReaderKey = Tuple[Tuple[str, ...], Tuple[Tuple[str, Any], ...]]
+
+
+def _easyocr_reader(languages: Sequence[str], **options):
+    torch_threads = int(os.getenv('OCR_TORCH_THREADS', '0'))
+    if torch_threads:
+        # One intra-op pool per process, sized so OCR workers share the cores
+        import torch
+        torch.set_num_threads(torch_threads)
+    import easyocr
+    return easyocr.Reader(list(languages), **options)
+
+
+class ReaderRegistry:
+    """Readers keyed by language set + Reader options, each built at most once"""
+
+    def __init__(self, factory: Callable[..., Any] = _easyocr_reader):
+        self.factory = factory
+        self._readers: Dict[ReaderKey, Any] = {}
+        self._key_locks: Dict[ReaderKey, threading.Lock] = {}
+        self._stats: Dict[ReaderKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(languages: Sequence[str] = ('en',), gpu: Optional[bool] = None, **options) -> ReaderKey:
+        """Order-insensitive language set; gpu defaults to OCR_GPU=1; verbose off unless asked"""
+        options['gpu'] = os.getenv('OCR_GPU') == '1' if gpu is None else bool(gpu)
+        options.setdefault('verbose', False)
+        return tuple(sorted(set(languages))), tuple(sorted(options.items()))
+
+    def get(self, languages: Sequence[str] = ('en',), gpu: Optional[bool] = None, **options):
+        key = self.key(languages, gpu, **options)
+        reader = self._readers.get(key)
+        if reader is None:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            # Per-key lock: loading 'fr' does not hold up callers of a loaded 'en'
+            with key_lock:
+                reader = self._readers.get(key)
+                if reader is None:
+                    reader = self._load(key)
+        with self._lock:
+            self._stats[key]['uses'] += 1
+        return reader
+
+    def _load(self, key: ReaderKey):
+        languages, options = key
+        logger.info(f"🤖 Loading EasyOCR reader {list(languages)} (first load may download models)")
+        rss_before = metrics.process_rss_bytes()
+        start_time = time.perf_counter()
+        reader = self.factory(languages, **dict(options))
+        load_seconds = time.perf_counter() - start_time
+        rss_delta = max(0.0, metrics.process_rss_bytes() - rss_before)
+        with self._lock:
+            self._readers[key] = reader
+            self._stats[key] = {'languages': list(languages), 'options': dict(options),
+                                'load_seconds': load_seconds, 'rss_delta_bytes': rss_delta, 'uses': 0}
+        logger.info(f"✅ EasyOCR reader {list(languages)} ready in {load_seconds:.1f}s "
+                    f"(+{rss_delta / 1024 / 1024:.0f} MB RSS)")
+        return reader
+
+    def is_loaded(self, languages: Sequence[str] = ('en',), gpu: Optional[bool] = None, **options) -> bool:
+        return self.key(languages, gpu, **options) in self._readers
+
+    def preload(self, languages: Sequence[str] = ('en',), gpu: Optional[bool] = None, **options) -> threading.Thread:
+        """Load in a background thread; later `get` calls wait for it instead of loading again"""
+        def load():
+            try:
+                self.get(languages, gpu, **options)
+            except Exception as e:
+                logger.error(f"❌ EasyOCR reader {list(languages)} preload failed: {e}")
+
+        thread = threading.Thread(target=load, name=f"reader-preload-{'-'.join(languages)}", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(stat) for stat in self._stats.values()]
+
+    def collect_metrics(self):
+        stats = self.stats()
+        yield GaugeMetricFamily('mtg_ocr_readers_loaded', 'EasyOCR readers loaded in this process', value=len(stats))
+        load_seconds = GaugeMetricFamily('mtg_ocr_reader_load_seconds', 'Time taken to load each EasyOCR reader',
+                                         labels=['languages'])
+        rss = GaugeMetricFamily('mtg_ocr_reader_rss_bytes', 'Resident memory added by loading each EasyOCR reader',
+                                labels=['languages'])
+        for stat in stats:
+            load_seconds.add_metric([','.join(stat['languages'])], stat['load_seconds'])
+            rss.add_metric([','.join(stat['languages'])], stat['rss_delta_bytes'])
+        yield load_seconds
+        yield rss
+
+
+_shared_registry = ReaderRegistry()
+metrics.add_collector('ocr_readers', lambda: _shared_registry.collect_metrics())
+
+
+def get_registry() -> ReaderRegistry:
+    """The process-wide registry"""
+    return _shared_registry
+
+
+def get_reader(languages: Sequence[str] = ('en',), gpu: Optional[bool] = None, **options):
+    """Shared EasyOCR reader for `languages`, loaded on first use"""
+    return _shared_registry.get(languages, gpu, **options)
+
+
+def preload_reader(languages: Sequence[str] = ('en',), gpu: Optional[bool] = None, **options) -> threading.Thread:
+    return _shared_registry.preload(languages, gpu, **options)
+
+
+def reader_stats() -> List[Dict[str, Any]]:
+    return _shared_registry.stats()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+🛡️ Resilience primitives for outbound Scryfall calls
+- RetryPolicy: bounded retries with decorrelated-jitter backoff
+- CircuitBreaker: fails fast while the upstream is degraded, probes it again
+  after a cool-down (closed -> open -> half-open -> closed)
+"""
+
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ScryfallUnavailableError(Exception):
+    """Raised when Scryfall could not be reached (breaker open, timeouts, 5xx, retries exhausted)"""
+
+
+class RetryPolicy:
+    """Bounded retries; delays follow the 'decorrelated jitter' scheme"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.2, max_delay: float = 5.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def next_delay(self, previous_delay: float) -> float:
+        """sleep = min(cap, random(base, previous * 3))"""
+        return min(self.max_delay, random.uniform(self.base_delay, max(previous_delay, self.base_delay) * 3))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """False while open; lets a single probe through once half-open"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        if self._state != self.CLOSED:
+            logger.info("Scryfall circuit closed (upstream recovered)")
+        self._state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(f"Scryfall circuit opened after {self.failures} failures, "
+                               f"failing fast for {self.reset_timeout:.0f}s")
+            self._state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """End a half-open probe that got no verdict (retries spent on 429s, cancelled): counts as a failure"""
+        if self._state == self.HALF_OPEN and self._probe_in_flight:
+            self.record_failure()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+💾 Scryfall Caches
+- BoundedTTLCache: in-memory LRU cache with a byte budget, heap-driven expiry
+  and incrementally maintained counters (constant-time stats).
+- PersistentCache: disk-backed (SQLite, WAL mode) response cache shared by the
+  bot and every Python wrapper the Node server spawns, so a process never starts cold.
+"""
+
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(tempfile.gettempdir()) / 'screen-to-deck' / 'scryfall_cache.sqlite3'
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate footprint of a cached value: its compact JSON length"""
+    try:
+        return len(json.dumps(value, separators=(',', ':')))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class BoundedTTLCache:
+    """
+    LRU cache bounded by an approximate byte budget.
+    Expiry is driven by a min-heap of deadlines (lazy deletion), so no
+    operation ever scans the whole cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 7200):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (value, timestamp, size), least recently used first
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._deadlines: List[Tuple[float, float, str]] = []
+
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a live value (marking it recently used) or `default`"""
+        self._expire()
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: str, value: Any, timestamp: Optional[float] = None, size: Optional[int] = None):
+        """Insert or replace a value, then evict least recently used entries over budget"""
+        timestamp = timestamp or time.time()
+        size = estimate_size(value) if size is None else size
+
+        self._remove(key)
+        self._entries[key] = (value, timestamp, size)
+        self.total_bytes += size
+        heapq.heappush(self._deadlines, (timestamp + self.ttl, timestamp, key))
+
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+        self._compact_deadlines()
+        self._expire()
+
+    def timestamp(self, key: str) -> float:
+        """Insertion time of a cached entry (0 when absent)"""
+        entry = self._entries.get(key)
+        return entry[1] if entry else 0.0
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        self._remove(key)
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
+        self._deadlines.clear()
+        self.total_bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry and return how many were removed"""
+        before = self.expirations
+        self._expire()
+        return self.expirations - before
+
+    def stats(self) -> Dict[str, Any]:
+        """Constant-time statistics from the maintained counters"""
+        self._expire()
+        now = time.time()
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            # The heap head is always live after _expire: it is the oldest entry
+            'oldest_entry_age': now - self._deadlines[0][1] if self._deadlines else 0,
+        }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def _is_live_deadline(self, deadline: Tuple[float, float, str]) -> bool:
+        entry = self._entries.get(deadline[2])
+        return entry is not None and entry[1] == deadline[1]
+
+    def _expire(self):
+        now = time.time()
+        while self._deadlines:
+            deadline = self._deadlines[0]
+            if not self._is_live_deadline(deadline):
+                # Stale deadline left behind by a replaced or evicted entry
+                heapq.heappop(self._deadlines)
+            elif deadline[0] <= now:
+                heapq.heappop(self._deadlines)
+                self._remove(deadline[2])
+                self.expirations += 1
+            else:
+                break
+
+    def _compact_deadlines(self):
+        """Rebuild the heap once stale deadlines outnumber live entries"""
+        if len(self._deadlines) > 2 * len(self._entries) + 64:
+            self._deadlines = [
+                (timestamp + self.ttl, timestamp, key)
+                for key, (_, timestamp, _) in self._entries.items()
+            ]
+            heapq.heapify(self._deadlines)
+
+    def __contains__(self, key: str) -> bool:
+        self._expire()
+        return key in self._entries
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PersistentCache:
+    """
+    Key/value store with TTL. Every write is a single atomic statement and
+    WAL journaling lets any number of processes read while one writes.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7200):
+        self.path = str(path or DEFAULT_CACHE_PATH)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " timestamp REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Tuple[Any, float]:
+        """Return (value, timestamp), or (_MISSING, 0) when absent or expired"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, timestamp FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache read failed for {key}: {e}")
+            return _MISSING, 0.0
+
+        if row is None or time.time() - row[1] >= self.ttl:
+            return _MISSING, 0.0
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, timestamp: Optional[float] = None):
+        """Store a JSON-serializable value"""
+        payload = json.dumps(value, separators=(',', ':'))
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
+                    (key, payload, timestamp or time.time())
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache write failed for {key}: {e}")
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def purge_expired(self) -> int:
+        """Drop expired rows and return how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE timestamp <= ?", (time.time() - self.ttl,)
+            )
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def is_missing(value: Any) -> bool:
+    """True for the sentinel PersistentCache.get returns on a miss"""
+    return value is _MISSING
+
+
+def open_default_cache(ttl: float = 7200) -> Optional[PersistentCache]:
+    """
+    Open the shared cache at SCRYFALL_CACHE_PATH (or the temp-dir default).
+    Set SCRYFALL_CACHE_PATH=off to keep the cache in memory only.
+    """
+    path = os.getenv('SCRYFALL_CACHE_PATH') or str(DEFAULT_CACHE_PATH)
+    if path.lower() in ('off', 'none', '0'):
+        return None
+
+    try:
+        return PersistentCache(path, ttl=ttl)
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Persistent Scryfall cache unavailable at {path}: {e}")
+        return None
@@ -8,18 +8,43 @@ Now with intelligent card correction, format detection, and advanced validation
 import asyncio
 import aiohttp
 import logging
+import os
 import time
 import re
 import json
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Dict, List, Optional, Any, Tuple, Set, Callable, Awaitable
 from urllib.parse import quote
 from fuzzywuzzy import fuzz
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import csv
+from collections import deque
+
+from card_index import LocalCardIndex, get_shared_index
+from scryfall_cache import BoundedTTLCache, PersistentCache, open_default_cache, is_missing
+from rate_limiter import AsyncTokenBucket
+from resilience import CircuitBreaker, RetryPolicy, ScryfallUnavailableError
+from ocr_corrections import OcrCorrectionEngine
+from legality import DeckLegality
+from prefix_index import is_truncated, strip_truncation
+from printed_names import PrintedNameIndex, get_shared_printed_names
+from price_table import PriceTable, get_shared_prices
+from http_client import HttpClient, get_http_client
+from metrics import SCRYFALL_CACHE, SCRYFALL_REQUESTS, SCRYFALL_REQUEST_SECONDS
 
 logger = logging.getLogger(__name__)
 
+_NOT_CACHED = object()
+
+# Interface text every MTGA/MTGO capture carries: never a card name
+KNOWN_UI_STRINGS = {
+    'deck', 'sideboard', 'companion', 'commander', 'done', 'submit', 'cards',
+    'best of three only', 'best of one', 'search', 'filters', 'craft',
+    'collection', 'decks', 'main deck', 'maindeck', 'lands', 'creatures',
+    'instants', 'sorceries', 'artifacts', 'enchantments', 'planeswalkers',
+}
+UI_STRING_PATTERN = re.compile(r'^\d+\s*/\s*\d+(\s+cards?)?$|^\d+\s+cards?$', re.IGNORECASE)
+
 @dataclass
 class CardMatch:
     """Represents a matched card with confidence and metadata"""
@@ -45,24 +70,63 @@ class DeckAnalysis:
 class ScryfallService:
     """Enhanced Async service for interacting with Scryfall API"""
     
-    def __init__(self):
+    def __init__(self, card_index: Optional[LocalCardIndex] = None,
+                 persistent_cache: Optional[PersistentCache] = None,
+                 printed_names: Optional[PrintedNameIndex] = None,
+                 price_table: Optional[PriceTable] = None,
+                 http_client: Optional[HttpClient] = None):
         self.base_url = "https://api.scryfall.com"
+        # Pooled keep-alive session shared with the rest of the bot (set in __aenter__)
+        self.http_client = http_client
         self.session: Optional[aiohttp.ClientSession] = None
         
+        # Offline card index (Scryfall bulk file), consulted before any HTTP call
+        self.card_index = card_index
+        self.local_hits = 0
+        self.local_fuzzy_cutoff = 88  # Minimum local match score before asking Scryfall
+        
+        # Non-English printed names -> English oracle names (all-cards bulk export)
+        self.printed_names = printed_names
+        self.translated_names = 0
+        
+        # Price snapshot (card id / name -> float32 prices), read by deck analysis
+        self.price_table = price_table
+        
         # Rate limiting (Scryfall allows 50-100 requests per second)
-        self.request_delay = 0.05  # 50ms between requests (more aggressive)
-        self.burst_limit = 10  # Allow burst of 10 requests
-        self.burst_window = 1.0  # Reset burst every second
-        self.last_request_time = 0
-        self.recent_requests = []
-        
-        # Enhanced caching with TTL
-        self.cache: Dict[str, Any] = {}
+        # One token bucket shared by every outbound call, retries included
+        self.request_delay = 1.0 / float(os.getenv('SCRYFALL_RATE_LIMIT', '20'))  # 50ms sustained
+        self.burst_limit = int(os.getenv('SCRYFALL_BURST', '10'))  # Allow burst of 10 requests
+        self.max_retries = 3  # Bounded retries (429, 5xx, timeouts)
+        self.collection_batch_size = 75  # Scryfall /cards/collection limit
+        self.rate_limiter = AsyncTokenBucket(rate=1.0 / self.request_delay, burst=self.burst_limit)
+        
+        # Resilience: jittered backoff between retries, fail fast while Scryfall is down
+        self.retry_policy = RetryPolicy(max_retries=self.max_retries, base_delay=0.2, max_delay=5.0)
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv('SCRYFALL_BREAKER_THRESHOLD', '5')),
+            reset_timeout=float(os.getenv('SCRYFALL_BREAKER_RESET', '30'))
+        )
+        self.request_timeout = aiohttp.ClientTimeout(total=8, connect=3)
+        self.degraded_fallback_cutoff = 75  # Local match score accepted while Scryfall is down
+        self.fast_failures = 0
+        
+        # Enhanced caching with TTL, bounded by a byte budget (LRU eviction)
         self.cache_ttl = 7200  # 2 hours cache (longer for better performance)
-        self.cache_timestamps: Dict[str, float] = {}
+        self.cache_max_bytes = int(os.getenv('SCRYFALL_CACHE_MAX_MB', '64')) * 1024 * 1024
+        self.cache = BoundedTTLCache(max_bytes=self.cache_max_bytes, ttl=self.cache_ttl)
+        
+        # Negative cache: known-bad strings (OCR noise, UI text) with a shorter TTL
+        self.negative_cache_ttl = 900  # 15 minutes
+        self.negative_cache = BoundedTTLCache(max_bytes=1024 * 1024, ttl=self.negative_cache_ttl)
+        self.negative_hits = 0
+        
+        # In-flight lookups shared by concurrent callers of the same cache key
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced_requests = 0
         
-        # Card name correction cache
-        self.correction_cache: Dict[str, str] = {}
+        # Disk-backed cache shared across processes (opened in __aenter__)
+        self.persistent_cache = persistent_cache
+        self._owns_persistent_cache = False
         
         # Format detection patterns
         self.format_patterns = {
@@ -132,6 +196,8 @@ class ScryfallService:
             'arlifact': 'artifact',
             'planar': 'planar',
         }
+        # Compiled once: single-pass substring fixes, digit fixes, memoized per raw OCR string
+        self.correction_engine = OcrCorrectionEngine(self.ocr_corrections)
         
         # Language support
         self.supported_languages = ['en', 'es', 'fr', 'de', 'it', 'pt', 'ja', 'ko', 'ru', 'zhs']
@@ -144,128 +210,128 @@ class ScryfallService:
         
         self.cache_hits = 0
         self.cache_misses = 0
-        self.timings = []
+        self.timings = deque(maxlen=1000)  # Seconds per Scryfall HTTP attempt (most recent)
     
     async def __aenter__(self):
         """Async context manager entry"""
+        if self.card_index is None:
+            self.card_index = await asyncio.to_thread(get_shared_index)
+            if self.card_index:
+                # Build the name matcher off the event loop before the first scan
+                await asyncio.to_thread(lambda: self.card_index.matcher)
+        if self.printed_names is None:
+            self.printed_names = await asyncio.to_thread(get_shared_printed_names)
+        if self.price_table is None:
+            self.price_table = await asyncio.to_thread(get_shared_prices)
+        if self.persistent_cache is None:
+            self.persistent_cache = open_default_cache(self.cache_ttl)
+            self._owns_persistent_cache = self.persistent_cache is not None
         if not self.session:
-            connector = aiohttp.TCPConnector(limit=20, limit_per_host=10)  # Increased limits
-            timeout = aiohttp.ClientTimeout(total=45, connect=15)  # Longer timeouts
-            self.session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=timeout,
-                headers=self.headers
-            )
+            self.http_client = self.http_client or get_http_client()
+            self.session = self.http_client.session
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Async context manager exit (the shared session stays open for the other users)"""
+        self.session = None
+        if self._owns_persistent_cache:
+            # Opened in __aenter__: close its SQLite connection (a cache passed in belongs to the caller)
+            self.persistent_cache.close()
+            self.persistent_cache = None
+            self._owns_persistent_cache = False
     
     async def _smart_rate_limit(self) -> None:
-        """Enhanced rate limiting with burst support"""
-        current_time = time.time()
-        
-        # Clean old requests from burst window
-        self.recent_requests = [
-            req_time for req_time in self.recent_requests 
-            if current_time - req_time < self.burst_window
-        ]
-        
-        # Check if we need to wait
-        if len(self.recent_requests) >= self.burst_limit:
-            # Too many recent requests, wait
-            oldest_request = min(self.recent_requests)
-            wait_time = self.burst_window - (current_time - oldest_request)
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-        else:
-            # Normal rate limiting
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.request_delay:
-                await asyncio.sleep(self.request_delay - time_since_last)
-        
-        # Record this request
-        self.recent_requests.append(current_time)
-        self.last_request_time = current_time
+        """Enhanced rate limiting with burst support (shared token bucket)"""
+        await self.rate_limiter.acquire()
     
     def _apply_ocr_corrections(self, card_name: str) -> str:
         """Apply common OCR corrections to card names"""
-        corrected = card_name.lower()
-        
-        # Apply known corrections
-        for wrong, correct in self.ocr_corrections.items():
-            if wrong in corrected:
-                corrected = corrected.replace(wrong, correct)
-        
-        # Fix common character replacements
-        char_fixes = {
-            '0': 'o',  # Zero to o
-            '1': 'l',  # One to l (only in middle of words)
-            '5': 's',  # Five to s
-            '8': 'b',  # Eight to b
-            '6': 'g',  # Six to g
-            '9': 'g',  # Nine to g
-        }
-        
-        # Apply character fixes carefully
-        words = corrected.split()
-        fixed_words = []
-        
-        for word in words:
-            fixed_word = word
-            for wrong, correct in char_fixes.items():
-                # Only replace if it makes sense
-                if wrong in word and len(word) > 2:
-                    # Don't replace at start of word unless it's clearly wrong
-                    if word.index(wrong) > 0 or word.startswith(wrong) and len(word) > 3:
-                        fixed_word = fixed_word.replace(wrong, correct)
-            fixed_words.append(fixed_word)
-        
-        result = ' '.join(fixed_words)
-        
-        # Restore proper capitalization
-        return ' '.join(word.capitalize() for word in result.split())
+        return self.correction_engine.correct(card_name)
     
-    async def _make_request(self, endpoint: str, params: Dict[str, str] = None) -> Optional[Dict[str, Any]]:
-        """Make rate-limited request to Scryfall API"""
+    async def _make_request(self, endpoint: str, params: Dict[str, str] = None,
+                            method: str = 'GET', payload: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Make rate-limited request to Scryfall API.
+        Returns the JSON body, or None when Scryfall answers "not found".
+        Raises ScryfallUnavailableError when Scryfall cannot answer (circuit open,
+        timeouts, 5xx, retries exhausted) so callers never mistake an outage for a miss.
+        """
         if not self.session:
             raise RuntimeError("ScryfallService not initialized. Use async context manager.")
         
-        # Rate limiting
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.request_delay:
-            await asyncio.sleep(self.request_delay - time_since_last)
-        
         url = f"{self.base_url}{endpoint}"
         
-        try:
-            self.last_request_time = time.time()
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 404:
-                    logger.debug(f"Card not found: {endpoint}")
-                    return None
-                elif response.status == 429:
-                    # Rate limited
-                    retry_after = int(response.headers.get('Retry-After', 1))
-                    logger.warning(f"Rate limited, waiting {retry_after} seconds")
-                    await asyncio.sleep(retry_after)
-                    return await self._make_request(endpoint, params)
-                else:
-                    logger.error(f"Scryfall API error {response.status}: {await response.text()}")
-                    return None
+        probe = self.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+        if not self.circuit_breaker.allow_request():
+            self.fast_failures += 1
+            raise ScryfallUnavailableError(f"Scryfall circuit open, skipping {endpoint}")
         
-        except asyncio.TimeoutError:
-            logger.error(f"Timeout requesting {url}")
-            return None
-        except Exception as e:
-            logger.error(f"Error requesting {url}: {e}")
-            return None
+        try:
+            delay = self.retry_policy.base_delay
+            last_error = "no attempt made"
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    if self.circuit_breaker.is_open:
+                        break
+                    delay = self.retry_policy.next_delay(delay)
+                    await asyncio.sleep(delay)
+            
+                # Every attempt, retries included, goes through the shared limiter
+                await self._smart_rate_limit()
+            
+                started = time.perf_counter()
+                status = 'error'
+                try:
+                    async with self.session.request(method, url, params=params, json=payload,
+                                                    timeout=self.request_timeout, headers=self.headers) as response:
+                        status = str(response.status)
+                        if response.status == 200:
+                            data = await response.json()
+                            self.circuit_breaker.record_success()
+                            return data
+                        elif response.status == 404:
+                            logger.debug(f"Card not found: {endpoint}")
+                            self.circuit_breaker.record_success()
+                            return None
+                        elif response.status == 429:
+                            # Rate limited: pause the whole bucket, not just this caller
+                            retry_after = float(response.headers.get('Retry-After', 1))
+                            logger.warning(f"Rate limited, waiting {retry_after} seconds (attempt {attempt + 1})")
+                            self.rate_limiter.pause(retry_after)
+                            last_error = "rate limited"
+                            continue
+                        elif response.status >= 500:
+                            last_error = f"HTTP {response.status}"
+                            logger.warning(f"Scryfall API error {response.status} on {endpoint} (attempt {attempt + 1})")
+                            self.circuit_breaker.record_failure()
+                            continue
+                        else:
+                            # Client errors are our fault, not an outage
+                            logger.error(f"Scryfall API error {response.status}: {await response.text()}")
+                            self.circuit_breaker.record_success()
+                            return None
+            
+                except asyncio.TimeoutError:
+                    status = 'timeout'
+                    last_error = "timeout"
+                    logger.warning(f"Timeout requesting {url} (attempt {attempt + 1})")
+                    self.circuit_breaker.record_failure()
+                except aiohttp.ClientError as e:
+                    last_error = str(e) or type(e).__name__
+                    logger.warning(f"Error requesting {url} (attempt {attempt + 1}): {last_error}")
+                    self.circuit_breaker.record_failure()
+                finally:
+                    elapsed = time.perf_counter() - started
+                    self.timings.append(elapsed)
+                    SCRYFALL_REQUEST_SECONDS.observe(elapsed)
+                    SCRYFALL_REQUESTS.labels(status=status).inc()
+        
+            logger.error(f"Giving up on {url}: {last_error}")
+            raise ScryfallUnavailableError(f"Scryfall unavailable for {endpoint}: {last_error}")
+        finally:
+            if probe:
+                # A probe must always settle the breaker, or half-open rejects every call for good
+                self.circuit_breaker.release_probe()
     
     def _get_cache_key(self, endpoint: str, params: Dict[str, str] = None) -> str:
         """Generate cache key for request"""
@@ -274,111 +340,219 @@ class ScryfallService:
             return f"{endpoint}?{param_str}"
         return endpoint
     
+    def _get_cached(self, cache_key: str) -> Tuple[bool, Any]:
+        """Return (hit, data): memory first, then the shared disk cache"""
+        data = self.cache.get(cache_key, _NOT_CACHED)
+        if data is not _NOT_CACHED:
+            return True, data
+        
+        if self._is_known_miss(cache_key):
+            return True, None
+        
+        if self.persistent_cache is not None:
+            data, timestamp = self.persistent_cache.get(cache_key)
+            if data is None:
+                # Misses are written back-dated so they expire after negative_cache_ttl
+                self.negative_cache.set(cache_key, True, timestamp + self.cache_ttl - self.negative_cache_ttl)
+                self.negative_hits += 1
+                return True, None
+            if not is_missing(data):
+                # Promote to memory, keeping the original timestamp for TTL
+                self.cache.set(cache_key, data, timestamp)
+                return True, data
+        
+        return False, None
+    
+    def _is_known_miss(self, cache_key: str) -> bool:
+        """True when `cache_key` recently resolved to nothing"""
+        if self.negative_cache.get(cache_key, _NOT_CACHED) is _NOT_CACHED:
+            return False
+        self.negative_hits += 1
+        return True
+    
+    def _remember_miss(self, cache_key: str):
+        """Record a not-found result in the negative cache (memory and disk)"""
+        timestamp = time.time()
+        self.negative_cache.set(cache_key, True, timestamp)
+        if self.persistent_cache is not None:
+            self.persistent_cache.set(cache_key, None, timestamp - self.cache_ttl + self.negative_cache_ttl)
+    
     def _is_cache_valid(self, cache_key: str) -> bool:
         """Check if cached data is still valid"""
-        if cache_key not in self.cache:
-            return False
-        
-        timestamp = self.cache_timestamps.get(cache_key, 0)
-        return time.time() - timestamp < self.cache_ttl
+        return self._get_cached(cache_key)[0]
     
     def _cache_response(self, cache_key: str, data: Any):
-        """Cache API response"""
-        self.cache[cache_key] = data
-        self.cache_timestamps[cache_key] = time.time()
+        """Cache API response (not-found results go to the negative cache)"""
+        if data is None:
+            self._remember_miss(cache_key)
+            return
+        
+        timestamp = time.time()
+        self.cache.set(cache_key, data, timestamp)
+        if self.persistent_cache is not None:
+            self.persistent_cache.set(cache_key, data, timestamp)
+    
+    async def _cached_call(self, cache_key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Serve `cache_key` from cache, or run `fetch` exactly once for every
+        concurrent caller of the same key (single-flight) and cache the result.
+        """
+        hit, data = self._get_cached(cache_key)
+        if hit:
+            self.cache_hits += 1
+            SCRYFALL_CACHE.labels(result='hit').inc()
+            return data
+        self.cache_misses += 1
+        SCRYFALL_CACHE.labels(result='miss').inc()
+        
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            self.coalesced_requests += 1
+            try:
+                # Shield: a cancelled waiter must not cancel the shared lookup
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled() and not asyncio.current_task().cancelling():
+                    # The owner was cancelled, not us: run the lookup ourselves
+                    return await self._cached_call(cache_key, fetch)
+                raise
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await fetch()
+        except ScryfallUnavailableError as e:
+            # An outage is not an answer: resolve waiters with None but cache nothing
+            logger.debug(f"Lookup {cache_key} skipped: {e}")
+            future.set_result(None)
+            return None
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        else:
+            self._cache_response(cache_key, result)
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(cache_key, None)
+    
+    @property
+    def scryfall_available(self) -> bool:
+        """False while the circuit breaker is open or recent calls have been failing"""
+        return self.circuit_breaker.state == CircuitBreaker.CLOSED and self.circuit_breaker.failures == 0
+    
+    def _lookup_local_degraded(self, name: str) -> Optional[Dict[str, Any]]:
+        """Looser local match, only used while Scryfall cannot be reached"""
+        if not self.card_index:
+            return None
+        card = self.card_index.match(name, self.degraded_fallback_cutoff)
+        if card:
+            self.local_hits += 1
+        return card
+    
+    def _english_name(self, name: str, lang: Optional[str] = None) -> Optional[str]:
+        """English oracle name of a non-English printed name, if the printed-name index knows it"""
+        if not self.printed_names:
+            return None
+        english = self.printed_names.resolve(name, lang)
+        if english and english.lower() != name.strip().lower():
+            self.translated_names += 1
+            return english
+        return None
+    
+    def _lookup_local(self, name: str, fuzzy: bool = False) -> Optional[Dict[str, Any]]:
+        """Look a card up in the offline index, if one is loaded (printed names before fuzzy matching)"""
+        if not self.card_index:
+            return None
+        
+        card = self.card_index.get_exact(name)
+        if card is None:
+            english = self._english_name(name)
+            card = self.card_index.get_exact(english) if english else None
+        if card is None and fuzzy:
+            card = self.card_index.get_fuzzy(name) or self.card_index.match(name, self.local_fuzzy_cutoff)
+        if card:
+            self.local_hits += 1
+        return card
     
     async def search_card_exact(self, name: str) -> Optional[Dict[str, Any]]:
         """Search for exact card name match"""
-        cache_key = f"exact:{name.lower()}"
-        
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]
-        
-        endpoint = f"/cards/named"
-        params = {'exact': name}
-        
-        logger.info(f"[Scryfall] search_card_exact: name='{name}' (param exact)")
-        result = await self._make_request(endpoint, params)
-        logger.info(f"[Scryfall] search_card_exact: response for '{name}': {result if result else 'None'}")
-        self._cache_response(cache_key, result)
-        
-        return result
+        card = self._lookup_local(name)
+        if card:
+            return card
+        name = self._english_name(name) or name
+        
+        async def fetch():
+            logger.info(f"[Scryfall] search_card_exact: name='{name}' (param exact)")
+            result = await self._make_request("/cards/named", {'exact': name})
+            logger.info(f"[Scryfall] search_card_exact: response for '{name}': {result if result else 'None'}")
+            return result
+        
+        return await self._cached_call(f"exact:{name.lower()}", fetch)
     
     async def search_card_fuzzy(self, name: str) -> Optional[Dict[str, Any]]:
         """Search for card using fuzzy matching"""
-        cache_key = f"fuzzy:{name.lower()}"
-        
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]
-        
-        endpoint = f"/cards/named"
-        params = {'fuzzy': name}
-        
-        logger.info(f"[Scryfall] search_card_fuzzy: name='{name}' (param fuzzy)")
-        result = await self._make_request(endpoint, params)
-        logger.info(f"[Scryfall] search_card_fuzzy: response for '{name}': {result['name'] if result else 'None'}")
-        self._cache_response(cache_key, result)
-        
-        return result
+        card = self._lookup_local(name, fuzzy=True)
+        if card:
+            return card
+        name = self._english_name(name) or name
+        
+        async def fetch():
+            logger.info(f"[Scryfall] search_card_fuzzy: name='{name}' (param fuzzy)")
+            result = await self._make_request("/cards/named", {'fuzzy': name})
+            logger.info(f"[Scryfall] search_card_fuzzy: response for '{name}': {result['name'] if result else 'None'}")
+            return result
+        
+        return await self._cached_call(f"fuzzy:{name.lower()}", fetch)
     
     async def search_cards(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Search for cards with query"""
-        cache_key = f"search:{query.lower()}:{limit}"
-        
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]
-        
-        endpoint = f"/cards/search"
-        params = {
-            'q': query,
-            'order': 'name',
-            'dir': 'asc',
-            'page': '1'
-        }
-        
-        result = await self._make_request(endpoint, params)
-        
-        if result and 'data' in result:
-            cards = result['data'][:limit]
-            self._cache_response(cache_key, cards)
-            return cards
+        async def fetch():
+            params = {
+                'q': query,
+                'order': 'name',
+                'dir': 'asc',
+                'page': '1'
+            }
+            result = await self._make_request("/cards/search", params)
+            if result and 'data' in result:
+                return result['data'][:limit]
+            return []
         
-        self._cache_response(cache_key, [])
-        return []
+        return await self._cached_call(f"search:{query.lower()}:{limit}", fetch)
     
     async def get_card_by_id(self, card_id: str) -> Optional[Dict[str, Any]]:
         """Get card by Scryfall ID"""
-        cache_key = f"id:{card_id}"
-        
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]
-        
-        endpoint = f"/cards/{card_id}"
-        
-        result = await self._make_request(endpoint)
-        self._cache_response(cache_key, result)
+        if self.card_index:
+            card = self.card_index.get_by_id(card_id)
+            if card:
+                self.local_hits += 1
+                return card
         
-        return result
+        return await self._cached_call(
+            f"id:{card_id}", lambda: self._make_request(f"/cards/{card_id}")
+        )
     
     async def autocomplete_card_names(self, partial: str) -> List[str]:
-        """Get autocomplete suggestions for card names"""
-        cache_key = f"autocomplete:{partial.lower()}"
-        
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]
-        
-        endpoint = f"/cards/autocomplete"
-        params = {'q': partial}
-        
-        result = await self._make_request(endpoint, params)
-        
-        if result and 'data' in result:
-            suggestions = result['data']
-            self._cache_response(cache_key, suggestions)
+        """Get autocomplete suggestions for card names (local prefix index when card data is loaded)"""
+        partial = strip_truncation(partial)
+        if self.card_index:
+            suggestions = self.card_index.complete(partial)
+            if suggestions:
+                self.local_hits += 1
             return suggestions
         
-        self._cache_response(cache_key, [])
-        return []
+        async def fetch():
+            result = await self._make_request("/cards/autocomplete", {'q': partial})
+            if result and 'data' in result:
+                return result['data']
+            return []
+        
+        return await self._cached_call(f"autocomplete:{partial.lower()}", fetch)
     
     async def validate_card_names(self, names: List[str]) -> List[Dict[str, Any]]:
         """Validate multiple card names and return found cards"""
@@ -415,40 +589,34 @@ class ScryfallService:
     async def get_random_card(self) -> Optional[Dict[str, Any]]:
         """Get a random card"""
         endpoint = f"/cards/random"
-        return await self._make_request(endpoint)
+        try:
+            return await self._make_request(endpoint)
+        except ScryfallUnavailableError:
+            return None
     
     async def check_format_legality(self, cards: List[str], format_name: str) -> Dict[str, Any]:
-        """Check if cards are legal in a specific format"""
-        legality_info = {
+        """Check if cards are legal in a specific format (names resolved as one batch)"""
+        resolved = await self.resolve_card_names(cards)
+        deck = DeckLegality.from_cards([{'card_data': card} for card in resolved.values() if card])
+        flags = deck.violations(format_name)
+        
+        issues = []
+        for name, banned, not_legal in zip(deck.names, flags['banned'], flags['not_legal']):
+            if banned or not_legal:
+                issues.append(f"{name} is {'banned' if banned else 'not_legal'} in {format_name}")
+        
+        return {
             'format': format_name,
-            'legal': True,
-            'issues': [],
+            'legal': not issues,
+            'issues': issues,
             'cards_checked': len(cards)
         }
-        
-        for card_name in cards:
-            card = await self.search_card_fuzzy(card_name)
-            if card and 'legalities' in card:
-                legality = card['legalities'].get(format_name.lower(), 'not_legal')
-                if legality not in ['legal', 'restricted']:
-                    legality_info['legal'] = False
-                    legality_info['issues'].append(f"{card['name']} is {legality} in {format_name}")
-        
-        return legality_info
     
     async def get_set_information(self, set_code: str) -> Optional[Dict[str, Any]]:
         """Get information about a Magic set"""
-        cache_key = f"set:{set_code.lower()}"
-        
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]
-        
-        endpoint = f"/sets/{set_code.lower()}"
-        
-        result = await self._make_request(endpoint)
-        self._cache_response(cache_key, result)
-        
-        return result
+        return await self._cached_call(
+            f"set:{set_code.lower()}", lambda: self._make_request(f"/sets/{set_code.lower()}")
+        )
     
     async def search_cards_advanced(self, 
                                   colors: List[str] = None,
@@ -484,85 +652,173 @@ class ScryfallService:
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        current_time = time.time()
-        valid_entries = sum(
-            1 for key in self.cache.keys()
-            if self._is_cache_valid(key)
-        )
+        stats = self.cache.stats()
         
         return {
-            'total_entries': len(self.cache),
-            'valid_entries': valid_entries,
-            'cache_hit_ratio': valid_entries / max(len(self.cache), 1),
-            'cache_size_mb': len(str(self.cache)) / (1024 * 1024),
-            'oldest_entry_age': current_time - min(self.cache_timestamps.values()) if self.cache_timestamps else 0
+            'total_entries': stats['entries'],
+            'valid_entries': stats['entries'],  # expired entries are dropped eagerly
+            'cache_hit_ratio': stats['hit_ratio'],
+            'cache_size_mb': stats['bytes'] / (1024 * 1024),
+            'cache_max_mb': stats['max_bytes'] / (1024 * 1024),
+            'evictions': stats['evictions'],
+            'expirations': stats['expirations'],
+            'oldest_entry_age': stats['oldest_entry_age'],
+            'local_index_cards': len(self.card_index) if self.card_index else 0,
+            'local_hits': self.local_hits,
+            'coalesced_requests': self.coalesced_requests,
+            'negative_entries': len(self.negative_cache),
+            'negative_hits': self.negative_hits,
+            'lookup_hits': self.cache_hits,
+            'lookup_misses': self.cache_misses,
+            'circuit_state': self.circuit_breaker.state,
+            'circuit_opened': self.circuit_breaker.times_opened,
+            'fast_failures': self.fast_failures
         }
     
     def clear_cache(self):
         """Clear all cached data"""
         self.cache.clear()
-        self.cache_timestamps.clear()
+        self.negative_cache.clear()
+        if self.persistent_cache is not None:
+            self.persistent_cache.clear()
         logger.info("Scryfall cache cleared")
     
     def clear_expired_cache(self):
         """Clear only expired cache entries"""
-        current_time = time.time()
-        expired_keys = [
-            key for key, timestamp in self.cache_timestamps.items()
-            if current_time - timestamp >= self.cache_ttl
-        ]
+        expired_count = self.cache.purge_expired() + self.negative_cache.purge_expired()
         
-        for key in expired_keys:
-            self.cache.pop(key, None)
-            self.cache_timestamps.pop(key, None)
+        if self.persistent_cache is not None:
+            self.persistent_cache.purge_expired()
         
-        logger.info(f"Cleared {len(expired_keys)} expired cache entries")
+        logger.info(f"Cleared {expired_count} expired cache entries")
     
     async def bulk_card_lookup(self, identifiers: List[Dict[str, str]]) -> List[Dict[str, Any]]:
         """Look up multiple cards in a single request"""
-        endpoint = "/cards/collection"
-        
         # Scryfall bulk lookup endpoint expects POST data
-        if not self.session:
-            raise RuntimeError("ScryfallService not initialized")
-        
-        # Rate limiting
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.request_delay:
-            await asyncio.sleep(self.request_delay - time_since_last)
-        
         try:
-            self.last_request_time = time.time()
-            url = f"{self.base_url}{endpoint}"
+            result = await self._make_request(
+                "/cards/collection", method='POST', payload={'identifiers': identifiers}
+            )
+        except ScryfallUnavailableError as e:
+            logger.warning(f"Bulk lookup skipped: {e}")
+            return []
+        if not result:
+            logger.error(f"Bulk lookup failed for {len(identifiers)} identifiers")
+            return []
+        return result.get('data', [])
+    
+    async def resolve_card_names(self, names: List[str],
+                                 fuzzy_fallback: bool = True,
+                                 lang: Optional[str] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve a whole deck at once: local index and cache first, then
+        /cards/collection in batches of 75 identifiers, and only the names
+        that miss fall back to concurrent fuzzy searches (unless `fuzzy_fallback` is False).
+        Non-English printed names are looked up by their English name (`lang` is tried first).
+        Returns {name: card_data or None} for every input name.
+        """
+        resolved: Dict[str, Optional[Dict[str, Any]]] = {}
+        pending: List[str] = []
+        
+        for name in dict.fromkeys(n.strip() for n in names if n and n.strip()):
+            if self._is_ui_string(name):
+                resolved[name] = None
+                continue
             
-            async with self.session.post(url, json={'identifiers': identifiers}) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get('data', [])
-                else:
-                    logger.error(f"Bulk lookup error {response.status}: {await response.text()}")
-                    return []
+            card = self._lookup_local(name, fuzzy=True)
+            fuzzy_hit = False
+            if card is None:
+                hit, card = self._get_cached(f"exact:{name.lower()}")
+                if not hit or card is None:
+                    fuzzy_hit, card = self._get_cached(f"fuzzy:{name.lower()}")
+            if card or fuzzy_hit:
+                # A cached fuzzy miss is final: no collection or fuzzy request
+                resolved[name] = card
+            else:
+                pending.append(name)
+        
+        # 1. Exact names in batches through the collection endpoint
+        if pending and self.session:
+            lookup_names = {name: self._english_name(name, lang) or name for name in pending}
+            chunks = [
+                pending[i:i + self.collection_batch_size]
+                for i in range(0, len(pending), self.collection_batch_size)
+            ]
+            batches = await asyncio.gather(*[
+                self.bulk_card_lookup([{'name': lookup_names[name]} for name in chunk]) for chunk in chunks
+            ])
+            
+            found_by_name: Dict[str, Dict[str, Any]] = {}
+            for card in (card for batch in batches for card in batch):
+                found_by_name[card['name'].lower()] = card
+                for face in card.get('card_faces') or []:
+                    found_by_name.setdefault(face.get('name', '').lower(), card)
+            
+            for name in pending:
+                card = found_by_name.get(lookup_names[name].lower())
+                if card:
+                    self._cache_response(f"exact:{lookup_names[name].lower()}", card)
+                    resolved[name] = card
+            
+            logger.info(f"[Scryfall] collection lookup: {len(pending)} names in {len(chunks)} request(s), "
+                        f"{sum(1 for n in pending if n in resolved)} found")
+        
+        # 2. Only the misses fall back to fuzzy resolution, concurrently
+        misses = [name for name in pending if name not in resolved]
+        if misses and not fuzzy_fallback:
+            resolved.update((name, None) for name in misses)
+        elif misses:
+            results = await asyncio.gather(
+                *[self.search_card_fuzzy(name) for name in misses], return_exceptions=True
+            )
+            for name, result in zip(misses, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error resolving '{name}': {result}")
+                    result = None
+                resolved[name] = result
         
-        except Exception as e:
-            logger.error(f"Error in bulk lookup: {e}")
-            return []
+        return resolved
     
     async def get_card_rulings(self, card_id: str) -> List[Dict[str, Any]]:
         """Fetch rulings for a specific card ID"""
-        return await self._make_request(f"/cards/{card_id}/rulings")
+        try:
+            return await self._make_request(f"/cards/{card_id}/rulings")
+        except ScryfallUnavailableError:
+            return []
 
     async def enhanced_card_search(self, card_name: str, lang: str = 'en') -> Optional[CardMatch]:
         """
         Enhanced card search with multi-step fallback logic.
         1. Try exact match.
         2. Try fuzzy match.
-        3. If name is truncated, use autocomplete to find best match.
+        3. If name is truncated, use autocomplete to find best match
+           (the local prefix index answers first when card data is loaded).
         """
         start_time = time.time()
         
-        # 0. Clean the input name
-        cleaned_name = self._apply_ocr_corrections(card_name.strip())
+        # 0. Clean the input name (non-English printed names become the English name first)
+        cleaned_name = self._english_name(card_name, lang) or self._apply_ocr_corrections(card_name.strip())
+        
+        # Known-bad strings (UI text, recent failures) skip the whole fallback chain
+        negative_key = f"enhanced:{cleaned_name.lower()}"
+        if self._is_ui_string(card_name) or self._is_known_miss(negative_key):
+            logger.debug(f"Skipping known non-card string '{card_name}'")
+            return None
+        
+        # 0b. Truncated names ("Overlord of the Mis...") complete from the local prefix index
+        truncated = is_truncated(cleaned_name)
+        if truncated and self.card_index:
+            suggestions = self.card_index.complete(cleaned_name)
+            card_data = self._lookup_local(suggestions[0]) if suggestions else None
+            if card_data:
+                return CardMatch(
+                    original_name=card_name,
+                    matched_name=card_data['name'],
+                    confidence=self._calculate_match_confidence(strip_truncation(cleaned_name), card_data['name']),
+                    card_data=card_data,
+                    suggestions=suggestions,
+                    correction_applied=True
+                )
         
         # 1. First, try an exact match (highest confidence)
         card_data = await self.search_card_exact(cleaned_name)
@@ -581,14 +837,13 @@ class ScryfallService:
         card_data = await self.search_card_fuzzy(cleaned_name)
         
         # 3. Fallback logic for truncated or low-confidence names
-        is_truncated = cleaned_name.endswith('...')
         confidence_fuzzy = self._calculate_match_confidence(cleaned_name, card_data['name']) if card_data else 0
 
-        if not card_data or is_truncated or confidence_fuzzy < 85:
+        if not card_data or truncated or confidence_fuzzy < 85:
             logger.info(f"Fuzzy search failed or confidence low for '{cleaned_name}'. Trying autocomplete...")
             
             # Use autocomplete for partial/truncated names
-            autocomplete_suggestions = await self.autocomplete_card_names(cleaned_name.replace('...', ''))
+            autocomplete_suggestions = await self.autocomplete_card_names(cleaned_name)
             
             if autocomplete_suggestions:
                 best_suggestion = autocomplete_suggestions[0]
@@ -619,9 +874,30 @@ class ScryfallService:
                 correction_applied=(cleaned_name != card_name)
             )
             
+        if not self.scryfall_available:
+            # Scryfall is down: settle for the best local guess, and don't remember the miss
+            card_data = self._lookup_local_degraded(cleaned_name)
+            if card_data:
+                return CardMatch(
+                    original_name=card_name,
+                    matched_name=card_data['name'],
+                    confidence=self._calculate_match_confidence(cleaned_name, card_data['name']),
+                    card_data=card_data,
+                    correction_applied=True
+                )
+            logger.warning(f"Scryfall unavailable, no local match for '{card_name}'")
+            return None
+        
         # If all attempts fail
         logger.warning(f"Failed to find a confident match for '{card_name}'")
+        self._remember_miss(negative_key)
         return None
+    
+    @staticmethod
+    def _is_ui_string(text: str) -> bool:
+        """Interface text such as 'Best of three only' or '60/60 Cards'"""
+        normalized = ' '.join(text.lower().split())
+        return normalized in KNOWN_UI_STRINGS or bool(UI_STRING_PATTERN.match(normalized))
 
     def _calculate_match_confidence(self, original: str, matched: str) -> float:
         """Calculate confidence score using fuzzy string matching."""
@@ -659,20 +935,21 @@ class ScryfallService:
         # Detect commander
         commander = await self._detect_commander(cards)
         
+        # Legality bitmasks of the whole deck, shared by detection and checks
+        deck = DeckLegality.from_cards(cards)
+        
         # Analyze format based on deck size and composition
-        format_detected = await self._detect_format(cards, total_cards, commander)
+        format_detected = await self._detect_format(cards, total_cards, commander, deck)
         
         # Calculate color identity
         color_identity = self._calculate_color_identity(cards)
         
         # Check legality
-        legality_issues = await self._check_format_legality(cards, format_detected)
+        legality_issues = await self._check_format_legality(cards, format_detected, deck)
         
-        # Estimate tier/power level
-        estimated_tier = await self._estimate_deck_tier(cards, format_detected)
-        
-        # Estimate price
+        # Estimate price (price snapshot), then tier/power level
         price_estimate = self._estimate_deck_price(cards)
+        estimated_tier = await self._estimate_deck_tier(cards, format_detected, price_estimate)
         
         return DeckAnalysis(
             format_detected=format_detected,
@@ -708,45 +985,11 @@ class ScryfallService:
         return None
     
     async def _detect_format(self, cards: List[Dict[str, Any]], 
-                            total_cards: int, commander: Optional[Dict[str, Any]]) -> str:
-        """Detect the most likely format for this deck"""
-        
-        # Commander detection
-        if commander and total_cards == 100:
-            return 'commander'
-        elif commander and total_cards == 99:  # Commander + 99 other cards
-            return 'commander'
-        
-        # Standard constructed formats
-        if 58 <= total_cards <= 62:  # Allow for slight OCR errors
-            # Check for format-specific cards or keywords
-            for card in cards:
-                card_data = card.get('card_data')
-                if not card_data:
-                    continue
-                    
-                legalities = card_data.get('legalities', {})
-                
-                # If any card is not standard legal, it's not standard
-                if legalities.get('standard') == 'not_legal':
-                    if legalities.get('modern') == 'legal':
-                        return 'modern'
-                    elif legalities.get('legacy') == 'legal':
-                        return 'legacy'
-                    elif legalities.get('vintage') in ['legal', 'restricted']:
-                        return 'vintage'
-                    else:
-                        return 'legacy'  # Default for older cards
-            
-            return 'standard'  # All cards are standard legal
-        
-        # Other deck sizes
-        if total_cards < 40:
-            return 'limited'  # Draft/Sealed
-        elif total_cards > 100:
-            return 'casual'
-        
-        return 'unknown'
+                            total_cards: int, commander: Optional[Dict[str, Any]],
+                            deck: Optional[DeckLegality] = None) -> str:
+        """Detect the most likely format for this deck (one pass over the legality bitmasks)"""
+        deck = deck or DeckLegality.from_cards(cards)
+        return deck.detect_format(total_cards, has_commander=commander is not None)
     
     def _calculate_color_identity(self, cards: List[Dict[str, Any]]) -> List[str]:
         """Calculate the color identity of the deck"""
@@ -766,36 +1009,14 @@ class ScryfallService:
         return sorted(list(colors))
     
     async def _check_format_legality(self, cards: List[Dict[str, Any]], 
-                                    format_name: str) -> List[str]:
-        """Check format legality and return issues"""
-        issues = []
-        
-        for card in cards:
-            card_data = card.get('card_data')
-            if not card_data:
-                continue
-                
-            legalities = card_data.get('legalities', {})
-            legality = legalities.get(format_name.lower(), 'not_legal')
-            quantity = card.get('quantity', 1)
-            
-            if legality == 'banned':
-                issues.append(f"❌ {card_data['name']} is banned in {format_name}")
-            elif legality == 'restricted' and quantity > 1:
-                issues.append(f"⚠️ {card_data['name']} is restricted to 1 copy in {format_name}")
-            elif legality == 'not_legal':
-                issues.append(f"❌ {card_data['name']} is not legal in {format_name}")
-            
-            # Check quantity limits for non-basic lands
-            if format_name != 'commander' and quantity > 4:
-                type_line = card_data.get('type_line', '').lower()
-                if 'basic' not in type_line:
-                    issues.append(f"❌ Too many copies of {card_data['name']} ({quantity}/4)")
-        
-        return issues
+                                    format_name: str,
+                                    deck: Optional[DeckLegality] = None) -> List[str]:
+        """Check format legality (status, restricted and 4-copy limits) and return issues"""
+        deck = deck or DeckLegality.from_cards(cards)
+        return deck.issues(format_name)
     
     async def _estimate_deck_tier(self, cards: List[Dict[str, Any]], 
-                                 format_name: str) -> str:
+                                 format_name: str, total_price: Optional[float] = None) -> str:
         """Estimate competitive tier of the deck"""
         # This is a simplified tier estimation
         # In practice, you'd want a more sophisticated algorithm
@@ -805,28 +1026,19 @@ class ScryfallService:
         
         high_power_count = 0
         medium_power_count = 0
-        total_price = 0
+        if total_price is None:
+            total_price = self._estimate_deck_price(cards)
         
         for card in cards:
-            card_data = card.get('card_data')
-            if not card_data:
+            card_name = ((card.get('card_data') or {}).get('name') or card.get('name') or '').lower()
+            if not card_name:
                 continue
-                
-            card_name = card_data.get('name', '').lower()
             
             # Count power level indicators
             if any(keyword in card_name for keyword in high_power_keywords):
                 high_power_count += 1
             elif any(keyword in card_name for keyword in medium_power_keywords):
                 medium_power_count += 1
-            
-            # Add to price estimate
-            prices = card_data.get('prices', {})
-            if prices.get('usd'):
-                try:
-                    total_price += float(prices['usd']) * card.get('quantity', 1)
-                except (ValueError, TypeError):
-                    pass
         
         # Determine tier based on power cards and price
         if high_power_count >= 3 or total_price > 1000:
@@ -839,26 +1051,34 @@ class ScryfallService:
             return 'Tier 4 (Casual)'
     
     def _estimate_deck_price(self, cards: List[Dict[str, Any]]) -> float:
-        """Estimate total deck price in USD"""
-        total_price = 0.0
+        """
+        Estimate total deck price in USD: one vector sum over the price snapshot
+        (by printing id, else by name). Cards the snapshot cannot price fall back
+        to the `prices` of their card JSON, when it is there.
+        """
+        if self.price_table is None:
+            return round(sum(self._card_json_price(card) for card in cards), 2)
         
+        ids, names, quantities = [], [], []
         for card in cards:
-            card_data = card.get('card_data')
-            if not card_data:
-                continue
-                
-            prices = card_data.get('prices', {})
-            quantity = card.get('quantity', 1)
-            
-            if prices.get('usd'):
-                try:
-                    card_price = float(prices['usd'])
-                    total_price += card_price * quantity
-                except (ValueError, TypeError):
-                    pass
+            card_data = card.get('card_data') or {}
+            ids.append(card_data.get('id'))
+            names.append(card_data.get('name') or card.get('name'))
+            quantities.append(card.get('quantity', 1))
         
+        total_price, priced = self.price_table.deck_total(ids, names, quantities)
+        total_price += sum(self._card_json_price(card) for card, ok in zip(cards, priced) if not ok)
         return round(total_price, 2)
     
+    @staticmethod
+    def _card_json_price(card: Dict[str, Any]) -> float:
+        """USD price x quantity from a deck entry's card JSON, 0 when unknown"""
+        prices = (card.get('card_data') or {}).get('prices') or {}
+        try:
+            return float(prices['usd']) * card.get('quantity', 1) if prices.get('usd') else 0.0
+        except (ValueError, TypeError):
+            return 0.0
+    
     async def batch_validate_cards(self, card_names: List[str], 
                                   lang: str = 'en') -> List[CardMatch]:
         """
@@ -8,22 +8,107 @@ Ce module vérifie que CHAQUE carte extraite par l'OCR existe vraiment
 dans la base de données Scryfall avant de valider la liste finale.
 """
 
-import requests
-import time
-from typing import List, Dict, Optional, Tuple
+import asyncio
+from typing import Any, Awaitable, Callable, List, Dict, Optional, Tuple
 from fuzzywuzzy import fuzz
 import logging
 
+from http_client import HttpClient
+from ocr_corrections import OcrCorrectionEngine
+from scryfall_service import ScryfallService
+
 logger = logging.getLogger(__name__)
 
 class ScryfallValidator:
-    """Validateur de cartes avec l'API Scryfall"""
+    """
+    Validateur de cartes avec l'API Scryfall.
+
+    L'API asynchrone (`*_async`) passe par ScryfallService : index local et
+    caches d'abord, recherches exactes groupées par /cards/collection (75 noms
+    par requête), recherches floues concurrentes sous le même token bucket.
+    Les méthodes synchrones historiques sont une façade qui exécute la version
+    asynchrone dans une boucle privée (à ne pas appeler depuis une boucle active) ;
+    boucle, service et pool HTTP sont gardés d'un appel à l'autre jusqu'à close().
+    """
     
-    def __init__(self):
+    def __init__(self, service: Optional[ScryfallService] = None):
         self.base_url = "https://api.scryfall.com"
-        self.rate_limit_delay = 0.1  # Respect du rate limit Scryfall
-        
-    def validate_card_exact(self, card_name: str) -> Optional[Dict]:
+        self.service = service
+        self.search_limit = 10  # Résultats de recherche examinés par le fuzzy
+        self._owns_service = service is None  # un service fourni appartient à l'appelant
+        self._http_client: Optional[HttpClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # boucle de la façade synchrone
+    
+    async def _get_service(self) -> ScryfallService:
+        """Service partagé (pool HTTP, rate limiter, caches), initialisé à la demande"""
+        if self.service is None:
+            self.service = ScryfallService()
+        if self.service.session is None:
+            await self.service.__aenter__()
+        return self.service
+    
+    def _run(self, method: Callable[..., Awaitable[Any]], *args) -> Any:
+        """Façade synchrone : une seule boucle privée (et un seul service) pour tous les appels"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            if self.service is None:
+                # Pool dédié : la session partagée du bot appartient à une autre boucle
+                self._http_client = HttpClient()
+                self.service = ScryfallService(http_client=self._http_client)
+        return self._loop.run_until_complete(method(self, *args))
+    
+    async def aclose(self):
+        """Ferme le service créé par le validateur (connexion SQLite du cache, pool HTTP dédié)"""
+        if self._owns_service and self.service is not None and self.service.session is not None:
+            await self.service.__aexit__(None, None, None)
+        if self._http_client is not None:
+            await self._http_client.close()
+            self._http_client = None
+    
+    def close(self):
+        """Version synchrone de aclose(), qui ferme aussi la boucle de la façade"""
+        if self._loop is not None:
+            self._loop.run_until_complete(self.aclose())
+            self._loop.close()
+            self._loop = None
+        elif self._owns_service and self.service is not None and self.service.session is not None:
+            asyncio.run(self.aclose())
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    @staticmethod
+    def _is_exact(card_name: str, card: Dict) -> bool:
+        """Le nom lu correspond à la carte (ou à l'une de ses faces), à la casse près"""
+        wanted = card_name.strip().casefold()
+        names = [card.get('name', '')] + [face.get('name', '') for face in card.get('card_faces') or []]
+        return any(wanted == name.casefold() for name in names)
+    
+    @staticmethod
+    def _validated_entry(card: Dict, quantity: int, original_ocr: Optional[str] = None) -> Dict:
+        entry = {
+            'name': card['name'],
+            'quantity': quantity,
+            'validated': True,
+            'scryfall_id': card.get('id'),
+            'mana_cost': card.get('mana_cost', ''),
+            'type_line': card.get('type_line', ''),
+        }
+        if original_ocr is not None:
+            entry['original_ocr'] = original_ocr  # Garder le nom OCR original
+            entry['fuzzy_corrected'] = True
+        return entry
+    
+    async def validate_card_exact_async(self, card_name: str) -> Optional[Dict]:
         """
         Vérifie si une carte existe exactement dans Scryfall
         
@@ -33,27 +118,16 @@ class ScryfallValidator:
         Returns:
             Dict avec les infos de la carte ou None si non trouvée
         """
+        if not card_name.strip():
+            return None
+        service = await self._get_service()
         try:
-            response = requests.get(
-                f"{self.base_url}/cards/named",
-                params={"exact": card_name}
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                return None
-            else:
-                logger.warning(f"Erreur Scryfall {response.status_code} pour {card_name}")
-                return None
-                
+            return await service.search_card_exact(card_name)
         except Exception as e:
             logger.error(f"Erreur validation {card_name}: {e}")
             return None
-        finally:
-            time.sleep(self.rate_limit_delay)
     
-    def fuzzy_search_card(self, card_name: str, threshold: float = 0.85) -> Optional[Dict]:
+    async def fuzzy_search_card_async(self, card_name: str, threshold: float = 0.85) -> Optional[Dict]:
         """
         Recherche fuzzy d'une carte dans Scryfall
         
@@ -64,39 +138,39 @@ class ScryfallValidator:
         Returns:
             Dict avec la meilleure correspondance ou None
         """
-        try:
-            # Recherche avec le nom approximatif
-            response = requests.get(
-                f"{self.base_url}/cards/search",
-                params={"q": card_name}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('data'):
-                    # Trouver la meilleure correspondance
-                    best_match = None
-                    best_score = 0
-                    
-                    for card in data['data'][:10]:  # Limiter aux 10 premiers résultats
-                        score = fuzz.ratio(card_name.lower(), card['name'].lower()) / 100.0
-                        if score > best_score and score >= threshold:
-                            best_score = score
-                            best_match = card
-                    
-                    if best_match:
-                        logger.info(f"Fuzzy match: '{card_name}' → '{best_match['name']}' (score: {best_score:.2f})")
-                        return best_match
-            
+        if not card_name.strip():
             return None
-            
+        service = await self._get_service()
+        
+        # Correspondance locale sur l'univers complet des noms (sans réseau)
+        card_index = service.card_index
+        if card_index:
+            best = card_index.matcher.best(card_name, score_cutoff=threshold * 100)
+            if best:
+                logger.info(f"Fuzzy match local: '{card_name}' → '{best[0]}' (score: {best[1] / 100:.2f})")
+                return card_index.get_exact(best[0])
+        
+        try:
+            # Recherche avec le nom approximatif (cache, rate limit et retries du service)
+            results = await service.search_cards(card_name, limit=self.search_limit) or []
         except Exception as e:
             logger.error(f"Erreur fuzzy search {card_name}: {e}")
             return None
-        finally:
-            time.sleep(self.rate_limit_delay)
+        
+        # Trouver la meilleure correspondance
+        best_match = None
+        best_score = 0
+        for card in results:
+            score = fuzz.ratio(card_name.lower(), card['name'].lower()) / 100.0
+            if score > best_score and score >= threshold:
+                best_score = score
+                best_match = card
+        
+        if best_match:
+            logger.info(f"Fuzzy match: '{card_name}' → '{best_match['name']}' (score: {best_score:.2f})")
+        return best_match
     
-    def validate_deck_list(self, cards: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    async def validate_deck_list_async(self, cards: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
         """
         Valide une liste complète de cartes
         
@@ -106,62 +180,54 @@ class ScryfallValidator:
         Returns:
             Tuple (cartes_validées, cartes_non_trouvées)
         """
-        validated_cards = []
-        not_found_cards = []
-        
         logger.info(f"Validation de {len(cards)} cartes...")
+        service = await self._get_service()
+        names = [card.get('name', '') for card in cards]
         
+        # 1. Correspondances exactes : index local, caches, puis /cards/collection par lots
+        try:
+            resolved = await service.resolve_card_names(names, fuzzy_fallback=False)
+        except Exception as e:
+            logger.error(f"Erreur validation groupée: {e}")
+            resolved = {}
+        
+        # 2. Recherches floues concurrentes pour les seuls noms manquants
+        misses = list(dict.fromkeys(
+            name.strip() for name in names if name.strip() and not resolved.get(name.strip())
+        ))
+        fuzzy_results = await asyncio.gather(*[self.fuzzy_search_card_async(name) for name in misses])
+        fuzzy_matches = dict(zip(misses, fuzzy_results))
+        
+        validated_cards = []
+        not_found_cards = []
         for card in cards:
             card_name = card.get('name', '')
             quantity = card.get('quantity', 1)
+            key = card_name.strip()
+            match = resolved.get(key) or fuzzy_matches.get(key)
             
-            # 1. Essayer la correspondance exacte
-            exact_match = self.validate_card_exact(card_name)
-            
-            if exact_match:
-                validated_cards.append({
-                    'name': exact_match['name'],
-                    'quantity': quantity,
-                    'validated': True,
-                    'scryfall_id': exact_match.get('id'),
-                    'mana_cost': exact_match.get('mana_cost', ''),
-                    'type_line': exact_match.get('type_line', '')
-                })
+            if match and self._is_exact(card_name, match):
+                validated_cards.append(self._validated_entry(match, quantity))
                 logger.debug(f"✅ {card_name} - Validation exacte")
-                
+            elif match:
+                validated_cards.append(self._validated_entry(match, quantity, original_ocr=card_name))
+                logger.info(f"🔄 {card_name} → {match['name']} (fuzzy match)")
             else:
-                # 2. Essayer la recherche fuzzy
-                fuzzy_match = self.fuzzy_search_card(card_name)
-                
-                if fuzzy_match:
-                    validated_cards.append({
-                        'name': fuzzy_match['name'],
-                        'quantity': quantity,
-                        'validated': True,
-                        'original_ocr': card_name,  # Garder le nom OCR original
-                        'scryfall_id': fuzzy_match.get('id'),
-                        'mana_cost': fuzzy_match.get('mana_cost', ''),
-                        'type_line': fuzzy_match.get('type_line', ''),
-                        'fuzzy_corrected': True
-                    })
-                    logger.info(f"🔄 {card_name} → {fuzzy_match['name']} (fuzzy match)")
-                    
-                else:
-                    # 3. Carte non trouvée
-                    not_found_cards.append({
-                        'name': card_name,
-                        'quantity': quantity,
-                        'validated': False,
-                        'warning': 'Carte non trouvée dans Scryfall'
-                    })
-                    logger.warning(f"❌ {card_name} - Non trouvée dans Scryfall")
+                # 3. Carte non trouvée
+                not_found_cards.append({
+                    'name': card_name,
+                    'quantity': quantity,
+                    'validated': False,
+                    'warning': 'Carte non trouvée dans Scryfall'
+                })
+                logger.warning(f"❌ {card_name} - Non trouvée dans Scryfall")
         
         # Résumé
         logger.info(f"Validation terminée: {len(validated_cards)} validées, {len(not_found_cards)} non trouvées")
         
         return validated_cards, not_found_cards
     
-    def suggest_corrections(self, invalid_card_name: str, color_identity: str = None) -> List[str]:
+    async def suggest_corrections_async(self, invalid_card_name: str, color_identity: str = None) -> List[str]:
         """
         Suggère des corrections possibles pour une carte non trouvée
         
@@ -172,39 +238,43 @@ class ScryfallValidator:
         Returns:
             Liste de suggestions de noms de cartes
         """
-        suggestions = []
+        # Construire la requête de recherche
+        query_parts = []
         
+        # Extraire les mots clés du nom
+        words = invalid_card_name.split()
+        if words:
+            query_parts.append(' '.join(words[:2]))  # Premiers mots
+        
+        # Ajouter la couleur si fournie
+        if color_identity:
+            query_parts.append(f"color:{color_identity}")
+        
+        query = ' '.join(query_parts)
+        if not query:
+            return []
+        
+        service = await self._get_service()
         try:
-            # Construire la requête de recherche
-            query_parts = []
-            
-            # Extraire les mots clés du nom
-            words = invalid_card_name.split()
-            if words:
-                query_parts.append(' '.join(words[:2]))  # Premiers mots
-            
-            # Ajouter la couleur si fournie
-            if color_identity:
-                query_parts.append(f"color:{color_identity}")
-            
-            query = ' '.join(query_parts)
-            
-            response = requests.get(
-                f"{self.base_url}/cards/search",
-                params={"q": query, "limit": 5}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                for card in data.get('data', [])[:5]:
-                    suggestions.append(card['name'])
-            
+            results = await service.search_cards(query, limit=5) or []
         except Exception as e:
             logger.error(f"Erreur suggestions pour {invalid_card_name}: {e}")
-        finally:
-            time.sleep(self.rate_limit_delay)
-        
-        return suggestions
+            return []
+        return [card['name'] for card in results]
+    
+    # --- Façade synchrone (appelants existants) ---
+    
+    def validate_card_exact(self, card_name: str) -> Optional[Dict]:
+        return self._run(ScryfallValidator.validate_card_exact_async, card_name)
+    
+    def fuzzy_search_card(self, card_name: str, threshold: float = 0.85) -> Optional[Dict]:
+        return self._run(ScryfallValidator.fuzzy_search_card_async, card_name, threshold)
+    
+    def validate_deck_list(self, cards: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        return self._run(ScryfallValidator.validate_deck_list_async, cards)
+    
+    def suggest_corrections(self, invalid_card_name: str, color_identity: str = None) -> List[str]:
+        return self._run(ScryfallValidator.suggest_corrections_async, invalid_card_name, color_identity)
 
 
 # Exemples de corrections courantes
@@ -219,6 +289,12 @@ COMMON_OCR_CORRECTIONS = {
     "Momentum Break": "Moment of Craving",  # À vérifier selon le contexte
 }
 
+# Table exacte uniquement (pas de normalisation) : même moteur que ScryfallService,
+# sans mémo (un accès au dict coûte moins qu'une entrée de cache LRU)
+_COMMON_CORRECTIONS_ENGINE = OcrCorrectionEngine(
+    exact=COMMON_OCR_CORRECTIONS, digit_fixes=False, normalize_case=False, memo_size=0
+)
+
 
 def apply_common_corrections(card_name: str) -> str:
     """
@@ -230,7 +306,7 @@ def apply_common_corrections(card_name: str) -> str:
     Returns:
         Nom corrigé si trouvé dans la table, sinon le nom original
     """
-    return COMMON_OCR_CORRECTIONS.get(card_name, card_name)
+    return _COMMON_CORRECTIONS_ENGINE.correct(card_name)
 
 
 if __name__ == "__main__":
@@ -276,4 +352,6 @@ if __name__ == "__main__":
                 if suggestions:
                     print(f"  {card['quantity']}x {card['name']} → Suggestions: {', '.join(suggestions[:3])}")
                 else:
-                    print(f"  {card['quantity']}x {card['name']} - Aucune suggestion")
\ No newline at end of file
+                    print(f"  {card['quantity']}x {card['name']} - Aucune suggestion")
+    
+    validator.close()
@@ -0,0 +1,127 @@
+import json
+import threading
+import pytest
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from bulk_refresh import BulkRefresher, BulkRefreshError
+import card_index
+import price_table
+from card_index import get_shared_index
+from price_table import get_shared_prices
+
+CARDS_V1 = [{'id': 'bolt', 'name': 'Lightning Bolt', 'layout': 'normal', 'released_at': '2024-06-14',
+             'prices': {'usd': '1.50'}}]
+CARDS_V2 = CARDS_V1 + [{'id': 'kaito', 'name': 'Kaito, Bane of Nightmares', 'layout': 'normal',
+                        'released_at': '2025-02-14'}]
+
+
+class FakeScryfall:
+    """Stand-in for the bulk-data manifest and download endpoints"""
+
+    def __init__(self):
+        self.body = json.dumps(CARDS_V1).encode()
+        self.updated_at = '2025-07-01T09:00:00+00:00'
+        self.announced_size = None
+        self.downloads = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/bulk-data':
+                    payload = json.dumps({'data': [{
+                        'type': 'default_cards',
+                        'updated_at': fake.updated_at,
+                        'size': fake.announced_size or len(fake.body),
+                        'download_uri': f'http://127.0.0.1:{fake.port}/default-cards.json',
+                    }]}).encode()
+                else:
+                    fake.downloads += 1
+                    payload = fake.body
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def publish(self, cards, updated_at):
+        self.body = json.dumps(cards).encode()
+        self.updated_at = updated_at
+
+
+@pytest.fixture
+def scryfall(monkeypatch):
+    # Refreshes swap the process-wide index: restore it afterwards
+    monkeypatch.setattr(card_index, '_shared_index', None)
+    monkeypatch.setattr(card_index, '_shared_index_loaded', False)
+    monkeypatch.setattr(price_table, '_shared_prices', None)
+    monkeypatch.setattr(price_table, '_shared_prices_loaded', False)
+    fake = FakeScryfall()
+    yield fake
+    fake.server.shutdown()
+
+
+def make_refresher(scryfall, tmp_path):
+    return BulkRefresher(
+        bulk_path=str(tmp_path / 'scryfall-default-cards.json'),
+        store_path=str(tmp_path / 'scryfall-store'),
+        prices_path=str(tmp_path / 'scryfall-prices.npz'),
+        manifest_url=f'http://127.0.0.1:{scryfall.port}/bulk-data',
+    )
+
+@pytest.mark.asyncio
+async def test_downloads_only_when_manifest_changes(scryfall, tmp_path):
+    refresher = make_refresher(scryfall, tmp_path)
+
+    result = await refresher.refresh()
+    assert result['updated'] and result['cards'] == 1
+    assert scryfall.downloads == 1
+    assert get_shared_index() is result['index']
+
+    result = await refresher.refresh()
+    assert not result['updated']
+    assert scryfall.downloads == 1
+
+    old_index = get_shared_index()
+    scryfall.publish(CARDS_V2, '2025-07-02T09:00:00+00:00')
+    result = await refresher.refresh()
+    assert result['updated'] and result['cards'] == 2
+    assert scryfall.downloads == 2
+    assert get_shared_index().get_exact('Kaito, Bane of Nightmares') is not None
+    # The previous index still answers while in-flight scans finish
+    assert old_index.get_exact('Lightning Bolt')['id'] == 'bolt'
+
+@pytest.mark.asyncio
+async def test_incomplete_download_keeps_current_data(scryfall, tmp_path):
+    refresher = make_refresher(scryfall, tmp_path)
+    await refresher.refresh()
+    before = (tmp_path / 'scryfall-default-cards.json').read_bytes()
+
+    scryfall.publish(CARDS_V2, '2025-07-02T09:00:00+00:00')
+    scryfall.announced_size = 10 ** 6
+    with pytest.raises(BulkRefreshError):
+        await refresher.refresh()
+    assert (tmp_path / 'scryfall-default-cards.json').read_bytes() == before
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith('.tmp')]
+
+@pytest.mark.asyncio
+async def test_price_snapshot_follows_the_bulk_file(scryfall, tmp_path):
+    refresher = make_refresher(scryfall, tmp_path)
+    result = await refresher.refresh()
+    assert get_shared_prices() is result['prices']
+    assert result['prices'].price(card_id='bolt') == pytest.approx(1.5)
+
+    # Up-to-date snapshot: nothing rebuilt
+    assert (await refresher.refresh())['prices'] is None
+
+    # Snapshot lost or older than the bulk file: rebuilt on the next scheduled check
+    (tmp_path / 'scryfall-prices.npz').unlink()
+    assert (await refresher.refresh())['prices'].price(name='lightning bolt') == pytest.approx(1.5)
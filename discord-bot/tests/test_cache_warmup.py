@@ -0,0 +1,61 @@
+import json
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from cache_warmup import CacheWarmer, CardFrequencyLog, collect_warmup_names, load_decklist_names
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+
+def test_frequency_log_roundtrip(tmp_path):
+    path = tmp_path / 'freq.json'
+    log = CardFrequencyLog(str(path))
+    log.record(['Lightning Bolt', 'Counterspell', 'Lightning Bolt'])
+    log.save()
+
+    reloaded = CardFrequencyLog(str(path))
+    assert reloaded.most_common() == ['Lightning Bolt', 'Counterspell']
+
+def test_decklist_sources(tmp_path):
+    (tmp_path / 'deck.txt').write_text("4 Lightning Bolt\n\nSideboard\n2x Pyroblast\n")
+    (tmp_path / 'deck.json').write_text(json.dumps({
+        'mainboard': [{'name': 'Counterspell', 'quantity': 4}],
+        'sideboard': [{'name': 'Pyroblast', 'quantity': 1}],
+    }))
+    (tmp_path / 'screenshot.png').write_bytes(b'\x89PNG')
+    names = load_decklist_names([tmp_path])
+    assert set(names) == {'Lightning Bolt', 'Pyroblast', 'Counterspell'}
+
+def test_reference_deck_is_collected(tmp_path):
+    log = CardFrequencyLog(str(tmp_path / 'missing.json'))
+    log.record(['Lightning Bolt'])
+    names = collect_warmup_names(log, [os.path.join(REPO_ROOT, 'mtgo_pixie_deck_manual.json')])
+    assert names[0] == 'Lightning Bolt'
+    assert 'Nurturing Pixie' in names
+    assert len(names) == len(set(names))
+
+
+class FakeService:
+    def __init__(self):
+        self.batches = []
+
+    async def resolve_card_names(self, names, fuzzy_fallback=True):
+        self.batches.append((list(names), fuzzy_fallback))
+        return {name: ({'name': name} if name != 'Unknown' else None) for name in names}
+
+@pytest.mark.asyncio
+async def test_warmer_reports_progress(tmp_path):
+    (tmp_path / 'deck.txt').write_text("4 Lightning Bolt\n4 Counterspell\n1 Unknown\n")
+    service = FakeService()
+    warmer = CacheWarmer(service, None, [tmp_path], batch_size=2)
+    assert warmer.progress()['state'] == 'pending'
+
+    await warmer.run()
+    progress = warmer.progress()
+    assert progress['state'] == 'done'
+    assert progress['total'] == 3
+    assert progress['resolved'] == 2
+    assert progress['percent'] == 100.0
+    assert [len(b) for b, _ in service.batches] == [2, 1]
+    assert all(not fuzzy for _, fuzzy in service.batches)
@@ -0,0 +1,55 @@
+import pytest
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from card_index import LocalCardIndex, load_default_index
+from scryfall_service import ScryfallService
+
+BULK_CARDS = [
+    {'id': 'bolt-old', 'name': 'Lightning Bolt', 'layout': 'normal', 'released_at': '1993-08-05',
+     'legalities': {'modern': 'legal'}, 'prices': {'usd': '5.00'}},
+    {'id': 'bolt-new', 'name': 'Lightning Bolt', 'layout': 'normal', 'released_at': '2024-06-14',
+     'legalities': {'modern': 'legal'}, 'prices': {'usd': '1.00'}},
+    {'id': 'kaito', 'name': 'Kaito, Bane of Nightmares', 'layout': 'normal', 'released_at': '2025-02-14'},
+    {'id': 'fire-ice', 'name': 'Fire // Ice', 'layout': 'split', 'released_at': '2001-06-04',
+     'card_faces': [{'name': 'Fire'}, {'name': 'Ice'}]},
+    {'id': 'goblin-token', 'name': 'Goblin', 'layout': 'token', 'released_at': '2020-01-01'},
+]
+
+def make_index():
+    index = LocalCardIndex()
+    index.load_cards(BULK_CARDS)
+    return index
+
+def test_index_keeps_most_recent_printing():
+    index = make_index()
+    assert index.get_exact('lightning bolt')['id'] == 'bolt-new'
+    assert index.get_by_id('bolt-old') is None
+    assert 'Goblin' not in index
+
+def test_index_loose_and_face_names():
+    index = make_index()
+    assert index.get_exact('Kaito Bane of Nightmares') is None
+    assert index.get_fuzzy('Kaito Bane of Nightmares')['id'] == 'kaito'
+    assert index.get_exact('Ice')['name'] == 'Fire // Ice'
+    assert sorted(index.names()) == ['Fire // Ice', 'Kaito, Bane of Nightmares', 'Lightning Bolt']
+
+def test_load_default_index(tmp_path):
+    assert load_default_index(str(tmp_path / 'missing.json')) is None
+    bulk_path = tmp_path / 'scryfall-default-cards.json'
+    bulk_path.write_text(json.dumps(BULK_CARDS))
+    index = load_default_index(str(bulk_path))
+    assert len(index) == 3
+
+@pytest.mark.asyncio
+async def test_service_resolves_from_index_without_network():
+    service = ScryfallService(card_index=make_index())
+    # No session opened: any HTTP call would raise RuntimeError
+    exact = await service.search_card_exact('LIGHTNING BOLT')
+    fuzzy = await service.search_card_fuzzy('Kaito Bane of Nightmares')
+    by_id = await service.get_card_by_id('fire-ice')
+    assert exact['name'] == 'Lightning Bolt'
+    assert fuzzy['name'] == 'Kaito, Bane of Nightmares'
+    assert by_id['name'] == 'Fire // Ice'
+    assert service.local_hits == 3
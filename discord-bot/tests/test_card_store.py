@@ -0,0 +1,90 @@
+import json
+import math
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from card_index import iter_bulk_cards, LocalCardIndex
+from card_store import CardStore, build_card_store, open_card_store, COLOR_BITS, FORMAT_BITS
+
+BULK_CARDS = [
+    {'id': 'bolt-old', 'name': 'Lightning Bolt', 'layout': 'normal', 'released_at': '1993-08-05',
+     'cmc': 1.0, 'colors': ['R'], 'color_identity': ['R'],
+     'legalities': {'modern': 'legal', 'standard': 'not_legal'}, 'prices': {'usd': '5.00'}},
+    {'id': 'bolt-new', 'name': 'Lightning Bolt', 'layout': 'normal', 'released_at': '2024-06-14',
+     'cmc': 1.0, 'colors': ['R'], 'color_identity': ['R'],
+     'legalities': {'modern': 'legal', 'standard': 'not_legal'}, 'prices': {'usd': '1.00', 'eur': None}},
+    {'id': 'bolt-arena', 'name': 'Lightning Bolt', 'layout': 'normal', 'released_at': '2025-01-01',
+     'digital': True, 'cmc': 1.0},
+    {'id': 'kaito', 'name': 'Kaito, Bane of Nightmares', 'layout': 'normal', 'released_at': '2025-02-14',
+     'cmc': 4.0, 'colors': ['U', 'B'], 'legalities': {'standard': 'legal', 'vintage': 'restricted'}},
+    {'id': 'fable', 'name': 'Fable of the Mirror-Breaker // Reflection of Kiki-Jiki', 'layout': 'transform',
+     'released_at': '2022-02-18', 'cmc': 3.0, 'legalities': {'modern': 'banned'},
+     'card_faces': [{'name': 'Fable of the Mirror-Breaker', 'colors': ['R']},
+                    {'name': 'Reflection of Kiki-Jiki', 'colors': ['R']}]},
+    {'id': 'goblin-token', 'name': 'Goblin', 'layout': 'token', 'released_at': '2020-01-01'},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    bulk = tmp_path / 'bulk.json'
+    bulk.write_text(json.dumps(BULK_CARDS, indent=2))
+    build_card_store(str(bulk), str(tmp_path / 'store'), chunk_size=64)
+    return CardStore(str(tmp_path / 'store'))
+
+
+def test_streaming_parser_handles_small_chunks(tmp_path):
+    bulk = tmp_path / 'bulk.json'
+    bulk.write_text(json.dumps(BULK_CARDS))
+    assert list(iter_bulk_cards(str(bulk), chunk_size=7)) == BULK_CARDS
+
+def test_streaming_parser_rejects_truncated_file(tmp_path):
+    bulk = tmp_path / 'bulk.json'
+    bulk.write_text(json.dumps(BULK_CARDS)[:-40])
+    with pytest.raises(ValueError):
+        list(iter_bulk_cards(str(bulk), chunk_size=16))
+
+def test_store_lookups(store):
+    assert len(store) == 3
+    assert store.get_exact('lightning bolt')['id'] == 'bolt-new'
+    assert store.get_fuzzy('Kaito Bane of Nightmares')['id'] == 'kaito'
+    assert store.get_exact('Reflection of Kiki-Jiki')['id'] == 'fable'
+    assert store.get_by_id('kaito')['name'] == 'Kaito, Bane of Nightmares'
+    assert store.get_by_id('bolt-old') is None
+    assert store.get_exact('Goblin') is None
+    assert 'Lightning Bolt' in store
+    assert store.match('Lightnig Bolt')['id'] == 'bolt-new'
+
+def test_store_columns(store):
+    bolt = store.row_for_name('Lightning Bolt')
+    kaito = store.row_for_name('Kaito, Bane of Nightmares')
+    fable = store.row_for_name('Fable of the Mirror-Breaker')
+
+    assert store.cmc[kaito] == 4.0
+    assert store.colors[kaito] == COLOR_BITS['U'] | COLOR_BITS['B']
+    assert store.colors[fable] == COLOR_BITS['R']
+    assert store.legal[bolt] & FORMAT_BITS['modern']
+    assert not store.legal[bolt] & FORMAT_BITS['standard']
+    assert store.restricted[kaito] == FORMAT_BITS['vintage']
+    assert store.banned[fable] == FORMAT_BITS['modern']
+    assert store.prices['usd'][bolt] == pytest.approx(1.0)
+    assert math.isnan(store.prices['eur'][bolt])
+    assert store.string(int(store.set_id[bolt])) == ''
+
+def test_store_matches_in_memory_index(store, tmp_path):
+    index = LocalCardIndex()
+    index.load_cards(BULK_CARDS)
+    assert sorted(store.names()) == sorted(index.names())
+    for name in index.names():
+        assert store.get_exact(name) == index.get_exact(name)
+
+def test_rebuild_replaces_store(store, tmp_path):
+    bulk = tmp_path / 'bulk2.json'
+    bulk.write_text(json.dumps(BULK_CARDS[:1]))
+    build_card_store(str(bulk), str(tmp_path / 'store'))
+    assert len(open_card_store(str(tmp_path / 'store'))) == 1
+    # The store opened before the rebuild keeps serving from its mappings
+    assert store.get_exact('Kaito, Bane of Nightmares')['id'] == 'kaito'
+    assert not (tmp_path / 'store.new').exists()
+    assert not (tmp_path / 'store.old').exists()
@@ -0,0 +1,97 @@
+import asyncio
+import gc
+import io
+import pytest
+import warnings
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from http_client import HttpClient, HttpDownloadError, get_sync_session, sync_session_stats
+
+PAYLOAD = bytes(range(256)) * 1024  # 256 KiB
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        body = PAYLOAD if self.path == '/image.png' else b'{"ok": true}'
+        self.send_response(200 if self.path != '/missing' else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.mark.asyncio
+async def test_requests_reuse_one_connection(server):
+    client = HttpClient()
+    try:
+        for _ in range(5):
+            async with client.session.get(f'{server}/api') as response:
+                assert (await response.json())['ok']
+        stats = client.stats()
+        assert stats['requests'] == 5
+        assert stats['connections_created'] == 1
+        assert stats['connections_reused'] == 4
+        assert stats['sessions_created'] == 1
+    finally:
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_download_streams_to_file_and_enforces_limits(server):
+    client = HttpClient()
+    try:
+        out = io.BytesIO()
+        assert await client.download(f'{server}/image.png', out, chunk_size=4096) == len(PAYLOAD)
+        assert out.getvalue() == PAYLOAD
+        assert client.stats()['bytes_downloaded'] == len(PAYLOAD)
+
+        with pytest.raises(HttpDownloadError):
+            await client.download(f'{server}/image.png', io.BytesIO(), max_bytes=1024)
+        with pytest.raises(HttpDownloadError):
+            await client.download(f'{server}/missing', io.BytesIO())
+    finally:
+        await client.close()
+
+def test_blocking_callers_share_one_pooled_session(server):
+    session = get_sync_session()
+    assert get_sync_session() is session
+    before = sync_session_stats()
+    for _ in range(3):
+        assert session.get(f'{server}/api', timeout=5).json()['ok']
+    after = sync_session_stats()
+    assert after['requests'] - before['requests'] == 3
+    assert after['connections_created'] - before['connections_created'] == 1
+
+def test_session_of_a_finished_loop_is_closed(server):
+    client = HttpClient()
+
+    async def fetch():
+        async with client.session.get(f'{server}/api') as response:
+            assert (await response.json())['ok']
+        return client.session
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        first = asyncio.run(fetch())
+        second = asyncio.run(fetch())
+        assert first.closed and not second.closed
+        asyncio.run(client.close())
+        del first, second
+        gc.collect()
+    assert not [w for w in caught if 'Unclosed' in str(w.message)]
+    assert client.stats()['sessions_created'] == 2
@@ -0,0 +1,76 @@
+import json
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from card_store import CardStore, build_card_store
+from legality import DeckLegality, batch_detect_formats, batch_issue_counts
+from scryfall_service import ScryfallService
+
+BOLT = {'name': 'Lightning Bolt', 'type_line': 'Instant',
+        'legalities': {'standard': 'not_legal', 'modern': 'legal', 'legacy': 'legal', 'vintage': 'legal'}}
+KAITO = {'name': 'Kaito, Bane of Nightmares', 'type_line': 'Legendary Planeswalker — Kaito',
+         'legalities': {'standard': 'legal', 'modern': 'legal', 'vintage': 'restricted', 'commander': 'legal'}}
+FABLE = {'name': 'Fable of the Mirror-Breaker', 'type_line': 'Enchantment — Saga',
+         'legalities': {'standard': 'not_legal', 'modern': 'banned', 'legacy': 'legal'}}
+MOUNTAIN = {'name': 'Mountain', 'type_line': 'Basic Land — Mountain',
+            'legalities': {'standard': 'legal', 'modern': 'legal', 'legacy': 'legal', 'vintage': 'legal'}}
+
+
+def test_format_detection_from_bitmasks():
+    standard = DeckLegality.from_cards([{'quantity': 4, 'card_data': KAITO}, {'quantity': 56, 'card_data': MOUNTAIN}])
+    assert standard.detect_format() == 'standard'
+    modern = DeckLegality.from_cards([{'quantity': 4, 'card_data': BOLT}, {'quantity': 56, 'card_data': MOUNTAIN}])
+    assert modern.detect_format() == 'modern'
+    legacy = DeckLegality.from_cards([{'quantity': 4, 'card_data': BOLT}, {'quantity': 1, 'card_data': FABLE},
+                                      {'quantity': 55, 'card_data': MOUNTAIN}])
+    assert legacy.detect_format() == 'legacy'
+    assert legacy.detect_format(total_cards=30) == 'limited'
+    assert standard.detect_format(total_cards=100, has_commander=True) == 'commander'
+
+def test_issues_cover_status_restricted_and_copy_limits():
+    deck = DeckLegality.from_cards([
+        {'quantity': 3, 'card_data': BOLT}, {'quantity': 2, 'card_data': BOLT},
+        {'quantity': 2, 'card_data': KAITO}, {'quantity': 1, 'card_data': FABLE},
+        {'quantity': 20, 'card_data': MOUNTAIN},
+    ])
+    assert deck.issues('vintage') == [
+        "❌ Too many copies of Lightning Bolt (5/4)",
+        "⚠️ Kaito, Bane of Nightmares is restricted to 1 copy in vintage",
+        "❌ Fable of the Mirror-Breaker is not legal in vintage",
+    ]
+    assert deck.issues('modern')[-1] == "❌ Fable of the Mirror-Breaker is banned in modern"
+    assert deck.issues('limited') == ["❌ Too many copies of Lightning Bolt (5/4)"]
+    assert deck.issues('commander')[0] == "❌ Lightning Bolt is not legal in commander"
+
+@pytest.mark.asyncio
+async def test_service_uses_the_engine():
+    service = ScryfallService()
+    cards = [{'quantity': 4, 'card_data': BOLT}, {'quantity': 1, 'card_data': FABLE},
+             {'quantity': 55, 'card_data': MOUNTAIN}]
+    analysis = await service.analyze_deck_format(cards)
+    assert analysis.format_detected == 'legacy'
+    assert analysis.legality_issues == []
+    assert await service._check_format_legality(cards, 'modern') == [
+        "❌ Fable of the Mirror-Breaker is banned in modern"
+    ]
+
+def test_batch_over_many_decks(tmp_path):
+    bulk = tmp_path / 'bulk.json'
+    bulk.write_text(json.dumps([
+        dict(card, id=card['name'], layout='normal', released_at='2024-01-01')
+        for card in (BOLT, KAITO, FABLE, MOUNTAIN)
+    ]))
+    build_card_store(str(bulk), str(tmp_path / 'store'))
+    store = CardStore(str(tmp_path / 'store'))
+    bolt, kaito, fable, mountain = (store.row_for_name(c['name']) for c in (BOLT, KAITO, FABLE, MOUNTAIN))
+
+    deck_ids = [0, 0, 1, 1, 2, 2, 2, 3]
+    rows = [kaito, mountain, bolt, mountain, bolt, fable, mountain, kaito]
+    quantities = [4, 56, 4, 56, 4, 1, 55, 1]
+    assert batch_detect_formats(store, deck_ids, rows, quantities) == ['standard', 'modern', 'legacy', 'limited']
+
+    counts = batch_issue_counts(store, 'modern', deck_ids + [1], rows + [bolt], quantities + [1])
+    assert counts['banned'].tolist() == [0, 0, 1, 0]
+    assert counts['too_many'].tolist() == [0, 1, 0, 0]
+    assert counts['not_legal'].tolist() == [0, 0, 0, 0]
@@ -0,0 +1,87 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import metrics
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from scryfall_service import ScryfallService
+
+
+def sample(name, **labels):
+    return metrics.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_stage_timings_round_trip():
+    before = metrics.stage_seconds()
+    with metrics.observe_stage('parse'):
+        pass
+    metrics.observe_stages({'ocr': 1.5, 'not_a_stage': 9.0})
+    after = metrics.stage_seconds()
+    assert after['ocr'] == pytest.approx(before['ocr'] + 1.5)
+    assert after['parse'] >= before['parse']
+    assert set(after) == set(metrics.STAGES)
+    assert sample('mtg_scan_stage_seconds_bucket', stage='ocr', le='2.5') >= 1
+
+def test_collectors_are_read_at_scrape_time():
+    formats = {'mo"dern': 4}
+    metrics.add_collector('test_formats', lambda: [GaugeMetricFamily('test_formats', 'Formats', labels=['format'])])
+
+    def collect():
+        family = CounterMetricFamily('test_formats_detected', 'Formats', labels=['format'])
+        for name, count in formats.items():
+            family.add_metric([name], count)
+        yield family
+    # Re-adding a name replaces the collector
+    metrics.add_collector('test_formats', collect)
+    metrics.add_collector('test_broken', lambda: 1 / 0)
+
+    text = metrics.render().decode()
+    assert '# TYPE test_formats gauge' not in text
+    assert 'test_formats_detected_total{format="mo\\"dern"} 4.0' in text
+    formats['modern'] = 2
+    assert sample('test_formats_detected_total', format='modern') == 2
+
+def test_default_registry_reports_rss():
+    text = metrics.render().decode()
+    rss = [line for line in text.splitlines() if line.startswith('process_resident_memory_bytes ')]
+    assert rss and float(rss[0].split()[1]) > 0
+    assert metrics.process_rss_bytes(os.getpid()) > 0
+    assert metrics.process_rss_bytes(2 ** 22 + 7) == 0.0
+
+
+class CountingSession:
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, method, url, params=None, json=None, timeout=None, headers=None):
+        self.calls += 1
+        return Response()
+
+
+class Response:
+    status = 200
+
+    async def json(self):
+        return {'name': 'Lightning Bolt'}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_scryfall_requests_and_cache_are_counted():
+    service = ScryfallService()
+    service.session = CountingSession()
+    requests_before = sample('mtg_scryfall_requests_total', status='200')
+    hits_before = sample('mtg_scryfall_cache_total', result='hit')
+
+    for _ in range(3):
+        assert (await service.search_card_exact('Lightning Bolt'))['name'] == 'Lightning Bolt'
+    assert service.session.calls == 1
+    assert (service.cache_hits, service.cache_misses) == (2, 1)
+    assert len(service.timings) == 1
+    assert sample('mtg_scryfall_requests_total', status='200') == requests_before + 1
+    assert sample('mtg_scryfall_cache_total', result='hit') == hits_before + 2
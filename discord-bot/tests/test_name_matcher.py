@@ -0,0 +1,34 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from name_matcher import CardNameMatcher
+from card_index import LocalCardIndex
+from scryfall_service import ScryfallService
+
+NAMES = [
+    "Lightning Bolt", "Lightning Helix", "Counterspell", "Negate",
+    "Overlord of the Mistmoors", "Kaito, Bane of Nightmares", "Tishana's Tidebinder",
+]
+
+def test_ranked_candidates_for_ocr_typos():
+    matcher = CardNameMatcher(NAMES)
+    matches = matcher.match("Lightnig Bolt", limit=2)
+    assert matches[0][0] == "Lightning Bolt"
+    assert matches[0][1] > matches[1][1]
+    assert matcher.best("Counterspe11")[0] == "Counterspell"
+    assert matcher.best("Tishanas Tidebinder") == ("Tishana's Tidebinder", 100.0)
+
+def test_cutoff_and_partial_matching():
+    matcher = CardNameMatcher(NAMES)
+    assert matcher.best("Best of three only", score_cutoff=80) is None
+    assert matcher.best("Overlord of the Mis", score_cutoff=95, partial=True)[0] == "Overlord of the Mistmoors"
+    assert matcher.match("") == []
+
+@pytest.mark.asyncio
+async def test_service_fuzzy_search_uses_local_matcher():
+    index = LocalCardIndex()
+    index.load_cards([{'id': str(i), 'name': name} for i, name in enumerate(NAMES)])
+    service = ScryfallService(card_index=index)
+    card = await service.search_card_fuzzy("Kaito Bane of Nightmres")
+    assert card['name'] == "Kaito, Bane of Nightmares"
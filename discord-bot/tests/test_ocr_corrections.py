@@ -0,0 +1,67 @@
+import random
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from ocr_corrections import OcrCorrectionEngine, fix_digits
+from scryfall_service import ScryfallService
+import scryfall_validator
+from scryfall_validator import apply_common_corrections
+
+
+def legacy_apply_ocr_corrections(ocr_corrections, card_name):
+    """Previous ScryfallService._apply_ocr_corrections, kept as the reference"""
+    corrected = card_name.lower()
+    for wrong, correct in ocr_corrections.items():
+        if wrong in corrected:
+            corrected = corrected.replace(wrong, correct)
+    char_fixes = {'0': 'o', '1': 'l', '5': 's', '8': 'b', '6': 'g', '9': 'g'}
+    fixed_words = []
+    for word in corrected.split():
+        fixed_word = word
+        for wrong, correct in char_fixes.items():
+            if wrong in word and len(word) > 2:
+                if word.index(wrong) > 0 or word.startswith(wrong) and len(word) > 3:
+                    fixed_word = fixed_word.replace(wrong, correct)
+        fixed_words.append(fixed_word)
+    return ' '.join(word.capitalize() for word in ' '.join(fixed_words).split())
+
+
+def test_known_corrections():
+    service = ScryfallService()
+    assert service._apply_ocr_corrections('Lighming Bolt') == 'Lightning Bolt'
+    assert service._apply_ocr_corrections('FORCE OI WILL') == 'Force Of Will'
+    assert service._apply_ocr_corrections('B0lt  0f 5ilence') == 'Bolt 0f Silence'
+
+def test_digit_fixes_are_position_aware():
+    assert fix_digits('1st') == '1st'
+    assert fix_digits('a1b') == 'alb'
+    assert fix_digits('10') == '10'
+    assert fix_digits('1000') == 'looo'
+    assert fix_digits('5a5') == '5a5'
+
+def test_matches_legacy_behaviour():
+    service = ScryfallService()
+    rng = random.Random(42)
+    alphabet = 'abcdefghilmnorst 0156891'
+    samples = ['Snapcasler Mage', 'Swords fo Plowshares', 'Jace lhe Mind Sculptor',
+               'Gideon oi the Trials', 'Sol Rmg', 'Leleri, Time Raveler', '5th Dawn 1x']
+    samples += list(service.ocr_corrections)
+    samples += [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 25))) for _ in range(2000)]
+    for sample in samples:
+        assert service._apply_ocr_corrections(sample) == \
+            legacy_apply_ocr_corrections(service.ocr_corrections, sample), sample
+
+def test_memo_is_bounded():
+    engine = OcrCorrectionEngine({'lighming': 'lightning'}, memo_size=8)
+    for i in range(20):
+        engine.correct(f'lighming bolt {i}')
+    engine.correct('lighming bolt 19')
+    info = engine.cache_info()
+    assert info.currsize == 8
+    assert info.hits == 1
+
+def test_validator_exact_table():
+    assert apply_common_corrections('Armed Raptor') == 'Amped Raptor'
+    assert apply_common_corrections('armed  raptor') == 'armed  raptor'
+    # A bare table lookup is not memoized
+    assert scryfall_validator._COMMON_CORRECTIONS_ENGINE.cache_info() is None
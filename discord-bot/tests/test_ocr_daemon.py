@@ -0,0 +1,101 @@
+import asyncio
+import base64
+import glob
+import pytest
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from ocr_daemon import OcrDaemon, OcrDaemonClient, OcrDaemonError, serve_socket
+
+
+class FakeReader:
+    def __init__(self, languages):
+        self.languages = languages
+        self.calls = []
+
+    def readtext(self, path, detail=1, paragraph=False):
+        with open(path, 'rb') as f:
+            self.calls.append(f.read())
+        return [([[0, 10], [90, 10], [90, 30], [0, 30]], 'Lightning Bolt', 0.93)]
+
+
+def make_daemon(**kwargs):
+    built = []
+
+    def factory(languages, **options):
+        built.append(languages)
+        return FakeReader(languages)
+    daemon = OcrDaemon(reader_factory=factory, **kwargs)
+    return daemon, built
+
+
+@pytest.mark.asyncio
+async def test_readers_are_built_once_and_reused():
+    daemon, built = make_daemon()
+    health = (await daemon.handle({'id': 1, 'op': 'health'}))['result']
+    assert health['ready'] is False
+
+    await daemon.warm_up()
+    for i in range(3):
+        response = await daemon.handle({'id': i, 'op': 'readtext', 'image_base64': base64.b64encode(b'png').decode()})
+        assert response['ok'] and response['id'] == i
+        assert response['result']['blocks'][0]['text'] == 'Lightning Bolt'
+        assert response['result']['blocks'][0]['bbox'][2] == [90.0, 30.0]
+    assert built == [('en',)]
+    assert daemon.reader().calls == [b'png'] * 3
+    assert not glob.glob(os.path.join(tempfile.gettempdir(), 'ocr-daemon-*'))
+
+    health = (await daemon.handle({'id': 9, 'op': 'health'}))['result']
+    assert health['ready'] and health['served'] == 3 and health['readers'] == [['en']]
+
+@pytest.mark.asyncio
+async def test_errors_are_answered_not_raised():
+    daemon, _ = make_daemon()
+    await daemon.warm_up()
+    unknown = await daemon.handle({'id': 1, 'op': 'nope'})
+    assert not unknown['ok'] and 'nope' in unknown['error']
+    missing = await daemon.handle({'id': 2, 'op': 'readtext'})
+    assert not missing['ok'] and 'image' in missing['error']
+    assert daemon.failed == 1
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_answers_and_stops():
+    def factory(languages, **options):
+        raise ImportError("No module named 'easyocr'")
+    daemon = OcrDaemon(reader_factory=factory)
+    queued = asyncio.create_task(daemon.handle({'id': 1, 'op': 'readtext', 'image_base64': 'cG5n'}))
+    with pytest.raises(ImportError):
+        await daemon.warm_up()
+    response = await queued
+    assert not response['ok'] and 'easyocr' in response['error']
+    assert daemon.stopping.is_set() and not daemon.ready.is_set()
+    health = (await daemon.handle({'id': 2, 'op': 'health'}))['result']
+    assert 'easyocr' in health['warmup_error']
+
+@pytest.mark.asyncio
+async def test_max_requests_recycles_the_daemon():
+    daemon, _ = make_daemon(max_requests=2)
+    await daemon.warm_up()
+    await daemon.handle({'id': 1, 'op': 'readtext', 'image_base64': 'cG5n'})
+    assert not daemon.stopping.is_set()
+    await daemon.handle({'id': 2, 'op': 'readtext', 'image_base64': 'cG5n'})
+    assert daemon.stopping.is_set()
+
+@pytest.mark.asyncio
+async def test_unix_socket_round_trip(tmp_path):
+    daemon, _ = make_daemon()
+    path = str(tmp_path / 'ocr.sock')
+    server = await serve_socket(daemon, path)
+    await daemon.warm_up()
+    try:
+        client = OcrDaemonClient(path, timeout=10)
+        assert client.available()
+        result = await asyncio.to_thread(client.request, 'readtext', image_base64='cG5n')
+        assert result['blocks'][0]['confidence'] == pytest.approx(0.93)
+        with pytest.raises(OcrDaemonError):
+            await asyncio.to_thread(client.request, 'nope')
+    finally:
+        server.close()
+        await server.wait_closed()
+    assert not OcrDaemonClient(str(tmp_path / 'missing.sock')).available()
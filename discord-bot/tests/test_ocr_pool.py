@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import metrics
+from ocr_pool import OcrPool, OcrPoolError, OcrPoolFull, OcrTimeout
+
+# Speaks the ocr_daemon.py stdio protocol; "sleep" in the image path simulates a slow scan
+FAKE_WORKER = '''
+import json, os, sys, time
+print(json.dumps({"event": "ready", "pid": os.getpid()}), flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    image = request.get("image", "")
+    if "broken" in image:
+        response = {"id": request["id"], "ok": False, "error": "unreadable image"}
+    else:
+        delay = float(image.rsplit("sleep", 1)[1]) if "sleep" in image else 0.0
+        time.sleep(delay)
+        response = {"id": request["id"], "ok": True, "result": {
+            "text": "4 Lightning Bolt", "pid": os.getpid(), "threads": os.environ["OCR_TORCH_THREADS"],
+            "stages": {"preprocess": 0.02, "ocr": delay}}}
+    print(json.dumps(response), flush=True)
+'''
+
+
+def make_pool(**kwargs):
+    return OcrPool(command=[sys.executable, '-c', FAKE_WORKER], startup_timeout=10, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_ocr_runs_in_workers_without_blocking_the_loop():
+    pool = make_pool(workers=2, torch_threads=3)
+    ocr_before = metrics.REGISTRY.get_sample_value('mtg_scan_stage_seconds_count', {'stage': 'ocr'}) or 0
+    try:
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        beating = asyncio.create_task(heartbeat())
+        pool.start()
+        while pool.stats()['workers_ready'] < 2:
+            await asyncio.sleep(0.01)
+
+        started = time.perf_counter()
+        texts = await asyncio.gather(*(pool.extract_text(f'/tmp/deck-{i}-sleep0.3') for i in range(2)))
+        elapsed = time.perf_counter() - started
+        beating.cancel()
+
+        assert texts == ['4 Lightning Bolt'] * 2
+        assert elapsed < 0.55  # both workers busy at once
+        assert ticks >= 20  # the loop kept running meanwhile
+        assert metrics.REGISTRY.get_sample_value('mtg_scan_stage_seconds_count', {'stage': 'ocr'}) == ocr_before + 2
+        result = await pool.submit('extract_text', image='x')
+        assert result['threads'] == '3'
+        stats = pool.stats()
+        assert stats['workers_ready'] == 2 and stats['completed'] == 3 and stats['pending'] == 0
+        # Worker memory is exported per worker, read from the worker processes
+        assert set(stats['worker_rss_bytes']) == {0, 1}
+        for worker in ('0', '1'):
+            assert metrics.REGISTRY.get_sample_value('mtg_ocr_worker_resident_memory_bytes', {'worker': worker}) > 0
+    finally:
+        await pool.close()
+
+@pytest.mark.asyncio
+async def test_submissions_are_bounded():
+    pool = make_pool(workers=1, max_pending=2)
+    try:
+        await asyncio.wait_for(pool.wait_ready(), 5)
+        assert pool.stats()['workers_ready'] == 1
+        running = [asyncio.create_task(pool.submit('extract_text', image='sleep0.3')) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(OcrPoolFull):
+            await pool.submit('extract_text', image='x')
+        await asyncio.gather(*running)
+        assert pool.stats()['rejected'] == 1
+        assert (await pool.submit('extract_text', image='x'))['text']
+    finally:
+        await pool.close()
+
+@pytest.mark.asyncio
+async def test_timeout_replaces_the_stuck_worker():
+    pool = make_pool(workers=1)
+    try:
+        first_pid = (await pool.submit('extract_text', image='x'))['pid']
+        with pytest.raises(OcrTimeout):
+            await pool.submit('extract_text', timeout=0.2, image='sleep30')
+        result = await pool.submit('extract_text', image='x')
+        assert result['pid'] != first_pid
+        stats = pool.stats()
+        assert stats['timeouts'] == 1 and stats['restarts'] == 1
+
+        # An error answered by the worker keeps it
+        with pytest.raises(OcrPoolError):
+            await pool.submit('extract_text', image='broken')
+        assert (await pool.submit('extract_text', image='x'))['pid'] == result['pid']
+    finally:
+        await pool.close()
+
+@pytest.mark.asyncio
+async def test_workers_that_cannot_start_fail_wait_ready():
+    broken = 'import json, sys; print(json.dumps({"event": "error", "error": "No module named easyocr"}), flush=True); sys.exit(1)'
+    pool = OcrPool(command=[sys.executable, '-c', broken], workers=2, start_attempts=1, startup_timeout=10)
+    try:
+        with pytest.raises(OcrPoolError, match='easyocr'):
+            await asyncio.wait_for(pool.wait_ready(), 10)
+        assert 'exit code 1' in pool.stats()['startup_error']
+        with pytest.raises(OcrPoolError, match='easyocr'):
+            await pool.submit('extract_text', image='x')
+    finally:
+        await pool.close()
+
+@pytest.mark.asyncio
+async def test_start_attempts_are_bounded_and_report_stderr():
+    crashing = 'import sys; sys.stderr.write("CUDA out of memory\\n"); sys.exit(3)'
+    pool = OcrPool(command=[sys.executable, '-c', crashing], workers=1, start_attempts=2, startup_timeout=10)
+    try:
+        # A scan already waiting for a worker is released too
+        waiting = asyncio.create_task(pool.submit('extract_text', image='x'))
+        with pytest.raises(OcrPoolError, match='exit code 3.*out of memory'):
+            await asyncio.wait_for(pool.wait_ready(), 10)
+        with pytest.raises(OcrPoolError):
+            await waiting
+        assert '2 times' in pool.startup_error
+    finally:
+        await pool.close()
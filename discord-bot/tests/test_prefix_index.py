@@ -0,0 +1,66 @@
+import json
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from card_index import LocalCardIndex
+from card_store import CardStore, build_card_store
+from prefix_index import is_truncated, strip_truncation
+from scryfall_service import ScryfallService
+
+CARDS = [
+    {'id': 'mistmoors', 'name': 'Overlord of the Mistmoors', 'layout': 'normal', 'color_identity': ['W'],
+     'legalities': {'standard': 'legal', 'pioneer': 'legal'}},
+    {'id': 'hauntwoods', 'name': 'Overlord of the Hauntwoods', 'layout': 'normal', 'color_identity': ['G'],
+     'legalities': {'standard': 'legal', 'pioneer': 'legal'}},
+    {'id': 'boilerbilges', 'name': 'Overlord of the Boilerbilges', 'layout': 'normal', 'color_identity': ['R'],
+     'legalities': {'standard': 'legal'}},
+    {'id': 'kaito', 'name': 'Kaito, Bane of Nightmares', 'layout': 'normal', 'color_identity': ['U', 'B'],
+     'legalities': {'standard': 'legal'}},
+    {'id': 'fire-ice', 'name': 'Fire // Ice', 'layout': 'split', 'color_identity': ['U', 'R'],
+     'legalities': {'legacy': 'legal'}, 'card_faces': [{'name': 'Fire'}, {'name': 'Ice'}]},
+]
+
+
+def make_index():
+    index = LocalCardIndex()
+    index.load_cards(CARDS)
+    return index
+
+def test_truncation_markers():
+    assert strip_truncation("Overlord of the Mis...") == "Overlord of the Mis"
+    assert strip_truncation("Overlord of the Mis …") == "Overlord of the Mis"
+    assert is_truncated("Kaito, Bane of Nigh...")
+    assert not is_truncated("Lightning Bolt")
+
+def test_prefix_completion_and_filters():
+    index = make_index()
+    assert index.complete("Overlord of the") == [
+        'Overlord of the Boilerbilges', 'Overlord of the Hauntwoods', 'Overlord of the Mistmoors',
+    ]
+    assert index.complete("Overlord of the Mis...") == ['Overlord of the Mistmoors']
+    assert index.complete("kaito bane") == ['Kaito, Bane of Nightmares']
+    assert index.complete("Ice") == ['Fire // Ice']
+    assert index.complete("Overlord", within_colors='WU') == ['Overlord of the Mistmoors']
+    assert index.complete("Overlord", with_colors='G') == ['Overlord of the Hauntwoods']
+    assert index.complete("Overlord", formats=['pioneer'], limit=1) == ['Overlord of the Hauntwoods']
+    assert index.complete("Zzz") == []
+    assert index.complete("...") == []
+
+def test_store_prefixes_match_the_index(tmp_path):
+    bulk = tmp_path / 'bulk.json'
+    bulk.write_text(json.dumps(CARDS))
+    build_card_store(str(bulk), str(tmp_path / 'store'))
+    store = CardStore(str(tmp_path / 'store'))
+    index = make_index()
+    for prefix in ("Overlord", "fire", "Kaito Bane of Nigh..."):
+        assert store.complete(prefix) == index.complete(prefix)
+    assert store.complete("Overlord", within_colors='R', formats=['standard']) == ['Overlord of the Boilerbilges']
+
+@pytest.mark.asyncio
+async def test_truncated_names_resolve_without_network():
+    service = ScryfallService(card_index=make_index())
+    assert await service.autocomplete_card_names("Overlord of the H") == ['Overlord of the Hauntwoods']
+    match = await service.enhanced_card_search("Overlord of the Mis...")
+    assert match.matched_name == 'Overlord of the Mistmoors'
+    assert service.session is None
@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from price_table import PriceTable, build_price_table, is_stale, open_price_table
+from scryfall_service import ScryfallService
+
+BULK_CARDS = [
+    {'id': 'bolt-old', 'name': 'Lightning Bolt', 'layout': 'normal', 'released_at': '1993-08-05',
+     'prices': {'usd': '350.00'}},
+    {'id': 'bolt-new', 'name': 'Lightning Bolt', 'layout': 'normal', 'released_at': '2024-06-14',
+     'prices': {'usd': '1.25', 'eur': '1.10'}},
+    {'id': 'bolt-arena', 'name': 'Lightning Bolt', 'layout': 'normal', 'released_at': '2025-01-01',
+     'digital': True, 'prices': {'usd': None, 'tix': '0.02'}},
+    {'id': 'fable', 'name': 'Fable of the Mirror-Breaker // Reflection of Kiki-Jiki', 'layout': 'transform',
+     'released_at': '2022-02-18', 'prices': {'usd': '20.00'},
+     'card_faces': [{'name': 'Fable of the Mirror-Breaker'}, {'name': 'Reflection of Kiki-Jiki'}]},
+    {'id': 'goblin-token', 'name': 'Goblin', 'layout': 'token', 'prices': {'usd': '0.10'}},
+]
+
+
+def test_lookup_by_printing_id_then_name():
+    table = PriceTable.from_cards(BULK_CARDS)
+    assert len(table) == 4
+    assert table.price(card_id='bolt-old') == pytest.approx(350.0)
+    assert table.price(name='lightning bolt') == pytest.approx(1.25)
+    assert table.price(card_id='unknown', name='Fable of the Mirror-Breaker') == pytest.approx(20.0)
+    assert table.price(card_id='bolt-arena') is None
+    assert table.price(card_id='bolt-arena', field='tix') == pytest.approx(0.02)
+    assert table.price(name='Goblin') is None
+
+def test_deck_total_is_one_vector_sum():
+    table = PriceTable.from_cards(BULK_CARDS)
+    total, priced = table.deck_total(['bolt-new', None, None, 'bolt-arena'],
+                                     ['Lightning Bolt', 'Fable of the Mirror-Breaker', 'Forest', None],
+                                     [4, 2, 20, 1])
+    assert total == pytest.approx(4 * 1.25 + 2 * 20.0)
+    assert priced.tolist() == [True, True, False, False]
+
+def test_snapshot_round_trip_and_staleness(tmp_path):
+    bulk = tmp_path / 'bulk.json'
+    bulk.write_text(json.dumps(BULK_CARDS))
+    out = tmp_path / 'prices.npz'
+    assert is_stale(str(bulk), str(out))
+    build_price_table(str(bulk), str(out))
+    assert not is_stale(str(bulk), str(out))
+
+    table = open_price_table(str(out))
+    assert table.price(name='Reflection of Kiki-Jiki') == pytest.approx(20.0)
+    os.utime(bulk, (0, 0))
+    assert is_stale(str(bulk), str(out))
+    assert open_price_table(str(tmp_path / 'missing.npz')) is None
+
+@pytest.mark.asyncio
+async def test_deck_analysis_prices_from_the_snapshot():
+    service = ScryfallService(price_table=PriceTable.from_cards(BULK_CARDS))
+    cards = [
+        {'name': 'Lightning Bolt', 'quantity': 4},
+        {'quantity': 1, 'card_data': {'id': 'bolt-old', 'name': 'Lightning Bolt'}},
+        {'quantity': 3, 'card_data': {'name': 'Sheoldred', 'prices': {'usd': '80.00'}}},
+    ]
+    assert service._estimate_deck_price(cards) == pytest.approx(4 * 1.25 + 350.0 + 3 * 80.0)
+    assert await service._estimate_deck_tier(cards, 'modern') == 'Tier 2 (Focused)'
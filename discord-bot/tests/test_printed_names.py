@@ -0,0 +1,84 @@
+import json
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import printed_names
+from card_index import LocalCardIndex
+from deck_processor import DeckProcessor
+from printed_names import PrintedNameIndex, build_printed_names, load_default_printed_names, printed_key
+from scryfall_service import ScryfallService
+
+ALL_CARDS = [
+    {'id': 'bolt-en', 'name': 'Lightning Bolt', 'lang': 'en', 'layout': 'normal'},
+    {'id': 'bolt-fr', 'name': 'Lightning Bolt', 'lang': 'fr', 'layout': 'normal', 'printed_name': 'Foudre'},
+    {'id': 'bolt-ja', 'name': 'Lightning Bolt', 'lang': 'ja', 'layout': 'normal', 'printed_name': '稲妻'},
+    {'id': 'forest-fr', 'name': 'Forest', 'lang': 'fr', 'layout': 'normal', 'printed_name': 'Forêt'},
+    {'id': 'forest-de', 'name': 'Forest', 'lang': 'de', 'layout': 'normal', 'printed_name': 'Wald'},
+    {'id': 'fable-es', 'name': 'Fable of the Mirror-Breaker // Reflection of Kiki-Jiki', 'lang': 'es',
+     'layout': 'transform', 'card_faces': [{'printed_name': 'Fábula del Rompespejos'},
+                                           {'printed_name': 'Reflejo de Kiki-Jiki'}]},
+    {'id': 'token-fr', 'name': 'Goblin', 'lang': 'fr', 'layout': 'token', 'printed_name': 'Gobelin'},
+]
+
+
+def make_printed_names():
+    index = PrintedNameIndex()
+    index.load_cards(ALL_CARDS)
+    return index
+
+def test_printed_key_ignores_case_punctuation_and_latin_accents():
+    assert printed_key("Forêt") == printed_key("FORET") == 'foret'
+    assert printed_key("Fábula del Rompespejos,") == 'fabula del rompespejos'
+    assert printed_key("ガ") != printed_key("カ")
+
+def test_resolve_per_language():
+    index = make_printed_names()
+    assert index.resolve('foudre') == 'Lightning Bolt'
+    assert index.resolve('稲妻', lang='ja') == 'Lightning Bolt'
+    assert index.resolve('Foret', lang='de') == 'Forest'
+    assert index.resolve('Reflejo de Kiki-Jiki') == 'Fable of the Mirror-Breaker // Reflection of Kiki-Jiki'
+    assert index.resolve('Lightning Bolt') is None
+    assert index.resolve('Gobelin') is None
+    assert index.languages() == ['de', 'es', 'fr', 'ja']
+
+def test_build_save_and_load(tmp_path):
+    all_cards = tmp_path / 'all-cards.json'
+    all_cards.write_text(json.dumps(ALL_CARDS, ensure_ascii=False), encoding='utf-8')
+    out = tmp_path / 'printed-names.json'
+    built = build_printed_names(str(all_cards), str(out))
+    loaded = load_default_printed_names(str(out))
+    assert loaded.names == built.names
+    assert load_default_printed_names(str(tmp_path / 'missing.json')) is None
+
+@pytest.mark.asyncio
+async def test_service_resolves_printed_names_locally():
+    card_index = LocalCardIndex()
+    card_index.load_cards([c for c in ALL_CARDS if c['lang'] == 'en'] +
+                          [{'id': 'forest-en', 'name': 'Forest', 'layout': 'normal'}])
+    service = ScryfallService(card_index=card_index, printed_names=make_printed_names())
+    resolved = await service.resolve_card_names(['Foudre', 'Forêt', 'Wald'], lang='fr')
+    assert {name: card['name'] for name, card in resolved.items()} == {
+        'Foudre': 'Lightning Bolt', 'Forêt': 'Forest', 'Wald': 'Forest',
+    }
+    match = await service.enhanced_card_search('稲妻', lang='ja')
+    assert match.matched_name == 'Lightning Bolt'
+    assert service.session is None
+
+def test_deck_processor_basic_lands_in_any_language():
+    processor = DeckProcessor(printed_names=make_printed_names())
+    assert processor._is_basic_land('Wald')
+    assert processor._is_basic_land('Forest')
+    assert not processor._is_basic_land('Foudre')
+
+def test_deck_processor_never_loads_the_index_itself(monkeypatch):
+    def load_from_disk(*args, **kwargs):
+        raise AssertionError('printed-name index read from disk during a scan')
+    monkeypatch.setattr(printed_names, 'load_default_printed_names', load_from_disk)
+    monkeypatch.setattr(printed_names, '_shared_printed_names', None)
+    processor = DeckProcessor()
+    assert processor._is_basic_land('Forêt')
+    assert not processor._is_basic_land('Wald')
+    # Loaded at warm-up: picked up without being injected
+    monkeypatch.setattr(printed_names, '_shared_printed_names', make_printed_names())
+    assert processor._is_basic_land('Wald')
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from rate_limiter import AsyncTokenBucket
+from scryfall_service import ScryfallService
+from resilience import ScryfallUnavailableError
+
+@pytest.mark.asyncio
+async def test_concurrent_acquires_respect_rate_and_burst():
+    bucket = AsyncTokenBucket(rate=100, burst=5)
+    start = time.monotonic()
+    await asyncio.gather(*[bucket.acquire() for _ in range(15)])
+    elapsed = time.monotonic() - start
+    # 5 tokens from the burst, the other 10 at 100/s
+    assert elapsed >= 0.09
+    assert bucket.acquired == 15
+
+@pytest.mark.asyncio
+async def test_pause_blocks_every_caller():
+    bucket = AsyncTokenBucket(rate=1000, burst=10)
+    bucket.pause(0.05)
+    start = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - start >= 0.05
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def json(self):
+        return {'name': 'Lightning Bolt'}
+
+    async def text(self):
+        return ''
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def request(self, method, url, params=None, json=None, timeout=None, headers=None):
+        self.calls += 1
+        return FakeResponse(self.statuses.pop(0), {'Retry-After': '0.01'})
+
+@pytest.mark.asyncio
+async def test_rate_limited_retries_are_bounded():
+    service = ScryfallService()
+    service.session = FakeSession([429] * 10)
+    service.retry_policy.base_delay = 0.001
+    with pytest.raises(ScryfallUnavailableError):
+        await service._make_request('/cards/named', {'exact': 'x'})
+    assert service.session.calls == service.max_retries + 1
+
+@pytest.mark.asyncio
+async def test_rate_limited_request_recovers():
+    service = ScryfallService()
+    service.session = FakeSession([429, 200])
+    service.retry_policy.base_delay = 0.001
+    result = await service._make_request('/cards/named', {'exact': 'Lightning Bolt'})
+    assert result == {'name': 'Lightning Bolt'}
+    assert service.rate_limiter.acquired == 2
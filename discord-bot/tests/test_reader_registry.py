@@ -0,0 +1,56 @@
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from reader_registry import ReaderRegistry
+
+
+class SlowFactory:
+    def __init__(self):
+        self.built = []
+        self.lock = threading.Lock()
+
+    def __call__(self, languages, **options):
+        time.sleep(0.05)  # model load
+        with self.lock:
+            self.built.append((languages, options))
+        return object()
+
+
+def test_one_reader_per_language_set_and_options():
+    factory = SlowFactory()
+    registry = ReaderRegistry(factory)
+    reader = registry.get(['en'])
+    assert registry.get(['en']) is reader
+    assert registry.get(['fr', 'en']) is registry.get(['en', 'fr']) is not reader
+    assert registry.get(['en'], gpu=True) is not reader
+    assert factory.built == [(('en',), {'gpu': False, 'verbose': False}),
+                             (('en', 'fr'), {'gpu': False, 'verbose': False}),
+                             (('en',), {'gpu': True, 'verbose': False})]
+
+def test_concurrent_callers_and_preload_share_one_load():
+    factory = SlowFactory()
+    registry = ReaderRegistry(factory)
+    preload = registry.preload(['en'])
+    readers = []
+    threads = [threading.Thread(target=lambda: readers.append(registry.get(['en']))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads + [preload]:
+        thread.join()
+    assert len(factory.built) == 1
+    assert len({id(r) for r in readers}) == 1
+    assert registry.is_loaded(['en'])
+
+    [stat] = registry.stats()
+    assert stat['languages'] == ['en'] and stat['uses'] == 9
+    assert stat['load_seconds'] >= 0.05 and stat['rss_delta_bytes'] >= 0
+
+def test_load_stats_are_exported():
+    registry = ReaderRegistry(SlowFactory())
+    registry.get(['en'])
+    families = {family.name: family for family in registry.collect_metrics()}
+    assert families['mtg_ocr_readers_loaded'].samples[0].value == 1
+    [load] = families['mtg_ocr_reader_load_seconds'].samples
+    assert load.labels == {'languages': 'en'} and load.value >= 0.05
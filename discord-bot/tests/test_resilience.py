@@ -0,0 +1,164 @@
+import asyncio
+import pytest
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from resilience import CircuitBreaker, RetryPolicy, ScryfallUnavailableError
+from scryfall_service import ScryfallService
+from card_index import LocalCardIndex
+from rate_limiter import AsyncTokenBucket
+
+
+def test_decorrelated_jitter_is_bounded():
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+    delay = policy.base_delay
+    for _ in range(50):
+        delay = policy.next_delay(delay)
+        assert 0.1 <= delay <= 1.0
+
+def test_breaker_opens_then_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    # A single probe goes through once the cool-down is over
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_failed_probe_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.is_open
+    assert breaker.times_opened == 2
+
+
+class TimeoutSession:
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, method, url, params=None, json=None, timeout=None, headers=None):
+        self.calls += 1
+        raise asyncio.TimeoutError()
+
+
+class RateLimitedResponse:
+    status = 429
+    headers = {'Retry-After': '0'}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class RateLimitedSession(TimeoutSession):
+    def request(self, method, url, params=None, json=None, timeout=None, headers=None):
+        self.calls += 1
+        return RateLimitedResponse()
+
+
+class HangingResponse(RateLimitedResponse):
+    async def __aenter__(self):
+        await asyncio.sleep(3600)
+
+
+class HangingSession(TimeoutSession):
+    def request(self, method, url, params=None, json=None, timeout=None, headers=None):
+        self.calls += 1
+        return HangingResponse()
+
+
+def make_service(session=None, **kwargs):
+    service = ScryfallService(**kwargs)
+    service.session = session or TimeoutSession()
+    service.rate_limiter = AsyncTokenBucket(rate=1000.0, burst=100)
+    service.retry_policy.base_delay = 0.001
+    service.retry_policy.max_delay = 0.002
+    service.circuit_breaker.failure_threshold = 3
+    return service
+
+@pytest.mark.asyncio
+async def test_outage_trips_breaker_and_fails_fast():
+    service = make_service()
+    with pytest.raises(ScryfallUnavailableError):
+        await service._make_request('/cards/named', {'exact': 'x'})
+    # Retries stop as soon as the breaker opens
+    assert service.session.calls == 3
+    assert service.circuit_breaker.is_open
+
+    start = time.monotonic()
+    assert await service.search_card_exact('Lightning Bolt') is None
+    assert time.monotonic() - start < 0.05
+    assert service.session.calls == 3
+    assert service.fast_failures == 1
+
+@pytest.mark.asyncio
+async def test_outage_is_not_negative_cached():
+    service = make_service()
+    service.circuit_breaker.record_failure()
+    service.circuit_breaker.record_failure()
+    service.circuit_breaker.record_failure()
+    assert await service.enhanced_card_search('Lightning Bolt') is None
+    assert len(service.negative_cache) == 0
+    assert len(service.cache) == 0
+
+@pytest.mark.asyncio
+async def test_outage_falls_back_to_local_index():
+    index = LocalCardIndex()
+    index.load_cards([{'id': 'a1', 'name': 'Teferi, Time Raveler', 'layout': 'normal'}])
+    service = make_service(card_index=index)
+    service.local_fuzzy_cutoff = 99
+    for _ in range(3):
+        service.circuit_breaker.record_failure()
+    match = await service.enhanced_card_search('Tefer Time Ravelr')
+    assert match is not None
+    assert match.matched_name == 'Teferi, Time Raveler'
+
+def half_open_service(session):
+    service = make_service(session)
+    breaker = service.circuit_breaker
+    breaker.reset_timeout = 0.01
+    for _ in range(3):
+        breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    return service
+
+@pytest.mark.asyncio
+async def test_probe_spent_on_429s_reopens_instead_of_wedging():
+    service = half_open_service(RateLimitedSession())
+    with pytest.raises(ScryfallUnavailableError, match='rate limited'):
+        await service._make_request('/cards/named', {'exact': 'x'})
+    breaker = service.circuit_breaker
+    assert breaker.is_open and not breaker._probe_in_flight
+
+    # After the next cool-down a new probe is let through
+    time.sleep(0.02)
+    with pytest.raises(ScryfallUnavailableError, match='rate limited'):
+        await service._make_request('/cards/named', {'exact': 'x'})
+    assert service.fast_failures == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_breaker():
+    service = half_open_service(HangingSession())
+    probe = asyncio.create_task(service._make_request('/cards/named', {'exact': 'x'}))
+    while not service.session.calls:
+        await asyncio.sleep(0.001)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    breaker = service.circuit_breaker
+    assert breaker.is_open and not breaker._probe_in_flight
+    time.sleep(0.02)
+    assert breaker.allow_request()
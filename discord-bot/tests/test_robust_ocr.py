@@ -25,8 +25,8 @@ class TestMTGSideboardOCR:
     @pytest.fixture
     def ocr_instance(self):
         """Fixture pour créer une instance OCR avec reader mocké"""
-        with patch('robust_ocr_solution.easyocr.Reader') as mock_reader:
-            mock_reader.return_value.readtext = MagicMock()
+        with patch('robust_ocr_solution.get_reader') as mock_get_reader:
+            mock_get_reader.return_value.readtext = MagicMock()
             ocr = MTGSideboardOCR()
             return ocr
     
@@ -38,18 +38,26 @@ class TestMTGSideboardOCR:
         return img
     
     def test_initialization(self):
-        """Test l'initialisation du reader EasyOCR"""
-        with patch('robust_ocr_solution.easyocr.Reader') as mock_reader:
+        """Test l'initialisation du reader EasyOCR (partagé par le registre du processus)"""
+        with patch('robust_ocr_solution.get_reader') as mock_get_reader:
             ocr = MTGSideboardOCR()
-            mock_reader.assert_called_once_with(['en'], gpu=False, verbose=False)
-            assert ocr.reader is not None
+            mock_get_reader.assert_called_once_with(['en'])
+            assert ocr.reader is mock_get_reader.return_value
+
+    def test_initialization_with_given_reader(self):
+        """Le reader fourni (démon OCR) est réutilisé tel quel"""
+        reader = MagicMock()
+        with patch('robust_ocr_solution.get_reader') as mock_get_reader:
+            ocr = MTGSideboardOCR(reader=reader)
+            mock_get_reader.assert_not_called()
+            assert ocr.reader is reader
     
     def test_extract_sideboard_region_high_res(self, test_image):
         """Test l'extraction de la région sideboard en haute résolution"""
         with patch('cv2.imread') as mock_imread:
             mock_imread.return_value = test_image
             
-            ocr = MTGSideboardOCR()
+            ocr = MTGSideboardOCR(reader=MagicMock())
             sideboard = ocr.extract_sideboard_region('test.jpg')
             
             # Vérifier les dimensions
@@ -68,7 +76,7 @@ class TestMTGSideboardOCR:
         with patch('cv2.imread') as mock_imread:
             mock_imread.return_value = low_res_img
             
-            ocr = MTGSideboardOCR()
+            ocr = MTGSideboardOCR(reader=MagicMock())
             sideboard = ocr.extract_sideboard_region('test.jpg')
             
             # Vérifier les dimensions pour basse res
@@ -82,7 +90,7 @@ class TestMTGSideboardOCR:
         with patch('cv2.imread') as mock_imread:
             mock_imread.return_value = None
             
-            ocr = MTGSideboardOCR()
+            ocr = MTGSideboardOCR(reader=MagicMock())
             with pytest.raises(ValueError, match="Impossible de charger l'image"):
                 ocr.extract_sideboard_region('invalid.jpg')
     
@@ -252,13 +260,14 @@ class TestMainFunction:
     def test_main_with_missing_images(self, capsys):
         """Test main avec images manquantes"""
         with patch('os.path.exists') as mock_exists:
-            mock_exists.return_value = False
-            
-            from robust_ocr_solution import main
-            main()
-            
-            captured = capsys.readouterr()
-            assert "❌ Image non trouvée" in captured.out
+            with patch('robust_ocr_solution.get_reader'):
+                mock_exists.return_value = False
+                
+                from robust_ocr_solution import main
+                main()
+                
+                captured = capsys.readouterr()
+                assert "❌ Image non trouvée" in captured.out
     
     @patch('robust_ocr_solution.MTGSideboardOCR')
     def test_main_with_successful_ocr(self, mock_ocr_class, capsys):
@@ -374,7 +383,7 @@ class TestIntegration:
     
     def test_fuzzy_matching_accuracy(self):
         """Test la précision du fuzzy matching"""
-        ocr = MTGSideboardOCR()
+        ocr = MTGSideboardOCR(reader=MagicMock())
         
         test_cases = [
             ("Negat", "Negate"),  # Lettre manquante
@@ -395,7 +404,7 @@ class TestPerformance:
         """Test que le prétraitement reste rapide"""
         import time
         
-        ocr = MTGSideboardOCR()
+        ocr = MTGSideboardOCR(reader=MagicMock())
         large_image = np.ones((2160, 3840, 3), dtype=np.uint8) * 255  # 4K
         
         start = time.time()
@@ -413,7 +422,7 @@ class TestPerformance:
         process = psutil.Process(os.getpid())
         initial_memory = process.memory_info().rss / 1024 / 1024  # MB
         
-        ocr = MTGSideboardOCR()
+        ocr = MTGSideboardOCR(reader=MagicMock())
         large_image = np.ones((2160, 3840, 3), dtype=np.uint8) * 255
         
         # Traiter plusieurs fois
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import sys
 import os
@@ -21,4 +22,91 @@ async def test_enhanced_card_search():
     service = DummyScryfallService()
     result = await service.enhanced_card_search('Lighming Bolt')
     assert result.matched_name == 'Lightning Bolt'
-    assert result.correction_applied 
\ No newline at end of file
+    assert result.correction_applied 
+
+class CountingScryfallService(ScryfallService):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    async def _make_request(self, endpoint, params=None):
+        self.requests.append((endpoint, params))
+        await asyncio.sleep(0.01)
+        return {'name': params['fuzzy'].title()}
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_lookups_are_coalesced():
+    service = CountingScryfallService()
+    results = await asyncio.gather(*[
+        service.search_card_fuzzy('lightning bolt') for _ in range(5)
+    ], service.search_card_fuzzy('counterspell'))
+    assert [r['name'] for r in results[:5]] == ['Lightning Bolt'] * 5
+    assert len(service.requests) == 2
+    assert service.coalesced_requests == 4
+    # Later callers are served from cache
+    await service.search_card_fuzzy('lightning bolt')
+    assert len(service.requests) == 2
+
+
+class CollectionScryfallService(ScryfallService):
+    KNOWN = {'lightning bolt': 'Lightning Bolt', 'counterspell': 'Counterspell'}
+
+    def __init__(self):
+        super().__init__()
+        self.session = object()
+        self.batches = []
+        self.fuzzy_calls = []
+
+    async def bulk_card_lookup(self, identifiers):
+        self.batches.append(len(identifiers))
+        return [{'name': self.KNOWN[i['name'].lower()]} for i in identifiers
+                if i['name'].lower() in self.KNOWN]
+
+    async def _make_request(self, endpoint, params=None, method='GET', payload=None):
+        self.fuzzy_calls.append(params['fuzzy'])
+        return {'name': 'Lightning Bolt'} if 'bolt' in params['fuzzy'].lower() else None
+
+@pytest.mark.asyncio
+async def test_resolve_card_names_batches_and_falls_back():
+    service = CollectionScryfallService()
+    names = ['Lightning Bolt', 'Counterspell', 'Lightnin Bolt', 'Best of three only'] + \
+            [f'Filler {i}' for i in range(80)] + ['Lightning Bolt']
+    resolved = await service.resolve_card_names(names)
+    assert service.batches == [75, 8]
+    assert resolved['Lightning Bolt']['name'] == 'Lightning Bolt'
+    assert resolved['Counterspell']['name'] == 'Counterspell'
+    assert resolved['Lightnin Bolt']['name'] == 'Lightning Bolt'
+    assert resolved['Best of three only'] is None
+    assert 'Lightning Bolt' not in service.fuzzy_calls
+    # Second resolution is served from cache
+    await service.resolve_card_names(['Counterspell'])
+    assert service.batches == [75, 8]
+
+
+class MissingScryfallService(ScryfallService):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    async def _make_request(self, endpoint, params=None, method='GET', payload=None):
+        self.requests.append((endpoint, params))
+        return None
+
+@pytest.mark.asyncio
+async def test_negative_cache_short_circuits_fallback_chain():
+    service = MissingScryfallService()
+    assert await service.enhanced_card_search('Qwxz Garbled') is None
+    first_pass = len(service.requests)
+    assert first_pass >= 3
+    assert await service.enhanced_card_search('Qwxz Garbled') is None
+    assert len(service.requests) == first_pass
+    assert service.negative_hits >= 1
+    assert 'exact:qwxz garbled' not in service.cache
+
+@pytest.mark.asyncio
+async def test_ui_strings_never_reach_scryfall():
+    service = MissingScryfallService()
+    assert await service.enhanced_card_search('Best of three only') is None
+    assert await service.enhanced_card_search('60/60 Cards') is None
+    assert (await service.resolve_card_names(['Sideboard']))['Sideboard'] is None
+    assert service.requests == []
@@ -0,0 +1,61 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from scryfall_cache import BoundedTTLCache, PersistentCache, is_missing
+from scryfall_service import ScryfallService
+
+def test_cache_shared_between_connections(tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    writer = PersistentCache(path)
+    reader = PersistentCache(path)
+    writer.set('exact:lightning bolt', {'name': 'Lightning Bolt'})
+    writer.set('exact:otter token', None)
+    value, timestamp = reader.get('exact:lightning bolt')
+    assert value == {'name': 'Lightning Bolt'}
+    assert timestamp > 0
+    value, _ = reader.get('exact:otter token')
+    assert value is None and not is_missing(value)
+    assert is_missing(reader.get('exact:counterspell')[0])
+
+def test_cache_ttl_and_purge(tmp_path):
+    cache = PersistentCache(tmp_path / 'cache.sqlite3', ttl=60)
+    cache.set('old', 1, timestamp=time.time() - 120)
+    cache.set('new', 2)
+    assert is_missing(cache.get('old')[0])
+    assert cache.purge_expired() == 1
+    assert len(cache) == 1
+
+def test_service_warm_from_other_process_cache(tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    first = ScryfallService(persistent_cache=PersistentCache(path))
+    first._cache_response('fuzzy:bolt', {'name': 'Lightning Bolt'})
+
+    second = ScryfallService(persistent_cache=PersistentCache(path))
+    assert second._is_cache_valid('fuzzy:bolt')
+    assert second.cache['fuzzy:bolt'] == {'name': 'Lightning Bolt'}
+    assert second.cache.timestamp('fuzzy:bolt') == first.cache.timestamp('fuzzy:bolt')
+
+def test_bounded_cache_evicts_least_recently_used():
+    cache = BoundedTTLCache(max_bytes=30)
+    cache.set('a', 'x' * 8)  # 10 bytes of JSON
+    cache.set('b', 'y' * 8)
+    cache.set('c', 'z' * 8)
+    assert cache.get('a') == 'x' * 8  # 'a' becomes most recently used
+    cache.set('d', 'w' * 8)
+    assert 'b' not in cache
+    assert 'a' in cache and 'd' in cache
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['bytes'] == 30
+    assert stats['hits'] == 1
+
+def test_bounded_cache_expires_from_heap():
+    cache = BoundedTTLCache(ttl=60)
+    cache.set('old', 1, timestamp=time.time() - 61)
+    cache.set('replaced', 1, timestamp=time.time() - 59)
+    cache.set('replaced', 2)
+    assert 'old' not in cache
+    assert cache.get('replaced') == 2
+    assert cache.stats()['expirations'] == 1
+    assert cache.stats()['oldest_entry_age'] < 1
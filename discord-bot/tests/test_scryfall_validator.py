@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+import sqlite3
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import scryfall_validator
+from scryfall_service import ScryfallService
+from scryfall_validator import ScryfallValidator
+
+KNOWN = {f'card {i}': f'Card {i}' for i in range(80)}
+KNOWN['lightning bolt'] = 'Lightning Bolt'
+SEARCHABLE = {'armed raptor': ['Amped Raptor', 'Armored Raptor Pack'], 'otter token': ['Plumecreed Escort']}
+
+
+class FakeScryfallService(ScryfallService):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+        self.searches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        self.session = object()
+        return self
+
+    async def bulk_card_lookup(self, identifiers):
+        self.batches.append(len(identifiers))
+        return [{'id': KNOWN[i['name'].lower()].lower(), 'name': KNOWN[i['name'].lower()]}
+                for i in identifiers if i['name'].lower() in KNOWN]
+
+    async def _make_request(self, endpoint, params=None, method='GET', payload=None):
+        if endpoint == '/cards/named':
+            name = KNOWN.get(params['exact'].lower())
+            return {'id': name.lower(), 'name': name} if name else None
+        self.searches.append(params['q'])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        names = SEARCHABLE.get(params['q'].lower())
+        return {'data': [{'id': n.lower(), 'name': n} for n in names]} if names else None
+
+
+@pytest.mark.asyncio
+async def test_deck_list_batches_exact_names_and_searches_misses_concurrently():
+    service = FakeScryfallService()
+    validator = ScryfallValidator(service)
+    cards = [{'name': f'Card {i}', 'quantity': 1} for i in range(80)]
+    cards += [{'name': 'lightning bolt', 'quantity': 4}, {'name': 'Armed Raptor', 'quantity': 4},
+              {'name': 'Otter Token', 'quantity': 2}, {'name': 'Gibberish Xq', 'quantity': 1}]
+
+    started = time.perf_counter()
+    validated, not_found = await validator.validate_deck_list_async(cards)
+    assert time.perf_counter() - started < 1.0
+
+    assert service.batches == [75, 9]
+    assert sorted(service.searches) == ['Armed Raptor', 'Gibberish Xq', 'Otter Token']
+    assert service.max_in_flight > 1
+
+    by_name = {card['name']: card for card in validated}
+    assert len(validated) == 82
+    assert by_name['Lightning Bolt'] == {'name': 'Lightning Bolt', 'quantity': 4, 'validated': True,
+                                         'scryfall_id': 'lightning bolt', 'mana_cost': '', 'type_line': ''}
+    assert by_name['Amped Raptor']['original_ocr'] == 'Armed Raptor'
+    assert by_name['Amped Raptor']['fuzzy_corrected']
+    assert [card['name'] for card in not_found] == ['Otter Token', 'Gibberish Xq']
+    assert not_found[0]['validated'] is False
+
+    # A second validation is answered from the service caches
+    await validator.validate_deck_list_async(cards[:81])
+    assert service.batches == [75, 9]
+
+def test_sync_facade_runs_the_async_path(monkeypatch):
+    monkeypatch.setattr(scryfall_validator, 'ScryfallService', FakeScryfallService)
+    validator = ScryfallValidator()
+    validated, not_found = validator.validate_deck_list([{'name': 'Card 3', 'quantity': 2},
+                                                         {'name': 'Otter Token', 'quantity': 1}])
+    assert [(c['name'], c['quantity']) for c in validated] == [('Card 3', 2)]
+    assert [c['name'] for c in not_found] == ['Otter Token']
+    assert validator.validate_card_exact('LIGHTNING BOLT')['name'] == 'Lightning Bolt'
+    assert validator.validate_card_exact('Armed Raptor') is None
+    assert validator.suggest_corrections('Armed Raptor') == ['Amped Raptor', 'Armored Raptor Pack']
+
+def test_sync_facade_keeps_one_service_until_closed(monkeypatch):
+    entered = []
+
+    class CountingService(FakeScryfallService):
+        async def __aenter__(self):
+            entered.append(self)
+            return await super().__aenter__()
+    monkeypatch.setattr(scryfall_validator, 'ScryfallService', CountingService)
+
+    with ScryfallValidator() as validator:
+        for _ in range(3):
+            assert validator.validate_card_exact('Lightning Bolt')['name'] == 'Lightning Bolt'
+        assert validator.suggest_corrections('Armed Raptor')
+        assert len(entered) == 1
+        service = validator.service
+        assert service.cache_hits == 2  # the in-memory cache survives between sync calls
+    assert service.session is None and validator._loop is None
+
+@pytest.mark.asyncio
+async def test_service_closes_the_cache_it_opened(tmp_path, monkeypatch):
+    monkeypatch.setenv('SCRYFALL_CACHE_PATH', str(tmp_path / 'cache.sqlite3'))
+    service = ScryfallService(card_index=False, printed_names=False, price_table=False)
+    async with service:
+        cache = service.persistent_cache
+        assert cache is not None
+    assert service.persistent_cache is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        cache._conn.execute('SELECT 1')
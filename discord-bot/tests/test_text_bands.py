@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from text_bands import detect_text_bands, recognize_bands
+
+NAMES = ['Lightning Bolt', 'Monastery Swiftspear', 'Mountain', 'Goblin Guide', 'Eidolon of the Great Revel']
+
+
+def mtga_capture():
+    """1080p dark capture: header bar, noisy card art, and a deck list of name ... xN rows on the right"""
+    image = np.full((1080, 1920), 30, np.uint8)
+    image[100:700, 100:700] = np.random.default_rng(0).integers(0, 255, (600, 600))
+    cv2.putText(image, 'MTG ARENA', (20, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 255, 2)
+    for i, name in enumerate(NAMES):
+        y = 150 + i * 40
+        cv2.putText(image, name, (1500, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 230, 1)
+        cv2.putText(image, f'x{i + 1}', (1820, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 230, 1)
+    return image
+
+
+class FakeReader:
+    """Reads back the deck row under each crop; answers in its own order, like EasyOCR"""
+
+    def __init__(self, confidences=None):
+        self.calls = []
+        self.confidences = confidences or {}
+
+    def recognize(self, image, horizontal_list, free_list, detail, paragraph, batch_size):
+        self.calls.append((horizontal_list, batch_size))
+        results = []
+        for x_min, x_max, y_min, y_max in horizontal_list:
+            row = ((y_min + y_max) // 2 - 130) // 40
+            text = f'x{row + 1}' if x_min > 1800 else NAMES[row]
+            results.append(([[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]], text,
+                            self.confidences.get(text, 0.9)))
+        return list(reversed(results))
+
+
+def test_detects_name_and_quantity_rows_and_skips_art():
+    bands = detect_text_bands(mtga_capture())
+    rows = [band for band in bands if band.left > 1400]
+    assert len(rows) == len(NAMES)
+    assert [band.top for band in rows] == sorted(band.top for band in rows)
+    assert all(len(band.segments) == 2 and band.segments[1][0] > 1800 for band in rows)
+    # The noisy art square never turns into rows
+    assert not [band for band in bands if 100 <= band.top < 700 and band.left < 700]
+
+def test_columns_are_read_one_after_the_other():
+    image = np.full((600, 1200), 240, np.uint8)
+    for i in range(4):
+        cv2.putText(image, f'4 Main Card {i}', (50, 80 + i * 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, 0, 1)
+        cv2.putText(image, f'2 Side Card {i}', (700, 80 + i * 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, 0, 1)
+    bands = detect_text_bands(image)
+    assert [band.left < 600 for band in bands] == [True] * 4 + [False] * 4
+
+def test_unknown_layouts_fall_back():
+    assert detect_text_bands(np.zeros((400, 400), np.uint8)) == []
+    image = np.zeros((400, 400), np.uint8)
+    cv2.putText(image, 'Deck', (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 255, 1)
+    assert detect_text_bands(image) == []
+
+def test_recognizer_runs_once_over_all_crops():
+    image = mtga_capture()
+    bands = [band for band in detect_text_bands(image) if band.left > 1400]
+    reader = FakeReader()
+    lines = recognize_bands(reader, image, bands)
+    assert [text for _, text in lines] == [f'{name} x{i + 1}' for i, name in enumerate(NAMES)]
+    assert len(reader.calls) == 1 and reader.calls[0][1] == 2 * len(NAMES)
+
+def test_weak_quantity_segment_keeps_its_row():
+    image = mtga_capture()
+    bands = [band for band in detect_text_bands(image) if band.left > 1400]
+    # Like readtext(paragraph=True): no confidence for the caller to filter the whole row on
+    lines = recognize_bands(FakeReader(confidences={'Lightning Bolt': 0.45, 'x1': 0.05}), image, bands)
+    assert all(len(line) == 2 for line in lines)
+    assert lines[0][1] == 'Lightning Bolt x1'
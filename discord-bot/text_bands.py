@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+📏 Text Bands
+Classical text-row detection for deck list screenshots. Deck lists are
+regular rows of short text (quantity + card name), so instead of running
+EasyOCR's CRAFT detector over the whole capture (art, menus, header bar),
+we find the rows with OpenCV and hand only those crops to the recognizer,
+all in one batch.
+
+    bands = detect_text_bands(gray)
+    if bands:
+        results = recognize_bands(reader, gray, bands)   # [(bbox, text)]
+    else:
+        results = reader.readtext(gray, detail=1, paragraph=True)   # [(bbox, text)] too
+
+An empty list means the layout was not recognized (too few regular rows,
+or far too many) and the caller should fall back to full detection.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Any, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[int, int, int, int]  # x_min, y_min, x_max, y_max
+
+
+@dataclass
+class TextBand:
+    """One line of text: its vertical extent and the horizontal runs of text in it"""
+    top: int
+    bottom: int
+    segments: List[Tuple[int, int]] = field(default_factory=list)  # (x_min, x_max), left to right
+
+    @property
+    def height(self) -> int:
+        return self.bottom - self.top
+
+    @property
+    def left(self) -> int:
+        return self.segments[0][0]
+
+    @property
+    def right(self) -> int:
+        return self.segments[-1][1]
+
+
+def _text_boxes(gray: np.ndarray, min_height: int, max_height: int) -> List[Box]:
+    """Bounding boxes of word/line-sized blobs of strong local contrast"""
+    height, width = gray.shape[:2]
+    # Morphological gradient: strokes light-on-dark (MTGA) and dark-on-light (MTGO) alike
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, np.ones((3, 3), np.uint8))
+    _, mask = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    # Close the gaps between letters and words, never between lines
+    gap = max(5, height // 100)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (gap, 1)))
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    boxes = []
+    for x, y, w, h, _ in stats[1:count]:
+        # Art, card frames and panels are too tall; borders and separators too thin or too wide
+        if min_height <= h <= max_height and w >= h * 0.3 and w <= width * 0.9:
+            boxes.append((int(x), int(y), int(x + w), int(y + h)))
+    return boxes
+
+
+def _group_rows(boxes: List[Box], column_gap: float) -> List[TextBand]:
+    """Boxes sharing a vertical centre make a row; a wide horizontal gap starts another column"""
+    rows: List[List[Box]] = []
+    spans: List[List[int]] = []
+    for box in sorted(boxes, key=lambda b: (b[1] + b[3]) / 2):
+        centre = (box[1] + box[3]) / 2
+        if spans and spans[-1][0] <= centre <= spans[-1][1]:
+            rows[-1].append(box)
+            spans[-1] = [min(spans[-1][0], box[1]), max(spans[-1][1], box[3])]
+        else:
+            rows.append([box])
+            spans.append([box[1], box[3]])
+
+    def is_token(box: Box) -> bool:
+        # Short enough to be a quantity ("4", "x4"): it belongs with the name on its row, however far
+        return box[2] - box[0] <= (box[3] - box[1]) * 2.5
+
+    bands = []  # (column, boxes)
+    for row in rows:
+        row.sort()
+        column = 0
+        current = [row[0]]
+        for box in row[1:]:
+            row_height = max(b[3] for b in current) - min(b[1] for b in current)
+            wide_gap = box[0] - current[-1][2] > column_gap * row_height
+            if wide_gap and not is_token(box) and not is_token(current[-1]):
+                bands.append((column, current))
+                column += 1
+                current = []
+            current.append(box)
+        bands.append((column, current))
+    # Reading order: a whole column before the next one (MTGO puts the sideboard on the right)
+    bands.sort(key=lambda item: (item[0], item[1][0][1]))
+    return [TextBand(top=min(b[1] for b in band), bottom=max(b[3] for b in band),
+                     segments=[(b[0], b[2]) for b in band])
+            for _, band in bands]
+
+
+def detect_text_bands(gray: np.ndarray, min_height: int = 6, max_height: int = 0,
+                      min_rows: int = 3, max_rows: int = 150, column_gap: float = 8.0) -> List[TextBand]:
+    """
+    Text rows of a grayscale capture in reading order (column by column, top to bottom).
+
+    Rows much shorter or taller than the median row (icons, titles, stray
+    texture) are dropped. Returns [] when fewer than `min_rows` or more than
+    `max_rows` rows remain: not a deck list layout we can read row by row.
+    """
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+    max_height = max_height or max(24, gray.shape[0] // 20)
+
+    bands = _group_rows(_text_boxes(gray, min_height, max_height), column_gap)
+    if len(bands) < min_rows:
+        return []
+    typical = median(band.height for band in bands)
+    bands = [band for band in bands if typical * 0.5 <= band.height <= typical * 2.0]
+    if not min_rows <= len(bands) <= max_rows:
+        logger.debug(f"📏 {len(bands)} text rows: layout not recognized")
+        return []
+    return bands
+
+
+def _padded(band: TextBand, segment: Tuple[int, int], shape: Sequence[int]) -> List[int]:
+    """[x_min, x_max, y_min, y_max] with a margin, as EasyOCR's horizontal_list expects"""
+    pad = max(2, band.height // 3)
+    height, width = shape[:2]
+    return [max(0, segment[0] - pad), min(width, segment[1] + pad),
+            max(0, band.top - pad), min(height, band.bottom + pad)]
+
+
+def recognize_bands(reader: Any, image: np.ndarray, bands: List[TextBand]) -> List[Tuple[Any, str]]:
+    """
+    Run only the recognizer over the band crops, in one batch (no CRAFT detection).
+
+    Returns one (bbox, text) per band, like readtext(paragraph=True) which it
+    stands in for: the segments of a band are joined left to right. There is
+    no confidence, so callers keep every row as they keep every paragraph; a
+    weak segment (often the short "x4") never drops the name beside it.
+    Bands the recognizer found nothing in are left out.
+    """
+    boxes = []  # (band index, [x_min, x_max, y_min, y_max])
+    for index, band in enumerate(bands):
+        for segment in band.segments:
+            boxes.append((index, _padded(band, segment, image.shape)))
+    if not boxes:
+        return []
+
+    results = reader.recognize(image, horizontal_list=[box for _, box in boxes], free_list=[],
+                               detail=1, paragraph=False, batch_size=len(boxes))
+
+    # EasyOCR sorts its output by position: map each result back to its crop by centre
+    centres = np.array([((b[0] + b[1]) / 2, (b[2] + b[3]) / 2) for _, b in boxes])
+    found: List[List[Tuple[float, str]]] = [[] for _ in bands]
+    for bbox, text, _ in results:
+        points = np.asarray(bbox, dtype=float)
+        centre = points.mean(axis=0)
+        index = boxes[int(np.argmin(((centres - centre) ** 2).sum(axis=1)))][0]
+        if text.strip():
+            found[index].append((points[:, 0].min(), text.strip()))
+
+    lines = []
+    for band, parts in zip(bands, found):
+        if not parts:
+            continue
+        parts.sort()
+        bbox = [[band.left, band.top], [band.right, band.top], [band.right, band.bottom], [band.left, band.bottom]]
+        lines.append((bbox, ' '.join(text for _, text in parts)))
+    return lines
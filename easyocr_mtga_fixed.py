@@ -11,7 +11,11 @@ import tempfile
 import os
 import cv2
 import numpy as np
-import easyocr
+
+# Client léger du démon OCR (reader déjà chargé)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discord-bot'))
+from ocr_daemon import request_via_daemon
+from reader_registry import get_reader
 
 def extract_deck_list_zone(image_path):
     """
@@ -46,9 +50,10 @@ def extract_deck_list_zone(image_path):
     
     return processed
 
-def process_with_easyocr(image_path):
+def process_with_easyocr(image_path, reader=None):
     """
     Process avec EasyOCR en ciblant la zone correcte
+    (reader : lecteur EasyOCR déjà chargé, sinon créé ici)
     """
     result = {
         "mainboard": [],
@@ -64,8 +69,9 @@ def process_with_easyocr(image_path):
             print("Failed to extract deck zone", file=sys.stderr)
             return result
         
-        # Initialiser EasyOCR
-        reader = easyocr.Reader(['en'], gpu=False)
+        # Lecteur EasyOCR partagé (chargé une seule fois par processus)
+        if reader is None:
+            reader = get_reader(['en'])
         
         # Lire le texte de la zone extraite
         results = reader.readtext(deck_zone, detail=1, paragraph=False)
@@ -180,6 +186,12 @@ def main():
             print(json.dumps({"mainboard": [], "sideboard": [], "error": "No input data"}))
             sys.exit(1)
         
+        # Démon OCR actif (OCR_DAEMON_SOCKET) : seulement le temps d'inférence
+        result = request_via_daemon('mtga_zone', image_base64=base64_data)
+        if result is not None:
+            print(json.dumps(result))
+            return
+        
         # Décoder base64 vers image
         image_data = base64.b64decode(base64_data)
         
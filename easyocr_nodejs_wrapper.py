@@ -21,14 +21,13 @@ logging.basicConfig(level=logging.ERROR)
 
 async def process_image(image_path):
     """Process the image and return the parsed cards"""
-    # Initialize services
-    scryfall_service = ScryfallService()
-    
-    # Initialize parser with Scryfall service
-    parser = MTGOCRParser(scryfall_service)
-    
-    # Process image using the async method
-    result = await parser.parse_deck_image(image_path)
+    # Initialize services (opens the HTTP session and the shared disk cache)
+    async with ScryfallService() as scryfall_service:
+        # Initialize parser with Scryfall service
+        parser = MTGOCRParser(scryfall_service)
+        
+        # Process image using the async method
+        result = await parser.parse_deck_image(image_path)
     
     return result
 
@@ -16,10 +16,8 @@ from pathlib import Path
 # Ajouter le répertoire discord-bot au path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'discord-bot'))
 
-# Import des modules Discord bot
-from ocr_parser_easyocr import MTGOCRParser, UltraAdvancedOCR
-from scryfall_service import ScryfallService
-from deck_processor import DeckProcessor
+# Client léger du démon OCR (readers déjà chargés) ; les modules lourds ne sont importés qu'en repli local
+from ocr_daemon import request_via_daemon
 
 async def process_with_easyocr(image_path):
     """
@@ -33,6 +31,9 @@ async def process_with_easyocr(image_path):
     }
     
     try:
+        from ocr_parser_easyocr import MTGOCRParser
+        from scryfall_service import ScryfallService
+        
         # Initialize services
         scryfall_service = ScryfallService()
         await scryfall_service.__aenter__()
@@ -97,6 +98,12 @@ def main():
             print(json.dumps({"mainboard": [], "sideboard": [], "error": "No input data"}))
             sys.exit(1)
         
+        # Démon OCR actif (OCR_DAEMON_SOCKET) : seulement le temps d'inférence
+        result = request_via_daemon('deck', image_base64=base64_data)
+        if result is not None:
+            print(json.dumps(result))
+            return
+        
         # Decode base64 to image
         image_data = base64.b64decode(base64_data)
         
@@ -3,16 +3,19 @@
 OCR complet pour extraire TOUTES les cartes (mainboard + sideboard)
 """
 import cv2
-import easyocr
 import numpy as np
 import json
+import os
 import sys
 from fuzzywuzzy import fuzz, process
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discord-bot'))
+from reader_registry import get_reader
+
 class FullDeckOCR:
     def __init__(self):
         print("🔧 Initialisation EasyOCR...", file=sys.stderr)
-        self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        self.reader = get_reader(['en'])  # lecteur partagé, chargé une fois par processus
         
     def extract_mainboard(self, img):
         """Extrait les cartes du mainboard (partie gauche/centre)"""
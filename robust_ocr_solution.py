@@ -4,13 +4,17 @@ Solution robuste pour OCR du sideboard MTG Arena
 Utilise EasyOCR avec prétraitement optimisé et corrections intelligentes
 """
 import cv2
-import easyocr
 import numpy as np
-from fuzzywuzzy import fuzz, process
 import json
 import sys
 import os
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discord-bot'))
+from name_matcher import CardNameMatcher
+from card_index import get_shared_index
+from ocr_daemon import request_via_daemon
+from reader_registry import get_reader
+
 # Base de données de cartes MTG communes pour corrections
 MTG_CARDS_DB = [
     # Sideboard cartes communes
@@ -26,11 +30,21 @@ MTG_CARDS_DB = [
     "Snapcaster Mage", "Liliana of the Veil", "Jace, the Mind Sculptor"
 ]
 
+# Matcher partagé : univers complet des noms si le store colonnaire ou le bulk
+# Scryfall est présent, sinon la liste ci-dessus
+_FALLBACK_MATCHER = CardNameMatcher(MTG_CARDS_DB)
+
+
+def get_card_matcher():
+    # Index partagé du processus : le store pré-construit (card_store.py) s'il existe, le bulk sinon
+    card_index = get_shared_index()
+    return card_index.matcher if card_index else _FALLBACK_MATCHER
+
+
 class MTGSideboardOCR:
-    def __init__(self):
-        """Initialise le reader EasyOCR une seule fois"""
-        print("🔧 Initialisation EasyOCR...", file=sys.stderr)
-        self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+    def __init__(self, reader=None):
+        """Réutilise le reader EasyOCR partagé du processus (ou celui donné par le démon OCR)"""
+        self.reader = reader if reader is not None else get_reader(['en'])
         
     def extract_sideboard_region(self, image_path):
         """Extrait précisément la région du sideboard"""
@@ -127,15 +141,16 @@ class MTGSideboardOCR:
             return None, 0
             
         # Chercher la meilleure correspondance
-        match = process.extractOne(cleaned, MTG_CARDS_DB, scorer=fuzz.ratio)
+        matcher = get_card_matcher()
+        match = matcher.best(cleaned, score_cutoff=threshold)
         
-        if match and match[1] >= threshold:
+        if match:
             return match[0], match[1]
             
         # Essayer avec ratio partiel pour les noms tronqués
-        match = process.extractOne(cleaned, MTG_CARDS_DB, scorer=fuzz.partial_ratio)
+        match = matcher.best(cleaned, score_cutoff=threshold, partial=True)
         
-        if match and match[1] >= threshold:
+        if match:
             return match[0], match[1]
             
         # Si toujours pas de match, garder l'original si assez long
@@ -305,8 +320,15 @@ def main():
 
 def process_for_nodejs():
     """Point d'entrée pour le serveur Node.js"""
-    if len(sys.argv) > 1:
-        image_path = sys.argv[1]
+    image_args = [arg for arg in sys.argv[1:] if arg != '--nodejs']
+    if image_args:
+        image_path = image_args[0]
+        
+        # Démon OCR actif (OCR_DAEMON_SOCKET) : seulement le temps d'inférence
+        result = request_via_daemon('sideboard', image=os.path.abspath(image_path))
+        if result is not None:
+            print(json.dumps(result))
+            return
         
         ocr = MTGSideboardOCR()
         result = ocr.process_multiple_passes(image_path)
@@ -320,6 +342,11 @@ def process_for_nodejs():
         import io
         
         base64_data = sys.stdin.read().strip()
+        result = request_via_daemon('sideboard', image_base64=base64_data)
+        if result is not None:
+            print(json.dumps(result))
+            return
+        
         img_data = base64.b64decode(base64_data)
         img = Image.open(io.BytesIO(img_data))
         
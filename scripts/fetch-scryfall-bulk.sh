@@ -4,7 +4,7 @@ set -euo pipefail
 TARGET_DIR=${1:-data}
 mkdir -p "$TARGET_DIR"
 
-echo "Downloading Scryfall bulk default-cards..."
-curl -s https://api.scryfall.com/bulk-data | jq -r '.data[] | select(.type=="default_cards").download_uri' | xargs curl -L -o "$TARGET_DIR/scryfall-default-cards.json"
-
-echo "Saved to $TARGET_DIR/scryfall-default-cards.json"
+# Downloads default-cards only when the bulk-data manifest changed (updated_at/size),
+# then rebuilds the columnar card store ($TARGET_DIR/scryfall-store).
+echo "Refreshing Scryfall bulk default-cards..."
+python3 "$(dirname "$0")/../discord-bot/bulk_refresh.py" --data-dir "$TARGET_DIR" "${@:2}"
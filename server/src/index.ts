@@ -13,6 +13,7 @@ import { errorHandler } from './middleware/errorHandler';
 import { validateEnv } from './utils/validateEnv';
 import routes from './routes';
 import { initOcrWorker } from './queue/ocr.queue';
+import ocrDaemon from './services/ocrDaemon';
 import clientProm from 'prom-client';
 // Type-only imports to avoid missing @types issues at runtime
 import swaggerUi from 'swagger-ui-express';
@@ -87,6 +88,7 @@ app.get('/health', (req, res) => {
     timestamp: new Date().toISOString(),
     uptime: process.uptime(),
     environment: (process.env as any)['NODE_ENV'] || 'development',
+    ocrDaemon: ocrDaemon.status(),
   });
 });
 
@@ -128,6 +130,12 @@ app.use('*', (req, res) => {
 // Global error handler
 app.use(errorHandler);
 
+// Warm the OCR daemon in the background so the first scan does not pay the model load
+// (it exits on its own when this process goes away and its stdin closes)
+if (ocrDaemon.isEnabled()) {
+  ocrDaemon.waitUntilReady().catch((error) => console.warn('OCR daemon warm-up failed:', error.message));
+}
+
 // Start server
 app.listen(Number(PORT), HOST, () => {
   console.log(`🚀 MTG Deck Converter Server running on port ${PORT}`);
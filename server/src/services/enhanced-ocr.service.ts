@@ -4,6 +4,7 @@ import OpenAI from "openai";
 import { join } from "path";
 import sharp from "sharp";
 import scryfallService from "./scryfallService";
+import ocrDaemon from "./ocrDaemon";
 
 interface CardRecognitionResult {
   name: string;
@@ -181,6 +182,32 @@ export class EnhancedOCRService {
    * Wrapper pour appeler votre script Python EasyOCR existant
    */
   private async callPythonEasyOCR(imagePath: string): Promise<any> {
+    // Démon OCR (reader déjà chargé) : le nom est le bloc le plus haut de la carte
+    if (ocrDaemon.isEnabled()) {
+      try {
+        const { blocks } = await ocrDaemon.request("readtext", { image: imagePath }, 30000);
+        const top = (block: any) => Math.min(...block.bbox.map((point: number[]) => point[1]));
+        const ordered = [...blocks].sort((a: any, b: any) => top(a) - top(b));
+        const nameBlock = ordered.find((block: any) => block.text.trim().length >= 3) || ordered[0];
+        return {
+          bestCardName: nameBlock ? nameBlock.text.trim() : "",
+          confidence: nameBlock ? nameBlock.confidence : 0,
+          totalBlocks: blocks.length,
+          fullText: ordered.map((block: any) => block.text).join(" "),
+        };
+      } catch (error) {
+        // Démon en redémarrage, indisponible ou trop lent : on repasse par le script
+        console.warn("⚠️ OCR daemon failed, spawning the EasyOCR script:", (error as Error).message);
+      }
+    }
+
+    return this.callPythonEasyOCRScript(imagePath);
+  }
+
+  /**
+   * Script EasyOCR ponctuel (interpréteur + modèles chargés à chaque appel)
+   */
+  private callPythonEasyOCRScript(imagePath: string): Promise<any> {
     return new Promise((resolve, reject) => {
       // Appelle le wrapper EasyOCR optimisé
       const pythonProcess = spawn("python3", [
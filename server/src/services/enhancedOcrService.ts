@@ -6,6 +6,7 @@ import { spawn } from 'child_process';
 import { MTGCard, OCRResult } from '../types';
 import { createError } from '../middleware/errorHandler';
 import mtgoCorrector from './mtgoLandCorrector';
+import ocrDaemon from './ocrDaemon';
 
 /**
  * Enhanced OCR Service implementing ALL methods from MASTER_OCR_RULES_AND_METHODOLOGY.md
@@ -102,6 +103,18 @@ export class EnhancedOCRService {
   private async applySuperResolution(imagePath: string): Promise<string> {
     const outputPath = imagePath.replace(/\.(jpg|jpeg|png|webp)$/i, '_upscaled.png');
     
+    // Warm OCR daemon first (no interpreter/OpenCV start-up per image)
+    if (ocrDaemon.isEnabled()) {
+      try {
+        await ocrDaemon.request('super_resolution', { image: imagePath, output: outputPath });
+        if (fs.existsSync(outputPath)) {
+          return outputPath;
+        }
+      } catch (error) {
+        console.warn('⚠️ OCR daemon super-resolution failed:', (error as Error).message);
+      }
+    }
+    
     // Use Python script for advanced upscaling
     return new Promise((resolve, reject) => {
       const scriptPath = path.join(__dirname, '../../../super_resolution_free.py');
@@ -201,6 +214,21 @@ export class EnhancedOCRService {
    * Try EasyOCR with optional enhancement
    */
   private async tryEasyOCR(imagePath: string, enhanced: boolean): Promise<OCRResult> {
+    // Warm OCR daemon: same pipelines, readers already loaded
+    if (ocrDaemon.isEnabled()) {
+      try {
+        const result = await ocrDaemon.request(enhanced ? 'sideboard' : 'deck', { image: imagePath });
+        return {
+          success: true,
+          cards: this.parseMTGOResult(result),
+          confidence: 0.7,
+          processing_time: 0
+        };
+      } catch (error) {
+        console.warn('⚠️ OCR daemon failed, spawning the EasyOCR script:', (error as Error).message);
+      }
+    }
+
     return new Promise((resolve, reject) => {
       const scriptPath = enhanced 
         ? path.join(__dirname, '../../../robust_ocr_solution.py')
@@ -0,0 +1,243 @@
+import { spawn, ChildProcess } from 'child_process';
+import readline from 'readline';
+import path from 'path';
+import fs from 'fs';
+
+/**
+ * Supervisor for the persistent Python OCR worker (discord-bot/ocr_daemon.py).
+ *
+ * The daemon loads torch and the EasyOCR readers once; requests are JSON lines
+ * on its stdin/stdout, so each OCR call costs inference time only instead of
+ * a fresh interpreter + model load. The process is restarted with backoff if
+ * it dies (or recycles itself after OCR_DAEMON_MAX_REQUESTS).
+ */
+
+export type OcrDaemonOp = 'readtext' | 'deck' | 'mtga_zone' | 'sideboard' | 'super_resolution';
+
+interface PendingRequest {
+  resolve: (result: any) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+export interface OcrDaemonStatus {
+  enabled: boolean;
+  running: boolean;
+  ready: boolean;
+  pid: number | null;
+  restarts: number;
+  pending: number;
+  lastError: string | null;
+}
+
+const DAEMON_SCRIPT = path.join(__dirname, '../../../discord-bot/ocr_daemon.py');
+const MIN_BACKOFF_MS = 1000;
+const MAX_BACKOFF_MS = 30000;
+const DEFAULT_TIMEOUT_MS = 120000;
+
+export class OcrDaemon {
+  private child: ChildProcess | null = null;
+  private pending: Map<number, PendingRequest> = new Map();
+  private nextId = 1;
+  private ready = false;
+  private readyPromise: Promise<void> | null = null;
+  private markReady: (() => void) | null = null;
+  private markFailed: ((error: Error) => void) | null = null;
+  private restarts = 0;
+  private backoffMs = MIN_BACKOFF_MS;
+  private restartTimer: NodeJS.Timeout | null = null;
+  private lastError: string | null = null;
+  private stopped = false;
+  private readonly python: string;
+  private readonly enabled: boolean;
+
+  constructor() {
+    this.python = process.env.OCR_DAEMON_PYTHON || 'python3';
+    this.enabled = process.env.OCR_DAEMON_ENABLED !== 'false' && fs.existsSync(DAEMON_SCRIPT);
+  }
+
+  isEnabled(): boolean {
+    return this.enabled && !this.stopped;
+  }
+
+  /**
+   * Start the daemon if needed and wait until its readers are warm
+   */
+  async waitUntilReady(timeoutMs: number = DEFAULT_TIMEOUT_MS): Promise<void> {
+    if (!this.isEnabled()) {
+      throw new Error('OCR daemon disabled');
+    }
+    if (!this.child) {
+      if (this.restartTimer) {
+        // Backing off after a crash: callers fall back to their one-shot scripts meanwhile
+        throw new Error(`OCR daemon restarting (${this.lastError})`);
+      }
+      this.start();
+    }
+    if (this.ready) {
+      return;
+    }
+    let timer: NodeJS.Timeout | undefined;
+    const timeout = new Promise<never>((_, reject) => {
+      timer = setTimeout(() => reject(new Error('OCR daemon not ready in time')), timeoutMs);
+    });
+    try {
+      await Promise.race([this.readyPromise, timeout]);
+    } finally {
+      clearTimeout(timer);
+    }
+  }
+
+  /**
+   * Send one request; resolves with the op result, rejects on daemon error/timeout
+   */
+  async request<T = any>(op: OcrDaemonOp, payload: Record<string, any>, timeoutMs: number = DEFAULT_TIMEOUT_MS): Promise<T> {
+    const startTime = Date.now();
+    await this.waitUntilReady(timeoutMs);
+    const child = this.child;
+    if (!child || !child.stdin || !child.stdin.writable) {
+      throw new Error('OCR daemon not running');
+    }
+
+    const id = this.nextId++;
+    const remaining = Math.max(1000, timeoutMs - (Date.now() - startTime));
+    return new Promise<T>((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`OCR daemon ${op} timed out after ${timeoutMs}ms`));
+      }, remaining);
+      this.pending.set(id, { resolve, reject, timer });
+      child.stdin!.write(JSON.stringify({ id, op, ...payload }) + '\n');
+    });
+  }
+
+  status(): OcrDaemonStatus {
+    return {
+      enabled: this.isEnabled(),
+      running: !!this.child,
+      ready: this.ready,
+      pid: this.child?.pid ?? null,
+      restarts: this.restarts,
+      pending: this.pending.size,
+      lastError: this.lastError,
+    };
+  }
+
+  stop(): void {
+    this.stopped = true;
+    if (this.restartTimer) {
+      clearTimeout(this.restartTimer);
+      this.restartTimer = null;
+    }
+    if (this.child) {
+      this.child.kill('SIGTERM');
+    }
+  }
+
+  private start(): void {
+    this.ready = false;
+    this.readyPromise = new Promise<void>((resolve, reject) => {
+      this.markReady = resolve;
+      this.markFailed = reject;
+    });
+    // Nobody may be waiting when the daemon dies during warm-up
+    this.readyPromise.catch(() => undefined);
+
+    const args = [DAEMON_SCRIPT, '--stdio'];
+    if (process.env.OCR_DAEMON_SOCKET) {
+      args.push('--socket', process.env.OCR_DAEMON_SOCKET);
+    }
+    console.log('🛰️ Starting OCR daemon...');
+    const child = spawn(this.python, args, { stdio: ['pipe', 'pipe', 'pipe'] });
+    this.child = child;
+
+    readline.createInterface({ input: child.stdout!, crlfDelay: Infinity })
+      .on('line', (line) => this.onLine(line));
+    child.stderr!.on('data', (data) => {
+      process.stderr.write(`[ocr-daemon] ${data}`);
+    });
+    child.on('error', (error) => {
+      this.lastError = error.message;
+      console.error('❌ OCR daemon failed to start:', error.message);
+      // A spawn failure (bad OCR_DAEMON_PYTHON, no python3) emits 'error' and 'close' but never 'exit'
+      this.onExit(child, null, null);
+    });
+    child.on('exit', (code, signal) => this.onExit(child, code, signal));
+  }
+
+  private onLine(line: string): void {
+    let message: any;
+    try {
+      message = JSON.parse(line);
+    } catch {
+      console.warn('⚠️ OCR daemon wrote a non-JSON line:', line.slice(0, 200));
+      return;
+    }
+
+    if (message.event === 'ready') {
+      this.ready = true;
+      this.backoffMs = MIN_BACKOFF_MS;
+      console.log(`✅ OCR daemon ready (pid ${message.pid}, warm-up ${message.warmup_seconds}s)`);
+      this.markReady?.();
+      return;
+    }
+
+    if (message.event === 'error') {
+      // Warm-up failed (missing models, import error...): the daemon exits non-zero and onExit backs off
+      this.lastError = message.error || 'OCR daemon warm-up failed';
+      console.error(`❌ OCR daemon warm-up failed: ${this.lastError}`);
+      return;
+    }
+
+    const entry = this.pending.get(message.id);
+    if (!entry) {
+      return;
+    }
+    this.pending.delete(message.id);
+    clearTimeout(entry.timer);
+    if (message.ok) {
+      entry.resolve(message.result);
+    } else {
+      entry.reject(new Error(message.error || 'OCR daemon error'));
+    }
+  }
+
+  private onExit(child: ChildProcess, code: number | null, signal: NodeJS.Signals | null): void {
+    if (this.child !== child) {
+      return;
+    }
+    this.child = null;
+    this.ready = false;
+
+    const reason = `OCR daemon exited (code ${code}, signal ${signal})`;
+    // Callers waiting for a warm-up that failed get the error now instead of at their timeout
+    this.markFailed?.(new Error(this.lastError ? `${reason}: ${this.lastError}` : reason));
+    this.markReady = null;
+    this.markFailed = null;
+    for (const [id, entry] of this.pending) {
+      clearTimeout(entry.timer);
+      entry.reject(new Error(reason));
+      this.pending.delete(id);
+    }
+    if (this.stopped) {
+      return;
+    }
+
+    // A clean exit is a max-requests recycle: restart right away
+    const delay = code === 0 ? 0 : this.backoffMs;
+    if (code !== 0) {
+      this.lastError = reason;
+      this.backoffMs = Math.min(this.backoffMs * 2, MAX_BACKOFF_MS);
+      console.error(`❌ ${reason}, restarting in ${delay}ms`);
+    }
+    this.restarts++;
+    this.restartTimer = setTimeout(() => {
+      this.restartTimer = null;
+      if (!this.stopped && !this.child) {
+        this.start();
+      }
+    }, delay);
+  }
+}
+
+export default new OcrDaemon();
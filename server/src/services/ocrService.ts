@@ -6,6 +6,7 @@ import { spawn } from 'child_process';
 import { MTGCard, OCRResult, OpenAIVisionMessage } from '../types';
 import { createError } from '../middleware/errorHandler';
 import scryfallService from './scryfallService';
+import ocrDaemon from './ocrDaemon';
 import dotenv from 'dotenv';
 
 // Load environment variables before class initialization
@@ -198,10 +199,25 @@ class OCRService {
   }
 
   /**
-   * Run local OCR by delegating to the EasyOCR Python helper.
+   * Run local OCR on the warm OCR daemon, or the EasyOCR Python helper if it is unavailable.
    * Returns a string content that mimics the JSON block expected by parseCardsFromResponse.
    */
-  private runLocalOcr(base64Jpeg: string): Promise<string> {
+  private async runLocalOcr(base64Jpeg: string): Promise<string> {
+    if (ocrDaemon.isEnabled()) {
+      try {
+        const result = await ocrDaemon.request('mtga_zone', { image_base64: base64Jpeg });
+        return JSON.stringify(result);
+      } catch (error) {
+        console.warn('⚠️ OCR daemon failed, spawning the EasyOCR script:', (error as Error).message);
+      }
+    }
+    return this.runLocalOcrScript(base64Jpeg);
+  }
+
+  /**
+   * One-shot EasyOCR Python helper (pays interpreter + model load on every call)
+   */
+  private runLocalOcrScript(base64Jpeg: string): Promise<string> {
     return new Promise((resolve, reject) => {
       // Utiliser le wrapper optimisé pour MTGA
       const mtgaWrapper = path.join(__dirname, '../../../easyocr_mtga_wrapper.py');
@@ -7,6 +7,7 @@ import { MTGCard, OCRResult } from '../types';
 import { promisify } from 'util';
 import { createHash } from 'crypto';
 import mtgoCorrector from './mtgoLandCorrector';
+import ocrDaemon from './ocrDaemon';
 import { getOCRConfig, OCROptimizationConfig } from '../config/ocrOptimizationConfig';
 
 // Simple in-memory cache for processed zones
@@ -262,7 +263,19 @@ export class OptimizedOCRService {
   /**
    * Run Python super-resolution script
    */
-  private runPythonSuperResolution(input: string, output: string, scriptPath: string): Promise<void> {
+  private async runPythonSuperResolution(input: string, output: string, scriptPath: string): Promise<void> {
+    // Warm OCR daemon first (no interpreter/OpenCV start-up per image)
+    if (ocrDaemon.isEnabled()) {
+      try {
+        await ocrDaemon.request('super_resolution', { image: input, output, target_width: 2400 }, 30000);
+        if (fs.existsSync(output)) {
+          return;
+        }
+      } catch (error) {
+        console.warn('⚠️ OCR daemon super-resolution failed:', (error as Error).message);
+      }
+    }
+
     return new Promise((resolve, reject) => {
       const proc = spawn('python3', [scriptPath, input, output, '--target-width', '2400']);
       
@@ -557,6 +570,21 @@ export class OptimizedOCRService {
     zoneImagePath: string,
     zoneType: 'mainboard' | 'sideboard'
   ): Promise<OCRResult> {
+    // Warm OCR daemon: the zone crop goes through the bot's deck pipeline
+    if (ocrDaemon.isEnabled()) {
+      try {
+        const result = await ocrDaemon.request('deck', { image: zoneImagePath });
+        return {
+          success: true,
+          cards: this.parseEasyOCRResult({ cards: [...result.mainboard, ...result.sideboard] }, zoneType),
+          confidence: result.confidence || 0.7,
+          processing_time: 0
+        };
+      } catch (error) {
+        console.warn('⚠️ OCR daemon failed, spawning the EasyOCR script:', (error as Error).message);
+      }
+    }
+
     return new Promise((resolve, reject) => {
       const scriptPath = path.join(__dirname, '../../../discord-bot/ocr_parser_easyocr.py');
       
@@ -2,11 +2,16 @@
 """
 Détection intelligente avec Scryfall pour compléter les cartes partielles
 """
-import requests
 import json
 import time
 from fuzzywuzzy import fuzz
 import re
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discord-bot'))
+from card_index import get_shared_index
+from http_client import get_sync_session
 
 class ScryfallSmartDetector:
     def __init__(self):
@@ -22,6 +27,14 @@ class ScryfallSmartDetector:
         # Si trop court, abandonner
         if len(partial) < 3:
             return None
+        
+        # Index local (bulk Scryfall) : complétion par préfixe, sans réseau
+        card_index = get_shared_index()
+        if card_index:
+            match = self._complete_locally(card_index, partial, color_identity)
+            if match:
+                return match
+            # Aucun nom ne commence ainsi (milieu de nom, préfixe abîmé par l'OCR) : recherche regex Scryfall
             
         # Construire la requête Scryfall
         query_parts = [f'name:/{partial}/']  # Regex search
@@ -40,7 +53,7 @@ class ScryfallSmartDetector:
         time.sleep(0.1)  # Respecter le rate limit de Scryfall
         
         try:
-            response = requests.get(
+            response = get_sync_session().get(
                 f"{self.base_url}/cards/search",
                 params={'q': query, 'format': 'json'},
                 timeout=5
@@ -75,6 +88,26 @@ class ScryfallSmartDetector:
             
         return None
         
+    def _complete_locally(self, card_index, partial, color_identity=None):
+        """Complétion d'un nom tronqué par l'index de préfixes local"""
+        cache_key = f"local:{partial}:{color_identity or ''}"
+        if cache_key in self.cache:
+            return self.cache[cache_key]
+            
+        result = None
+        names = card_index.complete(partial, limit=1, within_colors=color_identity)
+        if names:
+            card = card_index.get_exact(names[0])
+            result = {
+                'name': card['name'],
+                'colors': card.get('colors', []),
+                'mana_cost': card.get('mana_cost', ''),
+                'type_line': card.get('type_line', ''),
+                'confidence': fuzz.partial_ratio(partial, card['name'].lower())
+            }
+        self.cache[cache_key] = result
+        return result
+        
     def deduce_from_context(self, partial_name, nearby_cards, position="below"):
         """Déduit une carte en utilisant le contexte (cartes proches)"""
         
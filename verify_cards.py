@@ -1,5 +1,12 @@
-import requests
-import time
+import asyncio
+import os
+import sys
+
+# Même client que le bot : session keep-alive partagée, limiteur de débit, retries et disjoncteur
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discord-bot'))
+from http_client import HttpClient
+from resilience import ScryfallUnavailableError
+from scryfall_service import ScryfallService
 
 cards_to_check = [
     "Guide of Souls",
@@ -29,42 +36,37 @@ cards_to_check = [
     "Invasion of Gobakhan"
 ]
 
-print("Vérification des cartes sur Scryfall...")
-print("=" * 50)
 
-for card_name in cards_to_check:
+async def check_card(service, card_name):
+    """Ligne de résultat pour une carte (nom exact, sinon suggestions)"""
     try:
-        # Search for exact card name
-        response = requests.get(
-            f"https://api.scryfall.com/cards/named",
-            params={"exact": card_name}
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ {card_name} - TROUVÉE")
-        elif response.status_code == 404:
-            # Try fuzzy search
-            search_response = requests.get(
-                f"https://api.scryfall.com/cards/search",
-                params={"q": card_name}
-            )
-            if search_response.status_code == 200:
-                search_data = search_response.json()
-                if search_data.get('data'):
-                    suggestions = [card['name'] for card in search_data['data'][:3]]
-                    print(f"❌ {card_name} - NON TROUVÉE. Suggestions: {', '.join(suggestions)}")
-                else:
-                    print(f"❌ {card_name} - NON TROUVÉE, aucune suggestion")
-            else:
-                print(f"❌ {card_name} - NON TROUVÉE")
-        else:
-            print(f"⚠️ {card_name} - Erreur {response.status_code}")
-            
-        time.sleep(0.1)  # Respect rate limit
-        
-    except Exception as e:
-        print(f"⚠️ {card_name} - Erreur: {e}")
+        if await service.search_card_exact(card_name):
+            return f"✅ {card_name} - TROUVÉE"
+        matches = await service.search_cards(card_name, limit=3)
+        if matches is None:
+            # Panne Scryfall (rien n'est mis en cache) : ne pas la confondre avec une carte absente
+            return f"⚠️ {card_name} - Erreur: Scryfall indisponible"
+        suggestions = [card['name'] for card in matches]
+        if suggestions:
+            return f"❌ {card_name} - NON TROUVÉE. Suggestions: {', '.join(suggestions)}"
+        return f"❌ {card_name} - NON TROUVÉE, aucune suggestion"
+    except ScryfallUnavailableError as e:
+        return f"⚠️ {card_name} - Erreur: {e}"
 
+
+async def main():
+    http_client = HttpClient()
+    try:
+        async with ScryfallService(http_client=http_client) as service:
+            # Le limiteur partagé cadence les requêtes : plus besoin de time.sleep entre deux cartes
+            for line in await asyncio.gather(*(check_card(service, name) for name in cards_to_check)):
+                print(line)
+    finally:
+        await http_client.close()
+
+
+print("Vérification des cartes sur Scryfall...")
+print("=" * 50)
+asyncio.run(main())
 print("=" * 50)
 print("Vérification terminée")